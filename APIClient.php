@@ -4,6 +4,33 @@
  * AI-Powered Fake News Detection System
  */
 
+/**
+ * Error from the ML API. The code is the HTTP status, or 0 when the API
+ * could not be reached at all.
+ */
+class APIException extends Exception {
+    private $apiError;
+    
+    public function __construct($message, $status = 0, $apiError = null) {
+        parent::__construct($message, $status);
+        $this->apiError = $apiError;
+    }
+    
+    /**
+     * The error message returned by the API, if any
+     */
+    public function getApiError() {
+        return $this->apiError;
+    }
+    
+    /**
+     * Whether the API answered that the request itself was rejected (4xx)
+     */
+    public function isClientError() {
+        return $this->getCode() >= 400 && $this->getCode() < 500;
+    }
+}
+
 class APIClient {
     private $baseUrl;
     private $timeout;
@@ -57,6 +84,74 @@ class APIClient {
         }
     }
     
+    /**
+     * Upload an image to the ML API for OCR and analysis in one call.
+     * Returns null when the API is unavailable so callers can fall back.
+     */
+    public function analyzeImage($imagePath) {
+        $startTime = microtime(true);
+        
+        try {
+            $response = $this->makeRequest('/analyze-image', 'POST', null, [
+                'image' => new CURLFile($imagePath)
+            ]);
+            
+            if (isset($response['prediction']) && isset($response['extracted_text'])) {
+                return [
+                    'extracted_text' => $response['extracted_text'],
+                    'prediction' => strtoupper($response['prediction']),
+                    'confidence' => (float)$response['confidence'],
+                    'processing_time' => round(microtime(true) - $startTime, 3),
+                    'model_version' => $response['model_version'] ?? 'v1.0'
+                ];
+            }
+            throw new Exception('Invalid response from ML API');
+            
+        } catch (Exception $e) {
+            logMessage('ERROR', 'ML API image analysis failed: ' . $e->getMessage(), ['image' => basename($imagePath)]);
+            return null;
+        }
+    }
+    
+    /**
+     * Have the ML API fetch, extract and analyze an article URL in one call.
+     * Returns null when the API cannot be reached, answers with a 5xx or
+     * returns an invalid response, so callers can fall back. Throws when the
+     * API rejects the URL (4xx: blocked address, page not fetchable or not
+     * an article); falling back would fetch a URL the API refused.
+     */
+    public function analyzeUrl($url) {
+        $startTime = microtime(true);
+        
+        try {
+            $response = $this->makeRequest('/analyze-url', 'POST', ['url' => $url]);
+            
+            if (isset($response['prediction']) && isset($response['extracted_text'])) {
+                return [
+                    'extracted_text' => $response['extracted_text'],
+                    'title' => $response['title'] ?? null,
+                    'word_count' => $response['word_count'] ?? str_word_count($response['extracted_text']),
+                    'prediction' => strtoupper($response['prediction']),
+                    'confidence' => (float)$response['confidence'],
+                    'processing_time' => round(microtime(true) - $startTime, 3),
+                    'model_version' => $response['model_version'] ?? 'v1.0'
+                ];
+            }
+            throw new Exception('Invalid response from ML API');
+            
+        } catch (APIException $e) {
+            if ($e->isClientError()) {
+                logMessage('INFO', 'ML API rejected URL: ' . $e->getMessage(), ['url' => $url]);
+                throw new Exception($e->getApiError() ?: 'The URL could not be analyzed');
+            }
+            logMessage('ERROR', 'ML API URL analysis failed: ' . $e->getMessage(), ['url' => $url]);
+            return null;
+        } catch (Exception $e) {
+            logMessage('ERROR', 'ML API URL analysis failed: ' . $e->getMessage(), ['url' => $url]);
+            return null;
+        }
+    }
+    
     /**
      * Get model statistics and health
      */
@@ -121,7 +216,7 @@ class APIClient {
     /**
      * Make HTTP request to ML API
      */
-    private function makeRequest($endpoint, $method = 'GET', $data = null) {
+    private function makeRequest($endpoint, $method = 'GET', $data = null, $files = null) {
         $url = $this->baseUrl . $endpoint;
         
         $ch = curl_init();
@@ -140,10 +235,14 @@ class APIClient {
         
         // Set headers
         $headers = [
-            'Content-Type: application/json',
             'Accept: application/json',
         ];
         
+        // cURL sets the multipart Content-Type (with boundary) for file uploads
+        if (!$files) {
+            $headers[] = 'Content-Type: application/json';
+        }
+        
         if ($this->apiKey) {
             $headers[] = 'Authorization: Bearer ' . $this->apiKey;
             $headers[] = 'X-API-Key: ' . $this->apiKey;
@@ -154,7 +253,9 @@ class APIClient {
         // Set method-specific options
         if ($method === 'POST') {
             curl_setopt($ch, CURLOPT_POST, true);
-            if ($data) {
+            if ($files) {
+                curl_setopt($ch, CURLOPT_POSTFIELDS, $files);
+            } elseif ($data) {
                 curl_setopt($ch, CURLOPT_POSTFIELDS, json_encode($data));
             }
         } elseif ($method === 'PUT') {
@@ -174,19 +275,21 @@ class APIClient {
         
         // Handle cURL errors
         if ($error) {
-            throw new Exception("cURL Error: $error");
+            throw new APIException("cURL Error: $error");
         }
         
         // Handle HTTP errors
         if ($httpCode >= 400) {
             $errorMessage = "HTTP Error $httpCode";
+            $apiError = null;
             if ($response) {
                 $errorData = json_decode($response, true);
                 if (isset($errorData['error'])) {
-                    $errorMessage .= ": " . $errorData['error'];
+                    $apiError = $errorData['error'];
+                    $errorMessage .= ": " . $apiError;
                 }
             }
-            throw new Exception($errorMessage);
+            throw new APIException($errorMessage, $httpCode, $apiError);
         }
         
         // Parse JSON response
@@ -130,14 +130,25 @@ class NewsController {
             throw new Exception('Please enter a valid URL');
         }
         
-        // Check if URL is accessible
-        if (!$this->newsExtractor->isUrlAccessible($url)) {
-            throw new Exception('URL is not accessible or does not exist');
+        // Fetch, extract and classify in one call to the ML API. URLs it
+        // rejects (e.g. private addresses) throw and are never fetched here.
+        $analysis = $this->apiClient->analyzeUrl($url);
+        
+        if ($analysis) {
+            $extractedData = [
+                'text' => $analysis['extracted_text'],
+                'title' => $analysis['title'] ?: 'Article from URL',
+                'word_count' => $analysis['word_count']
+            ];
+        } else {
+            // The API is unreachable: fall back to fetching the page from PHP
+            if (!$this->newsExtractor->isUrlAccessible($url)) {
+                throw new Exception('URL is not accessible or does not exist');
+            }
+            
+            $extractedData = $this->newsExtractor->extractFromUrl($url);
         }
         
-        // Extract content from URL
-        $extractedData = $this->newsExtractor->extractFromUrl($url);
-        
         if (strlen($extractedData['text']) < 50) {
             throw new Exception('Could not extract sufficient content from the URL');
         }
@@ -151,7 +162,9 @@ class NewsController {
         );
         
         // Analyze with ML API
-        $analysis = $this->apiClient->analyzeNews($extractedData['text'], 'url');
+        if (!$analysis) {
+            $analysis = $this->apiClient->analyzeNews($extractedData['text'], 'url');
+        }
         
         // Update submission with results
         $this->submissionModel->updatePrediction(
@@ -188,8 +201,15 @@ class NewsController {
         $imagePath = $this->saveUploadedFile($uploadedFile, $userId);
         
         try {
-            // Extract text from image using OCR
-            $extractedText = $this->extractTextFromImage($imagePath);
+            // OCR and classify in one call to the ML API's resident OCR workers
+            $analysis = $this->apiClient->analyzeImage($imagePath);
+            
+            if ($analysis) {
+                $extractedText = $analysis['extracted_text'];
+            } else {
+                // Fall back to the local OCR script
+                $extractedText = $this->extractTextFromImage($imagePath);
+            }
             
             if (strlen($extractedText) < 10) {
                 throw new Exception('Could not extract sufficient text from the image');
@@ -205,7 +225,9 @@ class NewsController {
             );
             
             // Analyze with ML API
-            $analysis = $this->apiClient->analyzeNews($extractedText, 'image');
+            if (!$analysis) {
+                $analysis = $this->apiClient->analyzeNews($extractedText, 'image');
+            }
             
             // Update submission with results
             $this->submissionModel->updatePrediction(
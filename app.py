@@ -2,41 +2,55 @@
 """
 Flask ML API for Fake News Detection
 AI-Powered Fake News Detection System
+
+Importing this module only defines the app and its routes. create_app()
+loads the model and starts background work, and `python bootstrap.py init`
+downloads NLTK data and creates the schema once per deployment.
 """
 
-from flask import Flask, request, jsonify, session, render_template, send_from_directory
+import time
+
+# Cold start is measured from here: module import, then create_app()
+IMPORT_STARTED_AT = time.time()
+
+from flask import Flask, Response, request, jsonify, session, render_template, send_from_directory, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import joinedload
 import pickle
+import json
+import base64
+import binascii
 import re
-import time
+import gc
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-from sklearn.pipeline import Pipeline
-from sklearn.model_selection import train_test_split
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import os
+import resource
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+from fake_news_detector import FakeNewsDetector, model_info
+from model_store import (
+    load_artifact, latest_artifact_path, resolve_artifact, set_latest, set_shadow, clear_shadow, DEFAULT_ARTIFACT_DIR
+)
+from compact_model import load_compact
+from model_reload import ModelManager, ServingModel
+from memory_report import read_smaps
+from micro_batch import MicroBatcher
+from prediction_cache import PredictionCache, SQLiteCacheBackend
+from write_behind import WriteBehindQueue
+from keyword_trends import KeywordTrendAggregator, migrate_keyword_trends
+from ocr_extract import OCRWorkerPool, TILE_HEIGHT
+from image_preprocessing import ImagePreprocessor, DEFAULT_TARGET_X_HEIGHT
+from article_fetcher import ArticleFetcher, ArticleCache, FetchError
+from stream_ingest import iter_ndjson, micro_batches, StreamJobRegistry
+from stats_counters import (
+    TTLCache, CounterAggregator, TOTAL_COUNTERS, counter_key, increment_counters, read_counters,
+    rebuild_counters, submission_deltas, api_log_deltas, user_deltas
+)
+from stats_queries import prediction_distribution, daily_submission_histogram, model_version_breakdown
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -49,6 +63,48 @@ if database_url and database_url.startswith('postgres://'):
     database_url = database_url.replace('postgres://', 'postgresql://', 1)
 app.config['SQLALCHEMY_DATABASE_URI'] = database_url
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['MODEL_ARTIFACT_DIR'] = os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR)
+app.config['MODEL_TRAIN_ON_STARTUP'] = os.environ.get('MODEL_TRAIN_ON_STARTUP', 'true').lower() == 'true'
+app.config['MODEL_LOAD_ASYNC'] = os.environ.get('MODEL_LOAD_ASYNC', 'false').lower() == 'true'  # /ready reports when done
+app.config['MODEL_ENGINE'] = os.environ.get('MODEL_ENGINE', 'compact')  # 'compact' or 'sklearn'
+app.config['MODEL_WATCH_INTERVAL'] = float(os.environ.get('MODEL_WATCH_INTERVAL', 5.0))  # 0 disables
+app.config['MODEL_SHADOW_SAMPLE_RATE'] = float(os.environ.get('MODEL_SHADOW_SAMPLE_RATE', 0.1))
+app.config['MODEL_SHADOW_QUEUE_SIZE'] = int(os.environ.get('MODEL_SHADOW_QUEUE_SIZE', 1000))
+app.config['BATCH_MAX_ITEMS'] = int(os.environ.get('BATCH_MAX_ITEMS', 1000))
+app.config['MICRO_BATCH_MAX_LATENCY_MS'] = float(os.environ.get('MICRO_BATCH_MAX_LATENCY_MS', 0))  # 0 disables
+app.config['MICRO_BATCH_MAX_ITEMS'] = int(os.environ.get('MICRO_BATCH_MAX_ITEMS', 32))
+app.config['PREDICTION_CACHE_SIZE'] = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+app.config['PREDICTION_CACHE_TTL'] = int(os.environ.get('PREDICTION_CACHE_TTL', 3600))
+app.config['PREDICTION_CACHE_PATH'] = os.environ.get('PREDICTION_CACHE_PATH')  # shared across workers when set
+app.config['WRITE_BEHIND_QUEUE_SIZE'] = int(os.environ.get('WRITE_BEHIND_QUEUE_SIZE', 10000))
+app.config['WRITE_BEHIND_BATCH_SIZE'] = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', 500))
+app.config['WRITE_BEHIND_FLUSH_INTERVAL'] = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', 0.5))
+app.config['WRITE_BEHIND_ENQUEUE_TIMEOUT'] = float(os.environ.get('WRITE_BEHIND_ENQUEUE_TIMEOUT', 0.05))
+app.config['TREND_FLUSH_INTERVAL'] = float(os.environ.get('TREND_FLUSH_INTERVAL', 5.0))
+app.config['STATS_CACHE_TTL'] = float(os.environ.get('STATS_CACHE_TTL', 5.0))
+app.config['STATS_COUNTER_FLUSH_INTERVAL'] = float(os.environ.get('STATS_COUNTER_FLUSH_INTERVAL', 1.0))
+app.config['STATS_TIMESERIES_MAX_DAYS'] = int(os.environ.get('STATS_TIMESERIES_MAX_DAYS', 366))
+app.config['OCR_WORKERS'] = int(os.environ.get('OCR_WORKERS', 0)) or None  # defaults to one per core
+app.config['OCR_TIMEOUT'] = float(os.environ.get('OCR_TIMEOUT', 60))
+app.config['OCR_MAX_IMAGE_BYTES'] = int(os.environ.get('OCR_MAX_IMAGE_BYTES', 5 * 1024 * 1024))
+app.config['OCR_MIN_TEXT_LENGTH'] = int(os.environ.get('OCR_MIN_TEXT_LENGTH', 10))
+app.config['OCR_PREPROCESS'] = os.environ.get('OCR_PREPROCESS', 'true').lower() == 'true'
+app.config['OCR_TARGET_X_HEIGHT'] = int(os.environ.get('OCR_TARGET_X_HEIGHT', DEFAULT_TARGET_X_HEIGHT))
+app.config['OCR_CROP'] = os.environ.get('OCR_CROP', 'false').lower() == 'true'
+app.config['OCR_TILE_HEIGHT'] = int(os.environ.get('OCR_TILE_HEIGHT', TILE_HEIGHT)) or None  # 0 disables tiling
+app.config['URL_FETCH_TIMEOUT'] = float(os.environ.get('URL_FETCH_TIMEOUT', 10))
+app.config['URL_FETCH_MAX_BYTES'] = int(os.environ.get('URL_FETCH_MAX_BYTES', 5 * 1024 * 1024))
+app.config['URL_FETCH_POOL_SIZE'] = int(os.environ.get('URL_FETCH_POOL_SIZE', 20))
+app.config['URL_CACHE_DIR'] = os.environ.get('URL_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'articles'))  # empty disables
+app.config['URL_CACHE_MAX_ENTRIES'] = int(os.environ.get('URL_CACHE_MAX_ENTRIES', 5000))
+app.config['URL_CACHE_TTL'] = int(os.environ.get('URL_CACHE_TTL', 3600))
+app.config['URL_MIN_TEXT_LENGTH'] = int(os.environ.get('URL_MIN_TEXT_LENGTH', 50))
+app.config['URL_BATCH_MAX_ITEMS'] = int(os.environ.get('URL_BATCH_MAX_ITEMS', 500))
+app.config['URL_BATCH_WORKERS'] = int(os.environ.get('URL_BATCH_WORKERS', 32))
+app.config['URL_BATCH_PER_HOST'] = int(os.environ.get('URL_BATCH_PER_HOST', 4))
+app.config['URL_BATCH_DEADLINE'] = float(os.environ.get('URL_BATCH_DEADLINE', 120))
+app.config['STREAM_BATCH_SIZE'] = int(os.environ.get('STREAM_BATCH_SIZE', 256))
+app.config['STREAM_MAX_LINE_BYTES'] = int(os.environ.get('STREAM_MAX_LINE_BYTES', 256 * 1024))
 
 # Initialize database
 from models import db, User, Submission, Flag, Comment, KeywordTrend, SystemStat, APILog
@@ -62,199 +118,317 @@ logger = logging.getLogger(__name__)
 
 # Global variables
 model = None
-vectorizer = None
-model_info = {
-    'name': 'Fake News Detector',
-    'version': '1.0.0',
-    'accuracy': 0.0,
-    'trained_at': None,
-    'features_count': 0
+startup_info = {
+    'process_started_at': IMPORT_STARTED_AT,
+    'import_time': None,
+    'create_app_started_at': None,
+    'model_source': None,
+    'model_artifact': None,
+    'model_engine': None,
+    'model_load_time': None,
+    'warmup_time': None,
+    'preloaded': False
 }
+startup_lock = threading.Lock()
 
-class FakeNewsDetector:
-    def __init__(self):
-        self.model = None
-        self.stop_words = set(stopwords.words('english'))
-        
-    def preprocess_text(self, text):
-        """Clean and preprocess text for analysis"""
-        if not isinstance(text, str):
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        
-        # Remove HTML tags
-        text = re.sub(r'<.*?>', '', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^a-zA-Z0-9\s\.\,\!\?\;\:]', '', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Tokenize and remove stopwords
-        tokens = word_tokenize(text)
-        tokens = [word for word in tokens if word not in self.stop_words and len(word) > 2]
-        
-        return ' '.join(tokens)
-    
-    def create_training_data(self):
-        """Create synthetic training data for fake news detection"""
-        
-        # Real news patterns - factual, structured, citing sources
-        real_news_samples = [
-            "The Federal Reserve announced today that interest rates will remain unchanged following their two-day policy meeting. The decision was made unanimously by the Federal Open Market Committee after careful consideration of current economic indicators.",
-            "Scientists at Stanford University published a new study in the journal Nature showing promising results in cancer treatment research. The peer-reviewed study involved 500 patients over a period of two years.",
-            "The Department of Labor reported that unemployment rates decreased by 0.2% last month, reaching the lowest level since 2019. The report cited increased hiring in the technology and healthcare sectors.",
-            "Local authorities confirmed that the new infrastructure project will be completed ahead of schedule. The $50 million investment will improve transportation access for over 100,000 residents in the metropolitan area.",
-            "According to data released by the World Health Organization, vaccination rates in developing countries have increased by 15% compared to last year. The organization credits improved distribution networks and international cooperation.",
-            "The Environmental Protection Agency issued new guidelines for air quality standards based on recent scientific research. The updated regulations will take effect next year and are expected to reduce emissions by 20%.",
-            "University researchers collaborated with industry partners to develop new renewable energy technology. The innovation was presented at the International Conference on Sustainable Energy and has received peer review.",
-            "The Supreme Court heard arguments today in a case involving digital privacy rights. Legal experts from both sides presented evidence and constitutional interpretations to the nine justices.",
-            "Government officials announced the successful completion of infrastructure repairs following last month's natural disaster. The $25 million project restored power and water services to affected communities.",
-            "Medical professionals at Johns Hopkins Hospital reported successful treatment outcomes using a new surgical technique. The minimally invasive procedure was developed over three years of clinical trials.",
-            "The National Weather Service issued seasonal forecasts based on atmospheric data and climate models. Meteorologists predict normal precipitation levels for the upcoming season across most regions.",
-            "Economic analysts reported steady growth in the manufacturing sector according to the latest quarterly data. Production indices show a 3% increase compared to the same period last year.",
-            "Transportation officials completed safety inspections of public transit systems meeting federal requirements. The comprehensive review ensures compliance with updated safety standards and protocols.",
-            "Academic institutions received federal funding to continue climate change research initiatives. The multi-year grants will support graduate students and advanced scientific equipment purchases.",
-            "Healthcare organizations published clinical guidelines based on evidence from randomized controlled trials. The recommendations were developed by panels of medical experts and underwent rigorous peer review.",
-            "Financial institutions reported quarterly earnings that aligned with analyst predictions for the banking sector. The results reflect steady performance in lending and investment services during challenging market conditions.",
-            "Technology companies announced software updates that address security vulnerabilities identified by independent researchers. The patches will be automatically distributed to users over the next two weeks.",
-            "Education officials released standardized test results showing improvements in mathematics and reading scores. The data represents responses from over 2 million students across public school districts.",
-            "Public health departments issued evidence-based recommendations for seasonal health preparations. The guidelines are based on surveillance data and consultation with infectious disease specialists.",
-            "Research institutions published findings from longitudinal studies tracking environmental changes over the past decade. The peer-reviewed analysis provides insights into ecosystem adaptation and conservation strategies."
-        ]
-        
-        # Fake news patterns - sensational, unverified, conspiracy theories
-        fake_news_samples = [
-            "BREAKING: Secret government documents leaked revealing shocking conspiracy that mainstream media refuses to report! Anonymous whistleblower exposes terrifying truth about mind control experiments conducted on unsuspecting citizens.",
-            "MIRACLE CURE DISCOVERED! Doctors hate this one weird trick that big pharmaceutical companies have been hiding for decades. Natural remedy completely eliminates all diseases without any side effects or expensive treatments.",
-            "EXPOSED: Celebrities secretly meeting in underground bunkers to control world government through illuminati connections. Hidden camera footage reveals disturbing plans for population control and manipulation of global events.",
-            "SHOCKING REVELATION: Scientists discover ancient alien technology buried beneath famous landmarks. Government covers up evidence of extraterrestrial visitation and advanced civilizations that ruled Earth thousands of years ago.",
-            "URGENT WARNING: Dangerous chemicals in everyday products causing mass health crisis that authorities desperately want to keep secret. Millions of people at risk from toxic substances deliberately added to food and water supplies.",
-            "INCREDIBLE DISCOVERY: Time traveler from 2050 reveals devastating future events that will change everything. Prophetic warnings about upcoming disasters and political upheavals that world leaders are trying to prevent public from knowing.",
-            "BOMBSHELL INVESTIGATION: Banking elite planning complete economic collapse to establish new world order. Secret meetings recorded showing billionaires discussing plans to control global financial systems and eliminate personal freedoms.",
-            "AMAZING BREAKTHROUGH: Revolutionary technology suppressed by powerful corporations because it threatens their profits. Free energy device invented decades ago could solve climate crisis but oil companies refuse to allow its release.",
-            "DISTURBING EVIDENCE: Weather modification programs creating artificial natural disasters to justify emergency government powers. Classified documents reveal systematic manipulation of climate patterns for political control and social engineering.",
-            "EXCLUSIVE REPORT: Underground tunnels connecting major cities used for trafficking operations by global criminal network. Law enforcement agencies compromised and unable to investigate due to high-level corruption and blackmail schemes.",
-            "UNBELIEVABLE TRUTH: Vaccines contain microchips designed for mass surveillance and behavior modification. Secret technology allows government tracking and mind control of entire populations through wireless transmission signals.",
-            "HIDDEN AGENDA: Educational institutions indoctrinating children with propaganda to create compliant future citizens. Teachers following scripted curriculum designed to eliminate critical thinking and independent thought processes.",
-            "LEAKED FOOTAGE: Military testing advanced weapons on civilian populations without consent or knowledge. Classified experiments using directed energy weapons and biological agents conducted in major metropolitan areas.",
-            "EMERGENCY ALERT: Food supply deliberately contaminated with substances that cause dependency and reduce intelligence. Agricultural corporations working with government agencies to control population through nutritional manipulation and chemical additives.",
-            "SECRET PLAN REVEALED: Technology giants collecting personal data to create detailed psychological profiles for behavioral manipulation. Social media platforms designed as psychological warfare tools to influence elections and public opinion.",
-            "TERRIFYING DISCOVERY: Ancient prophecies accurately predicting current world events prove existence of supernatural forces controlling human destiny. Religious texts contain coded messages about upcoming apocalyptic events and spiritual transformation.",
-            "COVER-UP EXPOSED: Space agencies hiding evidence of massive planet approaching Earth that will cause global catastrophe. Astronomical data suppressed to prevent mass panic while elite prepare underground survival bunkers.",
-            "INSIDER INFORMATION: Pharmaceutical companies deliberately creating diseases to sell expensive treatments and maintain profits. Medical establishment suppressing natural cures to keep people sick and dependent on costly medications.",
-            "FORBIDDEN KNOWLEDGE: Historical events completely fabricated by ruling elite to maintain control over educational narratives. Actual human history hidden from public because truth would revolutionize understanding of civilization and consciousness.",
-            "SHOCKING CONFESSION: Former government agent reveals existence of parallel dimension where reptilian beings control human affairs through shape-shifting technology. Interdimensional warfare affecting global politics and economic systems."
-        ]
-        
-        # Combine data with labels
-        data = []
-        labels = []
-        
-        for text in real_news_samples:
-            data.append(text)
-            labels.append(0)  # 0 = Real
-        
-        for text in fake_news_samples:
-            data.append(text)
-            labels.append(1)  # 1 = Fake
-        
-        return data, labels
-    
-    def train_model(self):
-        """Train the fake news detection model"""
-        logger.info("Starting model training...")
-        
-        # Create training data
-        texts, labels = self.create_training_data()
-        
-        # Preprocess texts
-        processed_texts = [self.preprocess_text(text) for text in texts]
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            processed_texts, labels, test_size=0.2, random_state=42, stratify=labels
-        )
-        
-        # Create pipeline
-        self.model = Pipeline([
-            ('tfidf', TfidfVectorizer(
-                max_features=5000,
-                ngram_range=(1, 3),
-                stop_words='english',
-                min_df=2,
-                max_df=0.8
-            )),
-            ('classifier', LogisticRegression(
-                random_state=42,
-                max_iter=1000,
-                C=1.0
-            ))
-        ])
-        
-        # Train model
-        self.model.fit(X_train, y_train)
-        
-        # Calculate accuracy
-        accuracy = self.model.score(X_test, y_test)
-        
-        # Update model info
-        global model_info
-        model_info['accuracy'] = round(accuracy * 100, 2)
-        model_info['trained_at'] = datetime.now().isoformat()
-        model_info['features_count'] = self.model.named_steps['tfidf'].get_feature_names_out().shape[0]
-        
-        logger.info(f"Model trained successfully with {accuracy:.2%} accuracy")
-        return self.model
-    
-    def predict(self, text):
-        """Predict if text is fake or real news"""
-        if not self.model:
-            raise ValueError("Model not trained yet")
-        
-        # Preprocess text
-        processed_text = self.preprocess_text(text)
-        
-        if not processed_text or len(processed_text.split()) < 3:
-            return "UNCERTAIN", 0.5
-        
+# Detector serving requests; created by create_app()
+detector = None
+
+# Endpoints that need a loaded model
+MODEL_ENDPOINTS = {
+    'analyze_news', 'batch_analyze', 'analyze_image', 'analyze_url', 'batch_analyze_urls', 'stream_analyze'
+}
+
+# Write-behind queue for API logs
+write_queue = WriteBehindQueue(
+    app,
+    max_size=app.config['WRITE_BEHIND_QUEUE_SIZE'],
+    batch_size=app.config['WRITE_BEHIND_BATCH_SIZE'],
+    flush_interval=app.config['WRITE_BEHIND_FLUSH_INTERVAL'],
+    enqueue_timeout=app.config['WRITE_BEHIND_ENQUEUE_TIMEOUT']
+)
+
+# Keyword trend counts, upserted in bulk on an interval
+trend_aggregator = KeywordTrendAggregator(app, flush_interval=app.config['TREND_FLUSH_INTERVAL'])
+
+# Submission counter deltas, applied in one transaction per flush
+counter_aggregator = CounterAggregator(app, flush_interval=app.config['STATS_COUNTER_FLUSH_INTERVAL'])
+
+# Short-lived cache in front of the materialized statistics counters
+stats_cache = TTLCache(ttl=app.config['STATS_CACHE_TTL'])
+
+# Prediction cache, shared between workers when PREDICTION_CACHE_PATH is set
+prediction_cache = PredictionCache(
+    max_entries=app.config['PREDICTION_CACHE_SIZE'],
+    ttl=app.config['PREDICTION_CACHE_TTL'],
+    backend=SQLiteCacheBackend(app.config['PREDICTION_CACHE_PATH']) if app.config['PREDICTION_CACHE_PATH'] else None
+)
+
+# Resident OCR workers for image submissions
+ocr_pool = OCRWorkerPool(
+    max_workers=app.config['OCR_WORKERS'],
+    timeout=app.config['OCR_TIMEOUT'],
+    preprocessor=ImagePreprocessor(
+        target_x_height=app.config['OCR_TARGET_X_HEIGHT'],
+        crop=app.config['OCR_CROP']
+    ) if app.config['OCR_PREPROCESS'] else None,
+    tile_height=app.config['OCR_TILE_HEIGHT']
+)
+
+# Pooled HTTP fetching and article extraction for URL submissions
+article_fetcher = ArticleFetcher(
+    cache=ArticleCache(
+        app.config['URL_CACHE_DIR'],
+        max_entries=app.config['URL_CACHE_MAX_ENTRIES'],
+        ttl=app.config['URL_CACHE_TTL']
+    ) if app.config['URL_CACHE_DIR'] else None,
+    timeout=app.config['URL_FETCH_TIMEOUT'],
+    max_bytes=app.config['URL_FETCH_MAX_BYTES'],
+    pool_size=app.config['URL_FETCH_POOL_SIZE']
+)
+
+# Progress counters for streaming classification jobs in this process
+stream_jobs = StreamJobRegistry()
+
+# Background model reloads and shadow scoring, following the store's LATEST and SHADOW pointers
+model_manager = ModelManager(
+    loader=lambda artifact: load_serving_model(artifact),
+    activate=lambda serving: activate_model(serving),
+    artifact_dir=app.config['MODEL_ARTIFACT_DIR'],
+    watch_interval=app.config['MODEL_WATCH_INTERVAL'],
+    shadow_queue_size=app.config['MODEL_SHADOW_QUEUE_SIZE']
+)
+
+# Concurrent single-text predictions scored together in one vectorized call
+micro_batcher = MicroBatcher(
+    predict_batch=lambda texts: detector.predict_batch(texts),
+    max_batch=app.config['MICRO_BATCH_MAX_ITEMS'],
+    max_latency=app.config['MICRO_BATCH_MAX_LATENCY_MS'] / 1000
+)
+
+def get_memory_usage():
+    """
+    Current and peak resident set size of this worker in bytes, plus its
+    unique (private) and proportional set size where smaps_rollup exists.
+    With a preloaded master, USS is what each extra worker costs.
+    """
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        rss = peak_rss
+    
+    memory = {'rss_bytes': rss, 'peak_rss_bytes': peak_rss}
+    smaps = read_smaps()
+    if smaps:
+        memory.update(uss_bytes=smaps['uss_bytes'], pss_bytes=smaps['pss_bytes'], shared_bytes=smaps['shared_bytes'])
+    return memory
+
+def load_serving_model(artifact=None):
+    """
+    Load an artifact (default: LATEST) into a new detector, using its compact
+    engine when enabled and available, else its sklearn pipeline. The model
+    in use is not touched.
+    """
+    artifact_dir = app.config['MODEL_ARTIFACT_DIR']
+    artifact = artifact or latest_artifact_path(artifact_dir)
+    
+    loaded = None
+    if artifact and app.config['MODEL_ENGINE'] == 'compact':
         try:
-            # Make prediction
-            prediction = self.model.predict([processed_text])[0]
-            probabilities = self.model.predict_proba([processed_text])[0]
-            
-            # Convert to readable format
-            if prediction == 1:
-                result = "FAKE"
-                confidence = probabilities[1]
-            else:
-                result = "REAL"
-                confidence = probabilities[0]
-            
-            return result, confidence
-            
-        except Exception as e:
-            logger.error(f"Prediction error: {e}")
-            return "UNCERTAIN", 0.5
+            loaded = load_compact(artifact)
+            loaded_model, engine = loaded['engine'], 'compact'
+        except FileNotFoundError:
+            logger.info(f"No compact engine for {os.path.basename(artifact)}, serving the sklearn pipeline")
+    if loaded is None:
+        loaded = load_artifact(artifact, artifact_dir)
+        loaded_model, engine = loaded['pipeline'], 'sklearn'
+    
+    candidate = FakeNewsDetector()
+    candidate.load_model(loaded_model, loaded['model_info'], update_model_info=False)
+    return ServingModel(candidate, loaded['model_info'], artifact, loaded['path'], engine)
 
-# Initialize detector
-detector = FakeNewsDetector()
+def activate_model(serving):
+    """Publish a loaded model to request handlers with one reference swap"""
+    global detector, model
+    detector = serving.detector
+    model = serving.detector.model
+    
+    # Update model_info in place; other modules hold a reference to it
+    for key in set(model_info) - set(serving.info):
+        model_info.pop(key, None)
+    model_info.update(serving.info)
+    
+    startup_info['model_artifact'] = serving.path
+    startup_info['model_engine'] = serving.engine
+    prediction_cache.invalidate(serving.info['version'])
 
 def initialize_model():
-    """Initialize and train the model when the app starts"""
-    global model
+    """Load the persisted model artifact, training in-process only as a fallback"""
+    global detector, model
+    start_time = time.time()
     try:
-        model = detector.train_model()
-        logger.info("ML model initialized successfully")
+        try:
+            serving = load_serving_model()
+            activate_model(serving)
+            model_manager.adopt(serving)
+            startup_info['model_source'] = 'artifact'
+        except FileNotFoundError:
+            if not app.config['MODEL_TRAIN_ON_STARTUP']:
+                raise
+            logger.warning("No model artifact found, training in-process (run `python model_store.py train`)")
+            detector = FakeNewsDetector()
+            model = detector.train_model()
+            startup_info['model_source'] = 'trained'
+            startup_info['model_engine'] = 'sklearn'
+            prediction_cache.invalidate(model_info['version'])
+        
+        startup_info['model_load_time'] = round(time.time() - start_time, 3)
+        logger.info(f"ML model initialized successfully from {startup_info['model_source']} "
+                    f"in {startup_info['model_load_time']:.3f}s")
     except Exception as e:
         logger.error(f"Failed to initialize model: {e}")
 
+def warm_up_model():
+    """Run the serving model once so the first request does not pay for first-call costs"""
+    start_time = time.time()
+    warmup_texts = detector.create_training_data()[0][::10]
+    detector.predict_batch(warmup_texts)
+    model_manager.warmup_texts = warmup_texts
+    startup_info['warmup_time'] = round(time.time() - start_time, 3)
+
+def start_serving(watch=True):
+    """Load and warm up the model, then start following the artifact store"""
+    initialize_model()
+    if model is not None:
+        warm_up_model()
+    if watch:
+        model_manager.ensure_watching()
+    startup_info['ready_at'] = time.time()
+    
+    summary = cold_start_summary()
+    logger.info(f"Cold start {summary['startup_time']:.3f}s (import {summary['import_time']}s, "
+                f"model {summary['model_load_time']}s, warmup {summary['warmup_time']}s)")
+
+def cold_start_summary():
+    """Where this process spent its startup time, in seconds"""
+    ready_at = startup_info.get('ready_at')
+    return {
+        'import_time': startup_info['import_time'],
+        'model_load_time': startup_info['model_load_time'],
+        'warmup_time': startup_info['warmup_time'],
+        'startup_time': round(ready_at - startup_info['process_started_at'], 3) if ready_at else None,
+        'ready': ready_at is not None and model is not None
+    }
+
+@app.before_request
+def require_model():
+    """Turn away analysis requests until create_app() has loaded a model"""
+    if model is None and request.endpoint in MODEL_ENDPOINTS:
+        return jsonify({'error': 'Model is not loaded yet, try again shortly'}), 503
+
+def cached_predict(text):
+    """Predict a single text, serving repeated content from the prediction cache"""
+    key = prediction_cache.make_key(text, model_info['version'])
+    cached = prediction_cache.get(key)
+    if cached is not None:
+        model_manager.offer(text, cached[0], cached[1])
+        return cached
+    
+    # Only the model call is compared with the shadow, not the wait for a batch
+    (prediction, confidence), model_time = micro_batcher.predict_timed(text)
+    model_manager.offer(text, prediction, confidence, model_time)
+    if prediction != 'UNCERTAIN':
+        prediction_cache.set(key, (prediction, confidence))
+    return prediction, confidence
+
+def cached_predict_batch(texts):
+    """Predict a batch, running only the cache misses through the model"""
+    results = [None] * len(texts)
+    keys = [prediction_cache.make_key(text, model_info['version']) for text in texts]
+    misses = []
+    
+    for i, key in enumerate(keys):
+        results[i] = prediction_cache.get(key)
+        if results[i] is None:
+            misses.append(i)
+    
+    if misses:
+        predictions = detector.predict_batch([texts[i] for i in misses])
+        for i, (prediction, confidence) in zip(misses, predictions):
+            results[i] = (prediction, confidence)
+            if prediction != 'UNCERTAIN':
+                prediction_cache.set(keys[i], (prediction, confidence))
+    
+    return results
+
+def record_analysis(user_id, news_text, content_type, original_url, prediction, confidence,
+                    processing_time, endpoint):
+    """
+    Save the submission for signed-in users and queue the keyword trend and
+    API log writes for an analysis. Returns the submission id, or None.
+    """
+    # Map prediction to enum
+    prediction_enum = PredictionResult.FAKE if prediction == 'FAKE' else (
+        PredictionResult.REAL if prediction == 'REAL' else PredictionResult.UNCERTAIN
+    )
+    
+    # The submission is inserted now so the response can carry its id; the
+    # counter, trend and log writes are flushed in batches behind the request
+    submission_id = None
+    if user_id:
+        try:
+            submission_type_enum = SubmissionType.TEXT
+            if content_type == 'url':
+                submission_type_enum = SubmissionType.URL
+            elif content_type == 'image':
+                submission_type_enum = SubmissionType.IMAGE
+            
+            row = {
+                'user_id': user_id,
+                'submission_type': submission_type_enum,
+                'content': news_text,
+                'original_url': original_url,
+                'prediction': prediction_enum,
+                'confidence': float(confidence),
+                'processing_time': processing_time,
+                'model_version': model_info['version'],
+                'ip_address': request.remote_addr,
+                'user_agent': request.headers.get('User-Agent'),
+                'submitted_at': datetime.utcnow()
+            }
+            submission = Submission(**row)
+            db.session.add(submission)
+            db.session.commit()
+            submission_id = submission.id
+            
+            counter_aggregator.add(submission_deltas([row]))
+            trend_aggregator.add(news_text, prediction.lower())
+            
+        except Exception as e:
+            logger.error(f"Failed to save submission: {e}")
+            db.session.rollback()
+    
+    # Log API call
+    try:
+        write_queue.enqueue('api_log', {
+            'user_id': user_id,
+            'endpoint': endpoint,
+            'method': 'POST',
+            'status_code': 200,
+            'processing_time': processing_time,
+            'ip_address': request.remote_addr,
+            'user_agent': request.headers.get('User-Agent'),
+            'request_data': {'content_length': len(news_text), 'content_type': content_type},
+            'response_data': {'prediction': prediction, 'confidence': float(confidence)},
+            'created_at': datetime.utcnow()
+        })
+    except Exception as e:
+        logger.error(f"Failed to log API call: {e}")
+    
+    return submission_id
+
 @app.route('/', methods=['GET'])
 def home():
     """Main web interface"""
@@ -280,7 +454,13 @@ def api_info():
         'endpoints': {
             '/analyze': 'POST - Analyze news content',
             '/batch-analyze': 'POST - Batch analyze multiple items',
+            '/ocr': 'POST - Extract text from an image',
+            '/analyze-image': 'POST - Extract text from an image and analyze it',
+            '/analyze-url': 'POST - Fetch an article URL and analyze it',
+            '/batch-analyze-urls': 'POST - Fetch and analyze many URLs (NDJSON stream)',
+            '/stream-analyze': 'POST - Classify an NDJSON stream of items (NDJSON stream)',
             '/health': 'GET - Health check',
+            '/ready': 'GET - Readiness check (503 until the model is loaded)',
             '/info': 'GET - Model information',
             '/ping': 'GET - Simple ping'
         }
@@ -295,6 +475,28 @@ def ping():
         'response_time': 0.001
     })
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness check: the model is loaded and warmed up and the schema is in place (/ping is liveness)"""
+    checks = {
+        'model': model is not None and 'ready_at' in startup_info,
+        'database': True
+    }
+    try:
+        db.session.execute(select(User.id).limit(1))
+    except Exception as e:
+        logger.warning(f"Readiness database check failed: {e}")
+        db.session.rollback()
+        checks['database'] = False
+    
+    is_ready = all(checks.values())
+    return jsonify({
+        'ready': is_ready,
+        'checks': checks,
+        'startup': cold_start_summary(),
+        'pid': os.getpid()
+    }), 200 if is_ready else 503
+
 @app.route('/health', methods=['GET'])
 def health():
     """Detailed health check"""
@@ -303,7 +505,19 @@ def health():
         'model_loaded': model is not None,
         'timestamp': time.time(),
         'version': model_info['version'],
-        'uptime': time.time()
+        'uptime': time.time() - startup_info['process_started_at'],
+        'startup': {
+            'model_source': startup_info['model_source'],
+            'model_artifact': startup_info['model_artifact'],
+            'model_engine': startup_info['model_engine'],
+            'model_load_time': startup_info['model_load_time'],
+            'import_time': startup_info['import_time'],
+            'warmup_time': startup_info['warmup_time'],
+            'preloaded': startup_info['preloaded'],
+            'startup_time': round(startup_info.get('ready_at', time.time()) - startup_info['process_started_at'], 3)
+        },
+        'memory': get_memory_usage(),
+        'pid': os.getpid()
     })
 
 @app.route('/info', methods=['GET'])
@@ -336,70 +550,21 @@ def analyze_news():
         if len(news_text) > 50000:
             return jsonify({'error': 'News text is too long (max 50,000 characters)'}), 400
         
-        # Make prediction
-        prediction, confidence = detector.predict(news_text)
+        # Make prediction; explanations need the feature vector, so they bypass the cache.
+        # Bind the detector once so a hot reload cannot split this request across models.
+        current_detector = detector
+        features = None
+        if request.args.get('include_features') == 'true':
+            prediction, confidence, features = current_detector.predict_with_features(news_text)
+        else:
+            prediction, confidence = cached_predict(news_text)
         
         processing_time = time.time() - start_time
         
-        # Map prediction to enum
-        prediction_enum = PredictionResult.FAKE if prediction == 'FAKE' else (
-            PredictionResult.REAL if prediction == 'REAL' else PredictionResult.UNCERTAIN
+        submission_id = record_analysis(
+            user_id, news_text, content_type, original_url, prediction, confidence, processing_time, '/analyze'
         )
         
-        # Save to database if user is logged in
-        submission_id = None
-        if user_id:
-            try:
-                submission_type_enum = SubmissionType.TEXT
-                if content_type == 'url':
-                    submission_type_enum = SubmissionType.URL
-                elif content_type == 'image':
-                    submission_type_enum = SubmissionType.IMAGE
-                
-                submission = Submission(
-                    user_id=user_id,
-                    submission_type=submission_type_enum,
-                    content=news_text,
-                    original_url=original_url,
-                    prediction=prediction_enum,
-                    confidence=float(confidence),
-                    processing_time=processing_time,
-                    model_version=model_info['version'],
-                    ip_address=request.remote_addr,
-                    user_agent=request.headers.get('User-Agent')
-                )
-                db.session.add(submission)
-                db.session.commit()
-                submission_id = submission.id
-                
-                # Update keyword trends (defined later)
-                try:
-                    update_keyword_trends(news_text, prediction.lower())
-                except Exception as e:
-                    logger.error(f"Failed to update trends: {e}")
-                
-            except Exception as e:
-                logger.error(f"Failed to save submission: {e}")
-                db.session.rollback()
-        
-        # Log API call
-        try:
-            api_log = APILog(
-                user_id=user_id,
-                endpoint='/analyze',
-                method='POST',
-                status_code=200,
-                processing_time=processing_time,
-                ip_address=request.remote_addr,
-                user_agent=request.headers.get('User-Agent'),
-                request_data={'content_length': len(news_text), 'content_type': content_type},
-                response_data={'prediction': prediction, 'confidence': float(confidence)}
-            )
-            db.session.add(api_log)
-            db.session.commit()
-        except Exception as e:
-            logger.error(f"Failed to log API call: {e}")
-        
         # Log prediction
         logger.info(f"Prediction made: {prediction} ({confidence:.3f}) in {processing_time:.3f}s")
         
@@ -416,30 +581,10 @@ def analyze_news():
         }
         
         # Add features for debugging (optional)
-        if request.args.get('include_features') == 'true' and detector.model:
+        if request.args.get('include_features') == 'true' and features is not None:
             try:
                 # Get top features that influenced the prediction
-                tfidf = detector.model.named_steps['tfidf']
-                classifier = detector.model.named_steps['classifier']
-                
-                processed_text = detector.preprocess_text(news_text)
-                text_vector = tfidf.transform([processed_text])
-                feature_names = tfidf.get_feature_names_out()
-                coefficients = classifier.coef_[0]
-                
-                # Get top 10 features
-                feature_scores = text_vector.toarray()[0] * coefficients
-                top_indices = np.argsort(np.abs(feature_scores))[-10:]
-                
-                top_features = []
-                for idx in reversed(top_indices):
-                    if feature_scores[idx] != 0:
-                        top_features.append({
-                            'feature': feature_names[idx],
-                            'score': round(float(feature_scores[idx]), 4)
-                        })
-                
-                response['features'] = top_features
+                response['features'] = current_detector.top_features(features)
                 
             except Exception as e:
                 logger.warning(f"Failed to extract features: {e}")
@@ -468,40 +613,58 @@ def batch_analyze():
         if not batch_items or not isinstance(batch_items, list):
             return jsonify({'error': 'Batch items are required as a list'}), 400
         
-        if len(batch_items) > 50:
-            return jsonify({'error': 'Maximum 50 items per batch'}), 400
+        max_items = app.config['BATCH_MAX_ITEMS']
+        if len(batch_items) > max_items:
+            return jsonify({'error': f'Maximum {max_items} items per batch'}), 400
         
-        results = []
+        results = [None] * len(batch_items)
+        texts = []
+        text_indices = []
         
         for i, item in enumerate(batch_items):
             try:
                 text = item.get('news', '').strip() if isinstance(item, dict) else str(item).strip()
                 
                 if len(text) < 10:
-                    results.append({
+                    results[i] = {
                         'index': i,
                         'prediction': 'uncertain',
                         'confidence': 0.5,
                         'error': 'Text too short'
-                    })
+                    }
                     continue
                 
-                prediction, confidence = detector.predict(text)
+                texts.append(text)
+                text_indices.append(i)
                 
-                results.append({
+            except Exception as e:
+                results[i] = {
+                    'index': i,
+                    'prediction': 'uncertain',
+                    'confidence': 0.5,
+                    'error': str(e)
+                }
+        
+        # Classify all valid items in a single vectorized call
+        try:
+            predictions = cached_predict_batch(texts) if texts else []
+            
+            for i, text, (prediction, confidence) in zip(text_indices, texts, predictions):
+                results[i] = {
                     'index': i,
                     'prediction': prediction.lower(),
                     'confidence': round(float(confidence), 4),
                     'text_length': len(text)
-                })
-                
-            except Exception as e:
-                results.append({
+                }
+            
+        except Exception as e:
+            for i in text_indices:
+                results[i] = {
                     'index': i,
                     'prediction': 'uncertain',
                     'confidence': 0.5,
                     'error': str(e)
-                })
+                }
         
         processing_time = time.time() - start_time
         
@@ -519,6 +682,319 @@ def batch_analyze():
             'processing_time': time.time() - start_time
         }), 500
 
+def read_uploaded_image():
+    """Image bytes from a multipart 'image' field or a raw request body"""
+    upload = request.files.get('image')
+    data = upload.read() if upload else request.get_data()
+    if not data:
+        raise ValueError('Image file is required')
+    if len(data) > app.config['OCR_MAX_IMAGE_BYTES']:
+        raise ValueError(f"Image is too large (max {app.config['OCR_MAX_IMAGE_BYTES']} bytes)")
+    return data
+
+def extract_uploaded_text():
+    """OCR the uploaded image in the worker pool; returns (text, ocr_time) or an error response"""
+    try:
+        data = read_uploaded_image()
+    except ValueError as e:
+        return None, (jsonify({'error': str(e)}), 400)
+    
+    try:
+        result = ocr_pool.extract(data)
+    except Exception as e:
+        logger.error(f"OCR error: {e}")
+        return None, (jsonify({'error': 'Could not extract text from image'}), 422)
+    
+    if result['length'] < app.config['OCR_MIN_TEXT_LENGTH']:
+        return None, (jsonify({'error': 'Could not extract sufficient text from the image'}), 422)
+    
+    return result, None
+
+@app.route('/ocr', methods=['POST'])
+def ocr():
+    """Extract text from an uploaded image"""
+    start_time = time.time()
+    result, error = extract_uploaded_text()
+    if error:
+        return error
+    
+    return jsonify({
+        'text': result['text'],
+        'text_length': result['length'],
+        'ocr_time': result['ocr_time'],
+        'timings': result['timings'],
+        'processing_time': round(time.time() - start_time, 3)
+    })
+
+@app.route('/analyze-image', methods=['POST'])
+def analyze_image():
+    """Extract text from an uploaded image and analyze it in one call"""
+    start_time = time.time()
+    user_id = session.get('user_id')
+    
+    result, error = extract_uploaded_text()
+    if error:
+        return error
+    
+    try:
+        news_text = result['text'][:50000]
+        prediction, confidence = cached_predict(news_text)
+        processing_time = time.time() - start_time
+        
+        submission_id = record_analysis(
+            user_id, news_text, 'image', None, prediction, confidence, processing_time, '/analyze-image'
+        )
+        
+        logger.info(f"Image prediction made: {prediction} ({confidence:.3f}) in {processing_time:.3f}s")
+        
+        return jsonify({
+            'submission_id': submission_id,
+            'prediction': prediction.lower(),
+            'confidence': round(float(confidence), 4),
+            'processing_time': round(processing_time, 3),
+            'ocr_time': result['ocr_time'],
+            'model_version': model_info['version'],
+            'content_type': 'image',
+            'extracted_text': news_text,
+            'text_length': len(news_text),
+            'timestamp': time.time()
+        })
+        
+    except Exception as e:
+        logger.error(f"Image analysis error: {e}")
+        return jsonify({
+            'error': 'Internal server error during analysis',
+            'processing_time': time.time() - start_time
+        }), 500
+
+@app.route('/analyze-url', methods=['POST'])
+def analyze_url():
+    """Fetch an article URL, extract its text and analyze it in one call"""
+    start_time = time.time()
+    user_id = session.get('user_id')
+    
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+    
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    url = data.get('url')
+    url = url.strip() if isinstance(url, str) else ''
+    if not url:
+        return jsonify({'error': 'URL is required'}), 400
+    
+    try:
+        article = article_fetcher.fetch(url)
+    except FetchError as e:
+        logger.warning(f"URL fetch failed for {url}: {e}")
+        return jsonify({'error': str(e), 'processing_time': time.time() - start_time}), e.status
+    
+    news_text = article['text'][:50000]
+    if len(news_text) < app.config['URL_MIN_TEXT_LENGTH']:
+        return jsonify({'error': 'Could not extract sufficient content from the URL'}), 422
+    
+    try:
+        prediction, confidence = cached_predict(news_text)
+        processing_time = time.time() - start_time
+        
+        submission_id = record_analysis(
+            user_id, news_text, 'url', article['url'], prediction, confidence, processing_time, '/analyze-url'
+        )
+        
+        logger.info(f"URL prediction made: {prediction} ({confidence:.3f}) in {processing_time:.3f}s")
+        
+        return jsonify({
+            'submission_id': submission_id,
+            'prediction': prediction.lower(),
+            'confidence': round(float(confidence), 4),
+            'processing_time': round(processing_time, 3),
+            'fetch_time': article['fetch_time'],
+            'extract_time': article['extract_time'],
+            'from_cache': article['from_cache'],
+            'model_version': model_info['version'],
+            'content_type': 'url',
+            'url': article['url'],
+            'final_url': article['final_url'],
+            'title': article['title'],
+            'author': article['author'],
+            'publish_date': article['publish_date'],
+            'extracted_text': news_text,
+            'text_length': len(news_text),
+            'word_count': len(news_text.split()),
+            'timestamp': time.time()
+        })
+        
+    except Exception as e:
+        logger.error(f"URL analysis error: {e}")
+        return jsonify({
+            'error': 'Internal server error during analysis',
+            'processing_time': time.time() - start_time
+        }), 500
+
+@app.route('/batch-analyze-urls', methods=['POST'])
+def batch_analyze_urls():
+    """
+    Fetch and analyze many article URLs concurrently, streaming one NDJSON
+    line per URL in completion order followed by a summary line
+    """
+    start_time = time.time()
+    
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+    
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    urls = data.get('urls', [])
+    if not urls or not isinstance(urls, list):
+        return jsonify({'error': 'URLs are required as a list'}), 400
+    
+    max_items = app.config['URL_BATCH_MAX_ITEMS']
+    if len(urls) > max_items:
+        return jsonify({'error': f'Maximum {max_items} URLs per batch'}), 400
+    
+    urls = [url.strip() if isinstance(url, str) else '' for url in urls]
+    
+    def generate():
+        counts = {'succeeded': 0, 'failed': 0}
+        fetches = article_fetcher.fetch_many(
+            urls,
+            max_workers=app.config['URL_BATCH_WORKERS'],
+            per_host=app.config['URL_BATCH_PER_HOST'],
+            deadline=app.config['URL_BATCH_DEADLINE']
+        )
+        
+        for completed in fetches:
+            lines = []
+            texts = []
+            articles = []
+            
+            for index, article, error in completed:
+                if error is None and len(article['text']) < app.config['URL_MIN_TEXT_LENGTH']:
+                    error = FetchError('Could not extract sufficient content from the URL', 422)
+                if error is not None:
+                    counts['failed'] += 1
+                    lines.append({'index': index, 'url': urls[index], 'error': str(error), 'status': error.status})
+                    continue
+                texts.append(article['text'][:50000])
+                articles.append((index, article))
+            
+            # Everything that finished fetching together is classified in one vectorized call
+            try:
+                predictions = cached_predict_batch(texts) if texts else []
+            except Exception as e:
+                logger.error(f"URL batch classification error: {e}")
+                predictions = [('UNCERTAIN', 0.5)] * len(texts)
+            
+            for (index, article), text, (prediction, confidence) in zip(articles, texts, predictions):
+                counts['succeeded'] += 1
+                lines.append({
+                    'index': index,
+                    'url': urls[index],
+                    'prediction': prediction.lower(),
+                    'confidence': round(float(confidence), 4),
+                    'title': article['title'],
+                    'text_length': len(text),
+                    'from_cache': article['from_cache'],
+                    'fetch_time': article['fetch_time']
+                })
+            
+            yield ''.join(json.dumps(line) + '\n' for line in lines)
+        
+        yield json.dumps({
+            'summary': {
+                'batch_size': len(urls),
+                'succeeded': counts['succeeded'],
+                'failed': counts['failed'],
+                'processing_time': round(time.time() - start_time, 3)
+            }
+        }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+def classify_stream_batch(batch):
+    """Classify one micro-batch of parsed NDJSON lines; returns (output lines, processed, errors)"""
+    lines = []
+    texts = []
+    items = []
+    
+    for line_number, record, error in batch:
+        item_id = record.get('id') if isinstance(record, dict) else None
+        if error is None:
+            text = record.get('news', record.get('text')) if isinstance(record, dict) else record
+            if not isinstance(text, str) or len(text.strip()) < 10:
+                error = 'Text too short'
+            elif len(text) > 50000:
+                error = 'Text too long (max 50,000 characters)'
+        if error is not None:
+            lines.append({'line': line_number, 'id': item_id, 'prediction': 'uncertain', 'confidence': 0.5, 'error': error})
+            continue
+        texts.append(text.strip())
+        items.append((line_number, item_id))
+    
+    # Straight to the model: one-off bulk rows would only churn the prediction cache
+    predictions = detector.predict_batch(texts) if texts else []
+    for (line_number, item_id), text, (prediction, confidence) in zip(items, texts, predictions):
+        lines.append({
+            'line': line_number,
+            'id': item_id,
+            'prediction': prediction.lower(),
+            'confidence': round(float(confidence), 4),
+            'text_length': len(text)
+        })
+    
+    lines.sort(key=lambda line: line['line'])
+    return lines, len(texts), len(batch) - len(texts)
+
+@app.route('/stream-analyze', methods=['POST'])
+def stream_analyze():
+    """
+    Classify newline-delimited JSON ({"id": ..., "news": "..."} per line)
+    read incrementally from the request body, in micro-batches, streaming
+    one result line per input line and a final summary line
+    """
+    job = stream_jobs.start(request.remote_addr)
+    stream = request.stream
+    
+    def generate():
+        try:
+            parsed = iter_ndjson(stream, app.config['STREAM_MAX_LINE_BYTES'])
+            for batch in micro_batches(parsed, app.config['STREAM_BATCH_SIZE']):
+                lines, processed, errors = classify_stream_batch(batch)
+                job.record_batch(len(batch), processed, errors)
+                yield ''.join(json.dumps(line) + '\n' for line in lines)
+            
+            job.finish()
+            yield json.dumps({'summary': job.to_dict()}) + '\n'
+            
+        except GeneratorExit:
+            job.finish('aborted', 'Client disconnected')
+            raise
+        except Exception as e:
+            logger.error(f"Stream analysis error in job {job.id}: {e}")
+            job.finish('failed', str(e))
+            yield json.dumps({'error': 'Internal server error during stream analysis', 'summary': job.to_dict()}) + '\n'
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['X-Job-Id'] = job.id
+    return response
+
+@app.route('/stream-analyze/jobs', methods=['GET'])
+def get_stream_jobs():
+    """Progress of running and recently finished streaming jobs in this worker"""
+    return jsonify({'jobs': stream_jobs.jobs(), 'pid': os.getpid()})
+
+@app.route('/stream-analyze/jobs/<job_id>', methods=['GET'])
+def get_stream_job(job_id):
+    """Progress and throughput of one streaming job"""
+    job = stream_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found in this worker', 'pid': os.getpid()}), 404
+    return jsonify(job.to_dict())
+
 @app.route('/feedback', methods=['POST'])
 def receive_feedback():
     """Receive feedback to improve model (for future retraining)"""
@@ -552,27 +1028,10 @@ def receive_feedback():
         logger.error(f"Feedback error: {e}")
         return jsonify({'error': 'Failed to process feedback'}), 500
 
-def update_keyword_trends(text, category):
-    """Update keyword trends based on analysis"""
-    try:
-        # Simple keyword extraction (in production, use more sophisticated NLP)
-        words = re.findall(r'\b\w{4,}\b', text.lower())
-        stop_words = set(['this', 'that', 'with', 'have', 'will', 'been', 'said', 'from', 'they'])
-        keywords = [word for word in words if word not in stop_words][:10]  # Top 10
-        
-        for keyword in keywords:
-            trend = KeywordTrend.query.filter_by(keyword=keyword, category=category).first()
-            if trend:
-                trend.frequency += 1
-                trend.last_seen = datetime.utcnow()
-            else:
-                trend = KeywordTrend(keyword=keyword, category=category)
-                db.session.add(trend)
-        
-        db.session.commit()
-    except Exception as e:
-        logger.error(f"Failed to update keyword trends: {e}")
-        db.session.rollback()
+def write_api_logs(rows):
+    """Insert queued API log entries with one multi-row INSERT"""
+    db.session.execute(insert(APILog), rows)
+    increment_counters(api_log_deltas(rows))
 
 @app.route('/login', methods=['POST'])
 def login():
@@ -644,6 +1103,8 @@ def register():
         user = User(name=name, email=email)
         user.set_password(password)
         db.session.add(user)
+        db.session.flush()
+        increment_counters(user_deltas([user]))
         db.session.commit()
         
         # Set session
@@ -667,6 +1128,20 @@ def logout():
     session.clear()
     return jsonify({'success': True, 'message': 'Logged out successfully'})
 
+def encode_cursor(submitted_at, submission_id):
+    """Opaque pagination cursor for the position after a submission"""
+    raw = json.dumps({'t': submitted_at.isoformat(), 'i': submission_id})
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data['t']), int(data['i'])
+    except (TypeError, KeyError, binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
 @app.route('/user/submissions', methods=['GET'])
 def get_user_submissions():
     """Get user's submission history"""
@@ -675,29 +1150,112 @@ def get_user_submissions():
         return jsonify({'error': 'Authentication required'}), 401
     
     try:
-        page = int(request.args.get('page', 1))
-        per_page = min(int(request.args.get('per_page', 20)), 100)
+        per_page = max(1, min(int(request.args.get('per_page', 20)), 100))
+        cursor = request.args.get('cursor')
+        # The COUNT(*) scans all of the user's rows, so by default only the first page pays for it
+        include_total = request.args.get('include_total', 'false' if cursor else 'true').lower() != 'false'
+    except ValueError:
+        return jsonify({'error': 'per_page must be an integer'}), 400
+    
+    try:
+        query = Submission.query.filter(Submission.user_id == user_id)
+        total = query.order_by(None).count() if include_total else None
         
-        submissions = Submission.query.filter_by(user_id=user_id)\
-            .order_by(Submission.submitted_at.desc())\
-            .paginate(page=page, per_page=per_page, error_out=False)
+        # Keyset pagination: continue strictly after the last row of the previous page
+        if cursor:
+            try:
+                submitted_at, last_id = decode_cursor(cursor)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(tuple_(Submission.submitted_at, Submission.id) < (submitted_at, last_id))
+        
+        submissions = query.options(joinedload(Submission.user).load_only(User.name))\
+            .order_by(Submission.submitted_at.desc(), Submission.id.desc())\
+            .limit(per_page + 1).all()
+        
+        has_next = len(submissions) > per_page
+        submissions = submissions[:per_page]
+        next_cursor = encode_cursor(submissions[-1].submitted_at, submissions[-1].id) if has_next else None
+        
+        pagination = {
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': has_next
+        }
+        if include_total:
+            pagination['total'] = total
+            pagination['pages'] = (total + per_page - 1) // per_page
         
         return jsonify({
-            'submissions': [s.to_dict() for s in submissions.items],
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': submissions.total,
-                'pages': submissions.pages,
-                'has_next': submissions.has_next,
-                'has_prev': submissions.has_prev
-            }
+            'submissions': [s.to_dict() for s in submissions],
+            'pagination': pagination
         })
         
     except Exception as e:
         logger.error(f"Failed to get user submissions: {e}")
         return jsonify({'error': 'Failed to retrieve submissions'}), 500
 
+def load_counters(keys):
+    """
+    Read materialized counters; missing ones read as empty. They are
+    rebuilt at startup and by POST /admin/stats/rebuild, never on a read.
+    """
+    return {key: value or {} for key, value in read_counters(keys).items()}
+
+def compute_admin_stats():
+    """Admin dashboard statistics served from materialized counters"""
+    counters = load_counters([counter_key('users'), counter_key('submissions')])
+    users = counters[counter_key('users')]
+    submissions = counters[counter_key('submissions')]
+    
+    total_submissions = submissions.get('total', 0)
+    fake_submissions = submissions.get(PredictionResult.FAKE.value, 0)
+    real_submissions = submissions.get(PredictionResult.REAL.value, 0)
+    
+    # Recent activity
+    recent_submissions = Submission.query.options(joinedload(Submission.user).load_only(User.name))\
+        .order_by(Submission.submitted_at.desc()).limit(10).all()
+    
+    # Trending keywords
+    trending_fake = KeywordTrend.query.filter_by(category='fake')\
+        .order_by(KeywordTrend.frequency.desc()).limit(10).all()
+    trending_real = KeywordTrend.query.filter_by(category='real')\
+        .order_by(KeywordTrend.frequency.desc()).limit(10).all()
+    
+    return {
+        'users': {
+            'total': users.get('total', 0),
+            'active': users.get(UserStatus.ACTIVE.value, 0),
+            'suspended': users.get(UserStatus.SUSPENDED.value, 0),
+            'banned': users.get(UserStatus.BANNED.value, 0)
+        },
+        'submissions': {
+            'total': total_submissions,
+            'fake': fake_submissions,
+            'real': real_submissions,
+            'fake_percentage': (fake_submissions / total_submissions * 100) if total_submissions > 0 else 0
+        },
+        'recent_activity': [s.to_dict() for s in recent_submissions],
+        'trending_keywords': {
+            'fake': [k.to_dict() for k in trending_fake],
+            'real': [k.to_dict() for k in trending_real]
+        }
+    }
+
+def compute_usage_stats():
+    """API usage statistics served from materialized counters"""
+    today_key = counter_key('api_requests', datetime.utcnow().date())
+    counters = load_counters([counter_key('api_requests'), today_key])
+    today = counters[today_key]
+    total = counters[counter_key('api_requests')]
+    
+    total_requests = total.get('count', 0)
+    return {
+        'requests_today': today.get('count', 0),
+        'requests_total': total_requests,
+        'avg_response_time': round(total.get('processing_time_sum', 0) / total_requests, 3) if total_requests else 0.0
+    }
+
 @app.route('/admin/stats', methods=['GET'])
 def get_admin_stats():
     """Get admin dashboard statistics"""
@@ -710,73 +1268,236 @@ def get_admin_stats():
         return jsonify({'error': 'Admin access required'}), 403
     
     try:
-        # Get various statistics
-        total_users = User.query.count()
-        total_submissions = Submission.query.count()
-        fake_submissions = Submission.query.filter_by(prediction=PredictionResult.FAKE).count()
-        real_submissions = Submission.query.filter_by(prediction=PredictionResult.REAL).count()
-        
-        # Recent activity
-        recent_submissions = Submission.query.order_by(Submission.submitted_at.desc()).limit(10).all()
-        
-        # Trending keywords
-        trending_fake = KeywordTrend.query.filter_by(category='fake')\
-            .order_by(KeywordTrend.frequency.desc()).limit(10).all()
-        trending_real = KeywordTrend.query.filter_by(category='real')\
-            .order_by(KeywordTrend.frequency.desc()).limit(10).all()
-        
-        return jsonify({
-            'users': {
-                'total': total_users,
-                'active': User.query.filter_by(status=UserStatus.ACTIVE).count(),
-                'suspended': User.query.filter_by(status=UserStatus.SUSPENDED).count(),
-                'banned': User.query.filter_by(status=UserStatus.BANNED).count()
-            },
-            'submissions': {
-                'total': total_submissions,
-                'fake': fake_submissions,
-                'real': real_submissions,
-                'fake_percentage': (fake_submissions / total_submissions * 100) if total_submissions > 0 else 0
-            },
-            'recent_activity': [s.to_dict() for s in recent_submissions],
-            'trending_keywords': {
-                'fake': [k.to_dict() for k in trending_fake],
-                'real': [k.to_dict() for k in trending_real]
-            },
-            'model_info': model_info
-        })
+        payload = stats_cache.get_or_compute('admin_stats', compute_admin_stats)
+        return jsonify(dict(payload, model_info=model_info))
         
     except Exception as e:
         logger.error(f"Failed to get admin stats: {e}")
         return jsonify({'error': 'Failed to retrieve statistics'}), 500
 
+def model_reload_summary():
+    """Reload count and the running shadow comparison, if any"""
+    status = model_manager.status()
+    return {
+        'reloads': status['reloads'],
+        'reloading': status['reloading'],
+        'shadow': status['shadow']
+    }
+
 @app.route('/stats', methods=['GET'])
 def get_stats():
     """Get API usage statistics"""
     try:
-        total_requests = APILog.query.count()
-        today_requests = APILog.query.filter(
-            APILog.created_at >= datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        ).count()
-        
-        avg_response_time = db.session.query(db.func.avg(APILog.processing_time)).scalar() or 0
+        usage = stats_cache.get_or_compute('usage_stats', compute_usage_stats)
         
         return jsonify({
-            'requests_today': today_requests,
-            'requests_total': total_requests,
-            'avg_response_time': round(float(avg_response_time), 3),
+            'requests_today': usage['requests_today'],
+            'requests_total': usage['requests_total'],
+            'avg_response_time': usage['avg_response_time'],
             'model_accuracy': model_info['accuracy'],
+            'prediction_cache': prediction_cache.stats(),
+            'write_behind': write_queue.metrics(),
+            'keyword_trends': trend_aggregator.metrics(),
+            'stats_counters': counter_aggregator.metrics(),
+            'ocr': ocr_pool.metrics(),
+            'article_cache': article_fetcher.cache.stats() if article_fetcher.cache else None,
+            'streaming': stream_jobs.summary(),
+            'model_reload': model_reload_summary(),
+            'micro_batch': micro_batcher.stats(),
             'uptime': time.time()
         })
     except Exception as e:
         logger.error(f"Failed to get stats: {e}")
-        return jsonify({
-            'requests_today': 0,
-            'requests_total': 0,
-            'avg_response_time': 0.15,
-            'model_accuracy': model_info['accuracy'],
-            'uptime': time.time()
-        })
+        return jsonify({'error': 'Failed to retrieve statistics'}), 500
+
+@app.route('/admin/stats/timeseries', methods=['GET'])
+def get_admin_stats_timeseries():
+    """Per-day submission histogram and per-model breakdown for a date range"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        today = datetime.utcnow().date()
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') else today
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') \
+            else end_date - timedelta(days=29)
+    except ValueError:
+        return jsonify({'error': 'Dates must be formatted as YYYY-MM-DD'}), 400
+    
+    if start_date > end_date:
+        return jsonify({'error': 'start must not be after end'}), 400
+    
+    if (end_date - start_date).days >= app.config['STATS_TIMESERIES_MAX_DAYS']:
+        return jsonify({'error': f"Maximum range is {app.config['STATS_TIMESERIES_MAX_DAYS']} days"}), 400
+    
+    try:
+        # Half-open range covering the whole end day
+        start = datetime.combine(start_date, datetime.min.time())
+        end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        
+        def compute():
+            return {
+                'start': start_date.isoformat(),
+                'end': end_date.isoformat(),
+                'predictions': prediction_distribution(start, end),
+                'daily': daily_submission_histogram(start, end),
+                'model_versions': model_version_breakdown(start, end)
+            }
+        
+        return jsonify(stats_cache.get_or_compute(f"timeseries:{start_date}:{end_date}", compute))
+        
+    except Exception as e:
+        logger.error(f"Failed to get stats timeseries: {e}")
+        return jsonify({'error': 'Failed to retrieve statistics'}), 500
+
+@app.route('/admin/stats/rebuild', methods=['POST'])
+def rebuild_admin_stats():
+    """Recompute materialized counters from the base tables"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        counters = rebuild_counters()
+        stats_cache.clear()
+        return jsonify({'success': True, 'counters': counters})
+    except Exception as e:
+        logger.error(f"Failed to rebuild stats counters: {e}")
+        db.session.rollback()
+        return jsonify({'error': 'Failed to rebuild statistics'}), 500
+
+@app.route('/admin/model', methods=['GET'])
+def get_model_status():
+    """Serving model, reload progress and shadow scoring results for this worker"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    return jsonify(dict(model_manager.status(), pid=os.getpid()))
+
+@app.route('/admin/model/reload', methods=['POST'])
+def reload_model():
+    """
+    Load an artifact (default: LATEST) in the background and swap it in.
+    LATEST is pointed at it so every worker follows, which also makes this
+    the way to roll back to an earlier version.
+    """
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    artifact_dir = app.config['MODEL_ARTIFACT_DIR']
+    try:
+        artifact = resolve_artifact(data['artifact'], artifact_dir) if data.get('artifact') \
+            else latest_artifact_path(artifact_dir)
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    if not artifact:
+        return jsonify({'error': 'No model artifact found'}), 404
+    # Without a watcher nothing would apply the pointer after a running load
+    if model_manager.reloading and not model_manager.watch_interval:
+        return jsonify({'error': 'A model load is already in progress'}), 409
+    
+    set_latest(artifact, artifact_dir)
+    # While another load runs, the watcher follows the new LATEST once it is done
+    queued = not model_manager.reload(artifact)
+    
+    return jsonify({
+        'success': True,
+        'artifact': os.path.basename(artifact),
+        'queued': queued,
+        'status': model_manager.status()
+    }), 202
+
+@app.route('/admin/model/shadow', methods=['POST', 'DELETE'])
+def shadow_model():
+    """Start (POST) or stop (DELETE) shadow scoring sampled traffic with a candidate artifact"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    artifact_dir = app.config['MODEL_ARTIFACT_DIR']
+    if request.method == 'DELETE':
+        clear_shadow(artifact_dir)
+        model_manager.stop_shadow()
+        return jsonify({'success': True, 'status': model_manager.status()})
+    
+    data = request.get_json(silent=True) or {}
+    if not data.get('artifact'):
+        return jsonify({'error': 'artifact is required'}), 400
+    try:
+        artifact = resolve_artifact(data['artifact'], artifact_dir)
+        sample_rate = float(data.get('sample_rate', app.config['MODEL_SHADOW_SAMPLE_RATE']))
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except (TypeError, ValueError):
+        return jsonify({'error': 'sample_rate must be a number'}), 400
+    if not 0 < sample_rate <= 1:
+        return jsonify({'error': 'sample_rate must be in (0, 1]'}), 400
+    if model_manager.reloading and not model_manager.watch_interval:
+        return jsonify({'error': 'A model load is already in progress'}), 409
+    
+    set_shadow(artifact, sample_rate, artifact_dir)
+    # While another load runs, the watcher follows the new SHADOW once it is done
+    queued = not model_manager.start_shadow(artifact, sample_rate)
+    
+    return jsonify({
+        'success': True,
+        'artifact': os.path.basename(artifact),
+        'sample_rate': sample_rate,
+        'queued': queued
+    }), 202
+
+@app.route('/admin/model/promote', methods=['POST'])
+def promote_shadow_model():
+    """Serve the shadow candidate and point LATEST at it"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    user = User.query.get(user_id)
+    if not user or not user.is_admin():
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    shadow = model_manager.shadow
+    if shadow is None:
+        return jsonify({'error': 'No shadow model is running'}), 409
+    
+    # Move the pointers first, as reload_model does, so watchers here and in
+    # other workers never see LATEST behind the model being served
+    artifact_dir = app.config['MODEL_ARTIFACT_DIR']
+    candidate = shadow.candidate
+    clear_shadow(artifact_dir)
+    set_latest(candidate.artifact, artifact_dir)
+    
+    promoted = model_manager.promote_shadow()
+    if promoted is None:
+        return jsonify({'error': 'No shadow model is running'}), 409
+    return jsonify({'success': True, 'version': promoted.version, 'status': model_manager.status()})
+
+write_queue.register('api_log', write_api_logs)
 
 @app.errorhandler(404)
 def not_found(error):
@@ -790,32 +1511,98 @@ def method_not_allowed(error):
 def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
-# Initialize database and model on startup
-with app.app_context():
+def bootstrap_database():
+    """
+    Create the schema, the default admin user and any missing statistics
+    counters; run once by `python bootstrap.py init`. Returns whether the
+    admin user was created.
+    """
+    db.create_all()
+    logger.info("Database tables created successfully")
+    migrate_keyword_trends()
+    
+    created = create_admin_user()
+    
+    totals = read_counters([counter_key(name) for name in TOTAL_COUNTERS])
+    if any(value is None for value in totals.values()):
+        rebuild_counters()
+    return created
+
+def create_admin_user():
+    """Create the default admin user if it doesn't exist"""
+    admin_user = User.query.filter_by(email='admin@fakenews.com').first()
+    if admin_user:
+        return False
+    
+    admin_user = User(
+        name='System Administrator',
+        email='admin@fakenews.com',
+        role=UserRole.ADMIN,
+        status=UserStatus.ACTIVE,
+        email_verified=True
+    )
+    admin_user.set_password('admin123')
+    db.session.add(admin_user)
+    db.session.flush()
+    increment_counters(user_deltas([admin_user]))
+    db.session.commit()
+    logger.info("Default admin user created")
+    return True
+
+def create_app(preload=False):
+    """
+    Finish startup for this process and return the app: load and warm up the
+    model and start the artifact watcher. With MODEL_LOAD_ASYNC this runs on
+    a background thread and /ready answers 503 until it is done. Nothing
+    here downloads data or touches the schema. Calling it again is a no-op.
+    
+    preload=True is for a master that forks workers (gunicorn.conf.py): the
+    model is loaded synchronously, no threads or OCR workers are started,
+    and every object loaded so far is frozen out of the cyclic GC so
+    collections in the workers do not write to, and un-share, the pages
+    they inherited. Each worker then calls after_fork().
+    """
+    with startup_lock:
+        if startup_info['create_app_started_at'] is not None:
+            return app
+        startup_info['create_app_started_at'] = time.time()
+    
+    if preload:
+        start_serving(watch=False)
+        startup_info['preloaded'] = True
+        gc.freeze()
+        return app
+    
+    start_ocr_workers()
+    if app.config['MODEL_LOAD_ASYNC']:
+        threading.Thread(target=start_serving, name='model-startup', daemon=True).start()
+    else:
+        start_serving()
+    return app
+
+def start_ocr_workers():
+    """
+    Fork the OCR worker processes now, before this process starts any
+    thread; forking later, while another thread holds a lock, can deadlock
+    a worker
+    """
     try:
-        db.create_all()
-        logger.info("Database tables created successfully")
-        
-        # Create default admin user if it doesn't exist
-        admin_user = User.query.filter_by(email='admin@fakenews.com').first()
-        if not admin_user:
-            admin_user = User(
-                name='System Administrator',
-                email='admin@fakenews.com',
-                role=UserRole.ADMIN,
-                status=UserStatus.ACTIVE,
-                email_verified=True
-            )
-            admin_user.set_password('admin123')
-            db.session.add(admin_user)
-            db.session.commit()
-            logger.info("Default admin user created")
-        
+        ocr_pool.warm()
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.warning(f"OCR workers could not be started: {e}")
+
+def after_fork():
+    """Per-worker setup in a worker forked from a preloaded master"""
+    with app.app_context():
+        # Pooled connections must not cross a fork; the worker opens its own
+        db.engine.dispose(close=False)
+    startup_info['worker_started_at'] = time.time()
+    start_ocr_workers()
+    model_manager.ensure_watching()
 
-initialize_model()
+startup_info['import_time'] = round(time.time() - IMPORT_STARTED_AT, 3)
 
 if __name__ == '__main__':
     # Run the Flask app
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    create_app()
+    app.run(host='0.0.0.0', port=5000, debug=True)
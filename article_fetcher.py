@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Article Fetching and Extraction
+AI-Powered Fake News Detection System
+
+Fetches news pages over a pooled keep-alive HTTP session, extracts the
+main article text with trafilatura and keeps a bounded on-disk cache of
+the results, keyed by normalized URL and revalidated with the page's ETag.
+Every hop of a fetch, redirects included, is resolved first and refused if
+it points at a loopback, private, link-local, multicast or reserved
+address, so the API cannot be used to reach internal services.
+
+Usage:
+    python article_fetcher.py URL [--cache-dir DIR] [--allow-private]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import ipaddress
+import logging
+import argparse
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit, urlunsplit, urljoin, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as URLLibError, ReadTimeoutError
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; FakeNewsDetector/1.0)'
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+TRACKING_PARAM_PREFIXES = ('utm_',)
+TRACKING_PARAMS = frozenset(['fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', '_ga'])
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'application/xml', 'text/xml', 'text/plain')
+READ_CHUNK_SIZE = 64 * 1024
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+class FetchError(Exception):
+    """A URL could not be fetched or yielded no article; status is the HTTP status to report"""
+
+    def __init__(self, message, status=502):
+        super().__init__(message)
+        self.status = status
+
+def normalize_url(url):
+    """
+    Canonical form of an http(s) URL for cache keys: lowercase scheme and
+    host, no default port, credentials or fragment, tracking parameters
+    removed and the remaining query parameters sorted.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = parts.hostname
+        port = parts.port
+    except (AttributeError, ValueError):
+        raise FetchError('Invalid URL provided', 400)
+
+    if scheme not in DEFAULT_PORTS or not host:
+        raise FetchError('Invalid URL provided', 400)
+
+    if ':' in host:
+        host = f"[{host}]"
+    netloc = host if port in (None, DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+def is_public_address(address):
+    """Whether an IP address may be fetched: not loopback, private, link-local, multicast or reserved"""
+    address = ipaddress.ip_address(address.split('%')[0] if isinstance(address, str) else address)
+    if getattr(address, 'ipv4_mapped', None):
+        address = address.ipv4_mapped
+    return address.is_global and not (
+        address.is_private or address.is_loopback or address.is_link_local or address.is_multicast
+        or address.is_reserved or address.is_unspecified
+    )
+
+def check_url_address(url):
+    """
+    Resolve the host of an http(s) URL and raise FetchError unless every
+    address it resolves to is public.
+    """
+    try:
+        parts = urlsplit(url)
+        scheme, host, port = parts.scheme.lower(), parts.hostname, parts.port
+    except ValueError:
+        raise FetchError('Invalid URL provided', 400)
+    if scheme not in DEFAULT_PORTS or not host:
+        raise FetchError('Invalid URL provided', 400)
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port or DEFAULT_PORTS[scheme],
+                                                               type=socket.SOCK_STREAM)}
+    except (socket.gaierror, UnicodeError):
+        raise FetchError('Could not resolve the URL host', 502)
+
+    if not addresses or not all(is_public_address(address) for address in addresses):
+        raise FetchError('URL points to a private or reserved address', 400)
+
+def extract_article(html, url=None):
+    """Main text and metadata of an HTML page, via trafilatura"""
+    # Imported on first use; it is not needed until a URL is submitted
+    import trafilatura
+
+    result = trafilatura.extract(
+        html, url=url, output_format='json', with_metadata=True, include_comments=False, include_tables=False
+    )
+    if not result:
+        raise FetchError('Could not extract article text from the URL', 422)
+
+    data = json.loads(result)
+    return {
+        'title': data.get('title'),
+        'author': data.get('author'),
+        'publish_date': data.get('date'),
+        'text': ' '.join((data.get('text') or '').split())
+    }
+
+class ArticleCache:
+    """
+    Bounded on-disk cache of extracted articles, one JSON file per
+    normalized URL. Entries younger than ttl are served without a request;
+    older ones are revalidated with their ETag/Last-Modified. The least
+    recently used files are removed once there are more than max_entries.
+    """
+
+    def __init__(self, directory, max_entries=5000, ttl=3600):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes_since_prune = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        """Cached entry for a normalized URL, or None"""
+        path = self._path(url)
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+            # Reads count as use for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+
+    def is_fresh(self, entry):
+        return time.time() - entry.get('fetched_at', 0) < self.ttl
+
+    def set(self, url, entry):
+        path = self._path(url)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache article {url}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= max(1, self.max_entries // 10)
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune()
+
+    def prune(self):
+        """Remove the least recently used entries beyond max_entries"""
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+                with self._lock:
+                    self._stats['evictions'] += 1
+            except OSError:
+                pass
+
+    def record(self, outcome):
+        with self._lock:
+            self._stats[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_entries'] = self.max_entries
+        stats['ttl'] = self.ttl
+        return stats
+
+class ArticleFetcher:
+    """Fetch and extract articles over a pooled keep-alive session"""
+
+    def __init__(self, cache=None, timeout=10, connect_timeout=5, max_bytes=5 * 1024 * 1024, pool_size=10,
+                 retries=2, user_agent=DEFAULT_USER_AGENT, session=None, allow_private_addresses=False):
+        self.cache = cache
+        # Read timeout per socket read, and the limit for a whole fetch including redirects
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_bytes = max_bytes
+        self.pool_size = pool_size
+        self.retries = retries
+        self.user_agent = user_agent
+        # Only for tests against a local stand-in server
+        self.allow_private_addresses = allow_private_addresses
+
+        self._session = session
+        self._pid = os.getpid() if session is not None else None
+        self._lock = threading.Lock()
+
+    def session(self):
+        # Pooled connections must not be shared across a fork
+        if self._session is not None and self._pid == os.getpid():
+            return self._session
+
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_size,
+                    pool_maxsize=self.pool_size,
+                    # Retry refused connections and gateway errors; a slow host is not retried
+                    max_retries=Retry(
+                        total=self.retries, read=False, backoff_factor=0.3,
+                        status_forcelist=(502, 503, 504), allowed_methods=('GET', 'HEAD'),
+                        raise_on_status=False
+                    )
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update({
+                    'User-Agent': self.user_agent,
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Language': 'en-US,en;q=0.5'
+                })
+                self._session, self._pid = session, os.getpid()
+            return self._session
+
+    def _check_peer(self, response):
+        # The host was checked before connecting; also check what we actually
+        # connected to, in case its DNS answer changed in between
+        sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+        if sock is None or self.allow_private_addresses:
+            return
+        try:
+            peer = sock.getpeername()[0]
+        except OSError:
+            return
+        if not is_public_address(peer):
+            raise FetchError('URL points to a private or reserved address', 400)
+
+    def _read_body(self, response, deadline):
+        """
+        Read the body up to max_bytes. Reads return whatever has arrived, so
+        a server trickling bytes is cut off at the deadline instead of
+        holding the worker for one read timeout per chunk.
+        """
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+            raise FetchError(f"Page is too large (max {self.max_bytes} bytes)", 422)
+
+        sock = getattr(getattr(response.raw, 'connection', None), 'sock', None)
+        body = bytearray()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FetchError('Timed out fetching URL', 504)
+            if sock is not None:
+                sock.settimeout(min(remaining, self.timeout))
+
+            try:
+                chunk = response.raw.read1(READ_CHUNK_SIZE, decode_content=True)
+            except ReadTimeoutError:
+                raise FetchError('Timed out fetching URL', 504)
+            except URLLibError as e:
+                raise FetchError(f"Could not fetch URL: {e}", 502)
+            if not chunk:
+                return bytes(body)
+
+            body.extend(chunk)
+            if len(body) > self.max_bytes:
+                raise FetchError(f"Page is too large (max {self.max_bytes} bytes)", 422)
+
+    def _get(self, url, headers, deadline):
+        """
+        GET a URL, following redirects by hand so every hop's address is
+        checked. Returns the final streaming response.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            if not self.allow_private_addresses:
+                check_url_address(url)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FetchError('Timed out fetching URL', 504)
+            try:
+                response = self.session().get(
+                    url, headers=headers, timeout=(min(self.connect_timeout, remaining), min(self.timeout, remaining)),
+                    stream=True, allow_redirects=False
+                )
+            except requests.Timeout:
+                raise FetchError('Timed out fetching URL', 504)
+            except requests.RequestException as e:
+                raise FetchError(f"Could not fetch URL: {e}", 502)
+
+            try:
+                self._check_peer(response)
+            except FetchError:
+                response.close()
+                raise
+
+            location = response.headers.get('Location')
+            if response.status_code not in REDIRECT_STATUSES or not location:
+                return response
+            response.close()
+            url = urljoin(response.url, location)
+
+        raise FetchError('Too many redirects', 502)
+
+    def fetch(self, url):
+        """
+        Fetch and extract an article. Returns a dict with url, final_url,
+        title, author, publish_date, text, etag, from_cache and timings;
+        raises FetchError.
+        """
+        url = normalize_url(url)
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            self.cache.record('hits')
+            return dict(cached, from_cache=True, fetch_time=0.0, extract_time=0.0)
+
+        headers = {}
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+        start_time = time.time()
+        deadline = time.monotonic() + self.timeout
+        response = self._get(url, headers, deadline)
+
+        with response:
+            etag = response.headers.get('ETag')
+            # Unchanged page: keep the extraction, restart the TTL
+            if cached and (response.status_code == 304 or (etag and etag == cached.get('etag'))):
+                entry = dict(cached, fetched_at=time.time())
+                self.cache.set(url, entry)
+                self.cache.record('revalidated')
+                return dict(entry, from_cache=True, fetch_time=round(time.time() - start_time, 3), extract_time=0.0)
+
+            if response.status_code >= 400:
+                raise FetchError(f"URL returned HTTP {response.status_code}", 502)
+
+            content_type = response.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+            if content_type not in HTML_CONTENT_TYPES:
+                raise FetchError(f"URL does not point to an article page ({content_type})", 422)
+
+            html = self._read_body(response, deadline)
+        fetch_time = time.time() - start_time
+
+        start_time = time.time()
+        article = extract_article(html, response.url)
+        extract_time = time.time() - start_time
+
+        entry = dict(
+            article,
+            url=url,
+            final_url=response.url,
+            etag=etag,
+            last_modified=response.headers.get('Last-Modified'),
+            fetched_at=time.time()
+        )
+        if self.cache:
+            self.cache.set(url, entry)
+            self.cache.record('misses')
+        return dict(entry, from_cache=False, fetch_time=round(fetch_time, 3), extract_time=round(extract_time, 3))
+
+    def fetch_many(self, urls, max_workers=16, per_host=4, deadline=None):
+        """
+        Fetch many URLs concurrently. Yields lists of (index, article, error)
+        in completion order, one list per batch of fetches that finished
+        together, so callers can classify each list in one call; error is a
+        FetchError or None. At most per_host
+        requests run against one host at a time, and work for other hosts
+        is started first so one slow site does not hold up the rest. URLs
+        still unfinished after deadline seconds are reported as timed out.
+        """
+        queues = {}
+        invalid = []
+        for index, url in enumerate(urls):
+            try:
+                url = normalize_url(url)
+            except FetchError as e:
+                invalid.append((index, e))
+                continue
+            queues.setdefault(urlsplit(url).netloc, deque()).append((index, url))
+
+        if invalid:
+            yield [(index, None, error) for index, error in invalid]
+
+        end_time = time.time() + deadline if deadline else None
+        active = {}
+        running = {}
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='url-fetch')
+
+        def schedule():
+            # Fill free workers round-robin across hosts with spare capacity
+            progress = True
+            while progress and len(running) < max_workers:
+                progress = False
+                for host, queue in queues.items():
+                    if queue and active.get(host, 0) < per_host and len(running) < max_workers:
+                        index, url = queue.popleft()
+                        running[executor.submit(self.fetch, url)] = (index, host)
+                        active[host] = active.get(host, 0) + 1
+                        progress = True
+
+        try:
+            schedule()
+            while running:
+                timeout = end_time - time.time() if end_time else None
+                done, _ = wait(running, timeout=max(0, timeout) if timeout is not None else None,
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+
+                results = []
+                for future in done:
+                    index, host = running.pop(future)
+                    active[host] -= 1
+                    try:
+                        results.append((index, future.result(), None))
+                    except FetchError as e:
+                        results.append((index, None, e))
+                    except Exception as e:
+                        results.append((index, None, FetchError(f"Could not fetch URL: {e}", 502)))
+                # Start the next fetches before the caller works on these results
+                schedule()
+                yield results
+
+            # Deadline reached: report everything still running or queued
+            unfinished = [index for index, _ in running.values()]
+            unfinished += [index for queue in queues.values() for index, _ in queue]
+            if unfinished:
+                yield [(index, None, FetchError('Timed out fetching URL', 504)) for index in unfinished]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch a URL and extract the article text')
+    parser.add_argument('url', help='Article URL')
+    parser.add_argument('--cache-dir', help='On-disk article cache directory')
+    parser.add_argument('--timeout', type=float, default=10, help='Time limit for the whole fetch in seconds')
+    parser.add_argument('--allow-private', action='store_true',
+                        help='Allow loopback and private addresses, e.g. a local stand-in server')
+
+    args = parser.parse_args()
+    fetcher = ArticleFetcher(cache=ArticleCache(args.cache_dir) if args.cache_dir else None, timeout=args.timeout,
+                             allow_private_addresses=args.allow_private)
+
+    try:
+        print(json.dumps(fetcher.fetch(args.url), indent=2))
+    except FetchError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
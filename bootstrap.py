@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Deployment Bootstrap
+AI-Powered Fake News Detection System
+
+One-time setup that used to run on every API import: downloads the NLTK
+data, snapshots the stop words and Punkt parameters preprocessing needs,
+and creates the database schema and default admin user. Also measures the
+API's cold start (spawn to create_app() returning) so it can be tracked
+across changes.
+
+Usage:
+    python bootstrap.py init [--skip-nltk] [--skip-db] [--allow-degraded]
+    python bootstrap.py coldstart [--runs N] [--report FILE] [--max-seconds S]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from text_preprocessing import ensure_nltk_data, export_resources, RESOURCE_SNAPSHOT_PATH
+
+logger = logging.getLogger(__name__)
+
+# Runs in a fresh interpreter for every cold start measurement
+COLDSTART_PROBE = (
+    "import json\n"
+    "from app import create_app, cold_start_summary\n"
+    "create_app()\n"
+    "print(json.dumps(cold_start_summary()), flush=True)\n"
+)
+COLDSTART_FIELDS = ('wall_time', 'import_time', 'model_load_time', 'warmup_time', 'startup_time')
+
+def init(args):
+    """Download NLTK data, write the resource snapshot and create the schema"""
+    if not args.skip_nltk:
+        missing = ensure_nltk_data(download=True)
+        if 'stopwords' in missing or (missing and not args.allow_degraded):
+            raise RuntimeError(f"Could not download NLTK data: {', '.join(missing)}")
+        if missing:
+            # Sentence splitting falls back to empty Punkt tables without them
+            print(f"Warning: could not download {', '.join(missing)}; sentence splitting will not "
+                  f"use learned abbreviations", file=sys.stderr)
+        path = export_resources(args.snapshot, allow_degraded=args.allow_degraded)
+        print(f"NLTK data installed; resource snapshot written to {path}")
+
+    if not args.skip_db:
+        from app import app, bootstrap_database
+
+        with app.app_context():
+            created = bootstrap_database()
+        print(f"Database schema ready{'; default admin user created' if created else ''}")
+
+def measure_cold_start(timeout=120):
+    """Start the API in a new interpreter and time it until create_app() returns"""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, '-c', COLDSTART_PROBE],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE, stderr=stderr, text=True
+        )
+        try:
+            line = proc.stdout.readline()
+            wall_time = time.perf_counter() - start
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            raise RuntimeError(f"Cold start did not finish within {timeout}s")
+        finally:
+            proc.stdout.close()
+
+        if not line:
+            stderr.seek(0)
+            output = stderr.read().decode(errors='replace').strip().splitlines()
+            raise RuntimeError(f"API failed to start: {output[-1] if output else 'no output'}")
+
+    result = json.loads(line)
+    result['wall_time'] = round(wall_time, 3)
+    return result
+
+def summarize(runs):
+    summary = {'runs': len(runs)}
+    for field in COLDSTART_FIELDS:
+        values = [run[field] for run in runs if run.get(field) is not None]
+        if values:
+            summary[field] = {
+                'median': round(statistics.median(values), 3),
+                'min': round(min(values), 3),
+                'max': round(max(values), 3)
+            }
+    return summary
+
+def coldstart(args):
+    """Measure cold start over several runs and optionally enforce a budget"""
+    runs = []
+    for i in range(args.runs):
+        run = measure_cold_start(args.timeout)
+        runs.append(run)
+        print(f"run {i + 1}: {run['wall_time']:.3f}s (import {run['import_time']}s, "
+              f"model {run['model_load_time']}s, warmup {run['warmup_time']}s, ready={run['ready']})")
+
+    summary = summarize(runs)
+    print(f"median cold start: {summary['wall_time']['median']:.3f}s over {len(runs)} runs")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({'summary': summary, 'runs': runs, 'measured_at': time.time()}, f, indent=2)
+
+    if not all(run['ready'] for run in runs):
+        raise RuntimeError("API started without a model; see /ready")
+    if args.max_seconds and summary['wall_time']['median'] > args.max_seconds:
+        raise RuntimeError(f"Median cold start {summary['wall_time']['median']:.3f}s exceeds {args.max_seconds}s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Bootstrap a deployment and measure API cold start')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    init_parser = subparsers.add_parser('init', help='Download NLTK data and create the database schema')
+    init_parser.add_argument('--skip-nltk', action='store_true', help='Do not download NLTK data')
+    init_parser.add_argument('--skip-db', action='store_true', help='Do not create the schema or admin user')
+    init_parser.add_argument('--snapshot', default=RESOURCE_SNAPSHOT_PATH,
+                             help='Where to write the stop word and Punkt snapshot')
+    init_parser.add_argument('--allow-degraded', action='store_true',
+                             help='Write the snapshot with empty Punkt tables if the Punkt data is missing')
+    init_parser.set_defaults(func=init)
+
+    coldstart_parser = subparsers.add_parser('coldstart', help='Time API startup in fresh processes')
+    coldstart_parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to measure')
+    coldstart_parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for each start')
+    coldstart_parser.add_argument('--report', help='Write per-run timings and a summary as JSON')
+    coldstart_parser.add_argument('--max-seconds', type=float,
+                                  help='Fail if the median cold start is slower than this')
+    coldstart_parser.set_defaults(func=coldstart)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Offline Bulk Scoring
+AI-Powered Fake News Detection System
+
+Scores CSV, JSON Lines or Parquet corpora with the persisted model without
+going through the API. Input is read in chunks, chunks are classified
+across a process pool (one vectorized predict_proba per chunk) and written
+out in input order with prediction and confidence columns added.
+
+Usage:
+    python bulk_score.py INPUT OUTPUT [--text-column news] [--chunk-size 10000] [--workers N]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import resource
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from model_store import load_artifact, DEFAULT_ARTIFACT_DIR
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.pq': 'parquet'}
+
+def detect_format(path, explicit=None):
+    """File format from an explicit choice or the file extension"""
+    if explicit:
+        return explicit
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Cannot infer the format of {path}; pass --input-format/--output-format")
+    return FORMAT_EXTENSIONS[extension]
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet support needs pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+def read_chunks(path, file_format, chunk_size):
+    """Yield DataFrames of up to chunk_size rows"""
+    if file_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+    elif file_format == 'jsonl':
+        yield from pd.read_json(path, lines=True, chunksize=chunk_size)
+    elif file_format == 'parquet':
+        _, pq = _import_pyarrow()
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported format: {file_format}")
+
+class ChunkWriter:
+    """Append scored chunks to one output file in the given format"""
+
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self._parquet_writer = None
+        self._first = True
+
+    def write(self, frame):
+        if self.file_format == 'csv':
+            frame.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        elif self.file_format == 'jsonl':
+            lines = frame.to_json(orient='records', lines=True, force_ascii=False) if len(frame) else ''
+            # Older pandas leaves off the final newline, newer versions write it
+            if lines and not lines.endswith('\n'):
+                lines += '\n'
+            with open(self.path, 'w' if self._first else 'a', encoding='utf-8') as f:
+                f.write(lines)
+        elif self.file_format == 'parquet':
+            pa, pq = _import_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table.cast(self._parquet_writer.schema))
+        self._first = False
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+_detector = None
+
+def _init_worker(artifact_path):
+    # Each worker memory-maps the same artifact, so the model arrays live once in the page cache
+    global _detector
+    from fake_news_detector import FakeNewsDetector
+
+    artifact = load_artifact(artifact_path)
+    _detector = FakeNewsDetector()
+    _detector.load_model(artifact['pipeline'], artifact['model_info'])
+
+def _score_texts(texts):
+    results = _detector.predict_batch(texts)
+    return [prediction for prediction, _ in results], [round(float(confidence), 4) for _, confidence in results]
+
+def peak_memory():
+    """Peak RSS in bytes of this process and of the largest finished worker"""
+    # ru_maxrss is in kilobytes on Linux
+    return {
+        'main_peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'worker_peak_rss_bytes': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    }
+
+def score_file(input_path, output_path, text_column='news', input_format=None, output_format=None,
+               chunk_size=10000, workers=None, artifact_path=None, artifact_dir=None, progress=None):
+    """
+    Score every row of input_path and write it to output_path with
+    prediction and confidence columns. Returns throughput and memory stats.
+    """
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+
+    try:
+        artifact = load_artifact(artifact_path, artifact_dir)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(f"{e}; run 'python model_store.py train' first") from e
+    model_version = artifact['model_info']['version']
+    artifact_path = artifact['path']
+    del artifact
+
+    writer = ChunkWriter(output_path, output_format)
+    pending = deque()
+    rows = 0
+    start_time = time.time()
+
+    def write_next():
+        nonlocal rows
+        frame, future = pending.popleft()
+        predictions, confidences = future.result()
+        frame['prediction'] = predictions
+        frame['confidence'] = confidences
+        writer.write(frame)
+        rows += len(frame)
+        if progress:
+            elapsed = time.time() - start_time
+            progress(rows, rows / elapsed if elapsed else 0.0)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                                 initializer=_init_worker, initargs=(artifact_path,)) as executor:
+            for frame in read_chunks(input_path, input_format, chunk_size):
+                if text_column not in frame.columns:
+                    raise ValueError(f"Column '{text_column}' not found in {input_path}")
+
+                texts = frame[text_column].fillna('').astype(str).tolist()
+                pending.append((frame, executor.submit(_score_texts, texts)))
+
+                # Keep every worker busy without reading the whole file ahead
+                while len(pending) > 2 * workers:
+                    write_next()
+
+            while pending:
+                write_next()
+    finally:
+        writer.close()
+
+    elapsed = time.time() - start_time
+    stats = {
+        'rows': rows,
+        'elapsed': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed, 1) if elapsed else 0.0,
+        'workers': workers,
+        'model_version': model_version
+    }
+    stats.update(peak_memory())
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a CSV, JSON Lines or Parquet corpus with the persisted model')
+    parser.add_argument('input', help='Input file (.csv, .jsonl/.ndjson or .parquet)')
+    parser.add_argument('output', help='Output file; same columns plus prediction and confidence')
+    parser.add_argument('--text-column', default='news', help='Column holding the article text')
+    parser.add_argument('--input-format', choices=FORMATS, help='Override the format inferred from the extension')
+    parser.add_argument('--output-format', choices=FORMATS, help='Override the format inferred from the extension')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per chunk')
+    parser.add_argument('--workers', type=int, help='Scoring processes (default: one per core)')
+    parser.add_argument('--artifact', help='Model artifact to use (default: LATEST)')
+    parser.add_argument('--artifact-dir', default=os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR),
+                        help='Directory holding model artifacts')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    def progress(rows, rate):
+        print(f"\r{rows} rows ({rate:.0f} rows/s)", end='', file=sys.stderr, flush=True)
+
+    try:
+        stats = score_file(
+            args.input, args.output, args.text_column, args.input_format, args.output_format,
+            args.chunk_size, args.workers, args.artifact, args.artifact_dir, progress
+        )
+    except Exception as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(file=sys.stderr)
+    print(f"Scored {stats['rows']} rows in {stats['elapsed']:.1f}s ({stats['rows_per_second']:.0f} rows/s) "
+          f"with model {stats['model_version']} on {stats['workers']} workers; peak RSS "
+          f"{stats['main_peak_rss_bytes'] / 1024 / 1024:.0f} MB main, "
+          f"{stats['worker_peak_rss_bytes'] / 1024 / 1024:.0f} MB largest worker", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
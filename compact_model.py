@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Compact Scoring Engine
+AI-Powered Fake News Detection System
+
+Exports a fitted TF-IDF + logistic regression pipeline to a flat linear
+scorer. The vocabulary is stored as one newline-joined UTF-8 blob and
+looked up through a sorted 64-bit hash table built at load time. IDF
+weights and coefficients are contiguous float32 arrays that are
+memory-mapped from the artifact, so workers on a host share them. Scoring
+is tokenize, hash, one searchsorted, a sparse dot product and a sigmoid,
+with none of sklearn's per-call validation or Python dict vocabulary.
+
+Usage:
+    python compact_model.py export [ARTIFACT]
+    python compact_model.py verify [CORPUS ...] [--artifact ARTIFACT] [--tolerance 1e-4]
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+import argparse
+
+import joblib
+import numpy as np
+from scipy import sparse
+
+from model_store import load_artifact, latest_artifact_path, compact_artifact_path, COMPACT_SUFFIX, DEFAULT_ARTIFACT_DIR
+
+logger = logging.getLogger(__name__)
+
+COMPACT_FORMAT_VERSION = 1
+DEFAULT_TOLERANCE = 1e-4
+TERM_SEPARATOR = '\n'
+
+class CompactModel:
+    """
+    Drop-in scorer for FakeNewsDetector: transform() reproduces
+    TfidfVectorizer.transform and predict_proba() the binary
+    LogisticRegression on its output.
+    """
+
+    def __init__(self, terms, idf, coef, intercept, classes, token_pattern, lowercase, stop_words,
+                 ngram_range, binary, sublinear_tf, use_idf, norm):
+        self.terms = terms
+        self.idf = idf
+        self.coef = coef
+        self.intercept = float(intercept)
+        self.classes_ = classes
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.stop_words = stop_words
+        self.ngram_range = ngram_range
+        self.binary = binary
+        self.sublinear_tf = sublinear_tf
+        self.use_idf = use_idf
+        self.norm = norm
+        self._build_index()
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        """Export a fitted tfidf + classifier pipeline, or raise ValueError if it cannot be represented"""
+        vectorizer = pipeline.named_steps.get('tfidf')
+        classifier = pipeline.named_steps.get('classifier')
+        if vectorizer is None or not hasattr(vectorizer, 'vocabulary_') or (vectorizer.use_idf and not hasattr(vectorizer, 'idf_')):
+            raise ValueError("Pipeline has no fitted TfidfVectorizer step")
+        if classifier is None or getattr(classifier, 'coef_', np.empty((0, 0))).shape[0] != 1:
+            raise ValueError("Pipeline has no fitted binary linear classifier step")
+        if (vectorizer.analyzer != 'word' or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None
+                or vectorizer.strip_accents is not None or vectorizer.input != 'content'):
+            raise ValueError("Only the default word analyzer can be exported")
+        if vectorizer.norm not in ('l1', 'l2', None):
+            raise ValueError(f"Unsupported norm: {vectorizer.norm}")
+
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, index in vectorizer.vocabulary_.items():
+            terms[index] = term
+        blob = TERM_SEPARATOR.join(terms)
+        if blob.count(TERM_SEPARATOR) != len(terms) - 1:
+            raise ValueError("Vocabulary terms may not contain newlines")
+
+        stop_words = vectorizer.get_stop_words()
+        return cls(
+            terms=np.frombuffer(blob.encode('utf-8'), dtype=np.uint8).copy(),
+            idf=np.ascontiguousarray(vectorizer.idf_ if vectorizer.use_idf else np.ones(len(terms)), dtype=np.float32),
+            coef=np.ascontiguousarray(classifier.coef_[0], dtype=np.float32),
+            intercept=classifier.intercept_[0],
+            classes=np.asarray(classifier.classes_),
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            stop_words=tuple(sorted(stop_words)) if stop_words else None,
+            ngram_range=tuple(vectorizer.ngram_range),
+            binary=vectorizer.binary,
+            sublinear_tf=vectorizer.sublinear_tf,
+            use_idf=vectorizer.use_idf,
+            norm=vectorizer.norm
+        )
+
+    def _decode_terms(self):
+        text = self.terms.tobytes().decode('utf-8')
+        return text.split(TERM_SEPARATOR) if len(self.idf) else []
+
+    def _build_index(self):
+        # Python's str hash is salted per interpreter, so the table is
+        # rebuilt on load instead of being stored in the artifact
+        terms = self._decode_terms()
+        hashes = np.fromiter(map(hash, terms), dtype=np.int64, count=len(terms))
+        order = np.argsort(hashes, kind='stable')
+        self._hashes = hashes[order]
+        self._positions = order.astype(np.int32)
+        if len(hashes) and np.any(self._hashes[1:] == self._hashes[:-1]):
+            raise ValueError("Hash collision in vocabulary; reload to re-salt")
+
+        self._token_re = re.compile(self.token_pattern)
+        self._stop_words = frozenset(self.stop_words) if self.stop_words else None
+        self._feature_names = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ('_hashes', '_positions', '_token_re', '_stop_words', '_feature_names'):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_index()
+
+    @property
+    def coef_(self):
+        return self.coef[np.newaxis, :]
+
+    @property
+    def n_features(self):
+        return len(self.idf)
+
+    def get_feature_names_out(self):
+        if self._feature_names is None:
+            self._feature_names = np.array(self._decode_terms(), dtype=object)
+        return self._feature_names
+
+    def analyze(self, text):
+        """Tokens and word n-grams exactly as TfidfVectorizer's word analyzer builds them"""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        if self._stop_words is not None:
+            tokens = [token for token in tokens if token not in self._stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        original_tokens = tokens
+        if min_n == 1:
+            tokens = list(original_tokens)
+            min_n += 1
+        else:
+            tokens = []
+        for n in range(min_n, min(max_n + 1, len(original_tokens) + 1)):
+            for i in range(len(original_tokens) - n + 1):
+                tokens.append(' '.join(original_tokens[i:i + n]))
+        return tokens
+
+    def _row(self, text):
+        grams = self.analyze(text)
+        if not grams or not len(self._hashes):
+            return None, None
+
+        gram_hashes = np.fromiter(map(hash, grams), dtype=np.int64, count=len(grams))
+        slots = np.searchsorted(self._hashes, gram_hashes)
+        slots[slots == len(self._hashes)] = 0
+        found = self._hashes[slots] == gram_hashes
+        if not found.any():
+            return None, None
+
+        features, counts = np.unique(self._positions[slots[found]], return_counts=True)
+        values = np.ones(len(features)) if self.binary else counts.astype(np.float64)
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        if self.use_idf:
+            values *= self.idf[features]
+        if self.norm == 'l2':
+            values /= np.sqrt(np.dot(values, values)) or 1.0
+        elif self.norm == 'l1':
+            values /= np.abs(values).sum() or 1.0
+        return features, values
+
+    def transform(self, texts):
+        """Sparse TF-IDF matrix with the exported pipeline's feature indices"""
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            features, values = self._row(text)
+            if features is not None:
+                indices.append(features)
+                data.append(values)
+                indptr.append(indptr[-1] + len(features))
+            else:
+                indptr.append(indptr[-1])
+
+        return sparse.csr_matrix(
+            (np.concatenate(data) if data else np.empty(0), np.concatenate(indices) if indices else np.empty(0, np.int32), indptr),
+            shape=(len(texts), self.n_features)
+        )
+
+    def decision_function(self, features):
+        return features @ self.coef + self.intercept
+
+    def predict_proba(self, features):
+        probability = 1.0 / (1.0 + np.exp(-self.decision_function(features)))
+        return np.column_stack([1.0 - probability, probability])
+
+    def memory_bytes(self):
+        """Resident size of the arrays, including the per-process hash table"""
+        return sum(array.nbytes for array in (self.terms, self.idf, self.coef, self._hashes, self._positions))
+
+def export_compact(pipeline, info, artifact_path):
+    """Write the compact engine next to a saved artifact and return its path"""
+    model = CompactModel.from_pipeline(pipeline)
+    path = compact_artifact_path(artifact_path)
+    payload = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'engine': model,
+        'model_info': dict(info)
+    }
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    joblib.dump(payload, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+def load_compact(path=None, artifact_dir=None, mmap_mode='r'):
+    """
+    Load the compact engine exported for an artifact (default: LATEST).
+    Arrays are memory-mapped read-only so workers share one copy.
+    """
+    path = path or latest_artifact_path(artifact_dir)
+    if path and not path.endswith(COMPACT_SUFFIX):
+        path = compact_artifact_path(path)
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"No compact engine found in {artifact_dir or DEFAULT_ARTIFACT_DIR}")
+
+    payload = joblib.load(path, mmap_mode=mmap_mode)
+    if payload.get('format_version') != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact engine format: {payload.get('format_version')}")
+
+    return {
+        'engine': payload['engine'],
+        'model_info': payload['model_info'],
+        'path': path
+    }
+
+def load_corpus(paths, text_column):
+    """Texts from CSV / JSON Lines / Parquet files, or the built-in sample set"""
+    if not paths:
+        from fake_news_detector import FakeNewsDetector
+        texts, _ = FakeNewsDetector().create_training_data()
+        return texts
+
+    from bulk_score import read_chunks, detect_format
+    texts = []
+    for path in paths:
+        for frame in read_chunks(path, detect_format(path), 10000):
+            texts.extend(text for text in frame[text_column].tolist() if isinstance(text, str))
+    return texts
+
+def _median_latency(score, texts):
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        score(text)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) if timings else 0.0
+
+def export_command(args):
+    artifact = load_artifact(args.artifact, args.artifact_dir)
+    path = export_compact(artifact['pipeline'], artifact['model_info'], artifact['path'])
+    print(f"Exported compact engine for {artifact['model_info']['version']} -> {path} ({os.path.getsize(path)} bytes)")
+
+def verify_command(args):
+    """Compare the compact engine with the sklearn pipeline on a regression corpus"""
+    from fake_news_detector import FakeNewsDetector
+    from model_search import model_footprint
+
+    artifact = load_artifact(args.artifact, args.artifact_dir)
+    pipeline = artifact['pipeline']
+    engine = load_compact(artifact['path'])['engine']
+
+    processed_texts = FakeNewsDetector().preprocessor.preprocess_many(load_corpus(args.corpus, args.text_column))
+    expected = pipeline.predict_proba(processed_texts)
+    actual = engine.predict_proba(engine.transform(processed_texts))
+
+    max_difference = float(np.abs(expected - actual).max()) if len(processed_texts) else 0.0
+    agreement = float(np.mean(expected.argmax(axis=1) == actual.argmax(axis=1))) if len(processed_texts) else 1.0
+
+    sample = processed_texts[:args.latency_sample]
+    pipeline_latency = _median_latency(lambda text: pipeline.predict_proba([text]), sample)
+    engine_latency = _median_latency(lambda text: engine.predict_proba(engine.transform([text])), sample)
+
+    print(f"{len(processed_texts)} documents: max probability difference {max_difference:.2e}, "
+          f"label agreement {agreement:.2%}")
+    print(f"latency per document: pipeline {pipeline_latency * 1e6:.0f}us, compact {engine_latency * 1e6:.0f}us "
+          f"({pipeline_latency / max(engine_latency, 1e-12):.1f}x)")
+    print(f"model memory: pipeline {model_footprint(pipeline) / 1024:.0f}KB, "
+          f"compact {engine.memory_bytes() / 1024:.0f}KB")
+
+    if max_difference > args.tolerance or agreement < 1.0:
+        print(f"Error: compact engine differs from the pipeline beyond {args.tolerance}", file=sys.stderr)
+        sys.exit(1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Export and verify the compact scoring engine')
+    parser.add_argument('--artifact-dir', default=os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR),
+                        help='Directory holding model artifacts')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Export the compact engine for an artifact')
+    export_parser.add_argument('artifact', nargs='?', help='Artifact to export (default: LATEST)')
+    export_parser.set_defaults(func=export_command)
+
+    verify_parser = subparsers.add_parser('verify', help='Check the compact engine against the pipeline')
+    verify_parser.add_argument('corpus', nargs='*', help='CSV / JSON Lines / Parquet files (default: sample set)')
+    verify_parser.add_argument('--artifact', help='Artifact to verify (default: LATEST)')
+    verify_parser.add_argument('--text-column', default='news', help='Column holding the article text')
+    verify_parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                               help='Largest allowed probability difference')
+    verify_parser.add_argument('--latency-sample', type=int, default=500, help='Documents timed one at a time')
+    verify_parser.set_defaults(func=verify_command)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Fake News Detector Model
+AI-Powered Fake News Detection System
+"""
+
+import logging
+from datetime import datetime
+import numpy as np
+
+from text_preprocessing import TextPreprocessor, english_stop_words
+
+# sklearn is only imported to build and train a pipeline; serving a compact
+# engine never needs it. NLTK data comes from `python bootstrap.py init`.
+
+logger = logging.getLogger(__name__)
+
+model_info = {
+    'name': 'Fake News Detector',
+    'version': '1.0.0',
+    'accuracy': 0.0,
+    'trained_at': None,
+    'features_count': 0
+}
+
+# TF-IDF and classifier settings used by train_model; model_search.py tunes these
+DEFAULT_PARAMS = {
+    'max_features': 5000,
+    'ngram_range': (1, 3),
+    'min_df': 2,
+    'max_df': 0.8,
+    'sublinear_tf': False,
+    'C': 1.0
+}
+CLASSIFIER_PARAMS = ('C',)
+
+def build_pipeline(params=None):
+    """TF-IDF + logistic regression pipeline for a set of hyperparameters"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    
+    params = dict(DEFAULT_PARAMS, **(params or {}))
+    vectorizer_params = {key: value for key, value in params.items() if key not in CLASSIFIER_PARAMS}
+    
+    return Pipeline([
+        ('tfidf', TfidfVectorizer(stop_words='english', **vectorizer_params)),
+        ('classifier', LogisticRegression(random_state=42, max_iter=1000, C=params['C']))
+    ])
+
+class FakeNewsDetector:
+    def __init__(self):
+        self.model = None
+        self.feature_names = None
+        self.stop_words = set(english_stop_words())
+        self.preprocessor = TextPreprocessor(self.stop_words)
+        
+    def preprocess_text(self, text):
+        """Clean and preprocess text for analysis"""
+        return self.preprocessor(text)
+    
+    def create_training_data(self):
+        """Create synthetic training data for fake news detection"""
+        
+        # Real news patterns - factual, structured, citing sources
+        real_news_samples = [
+            "The Federal Reserve announced today that interest rates will remain unchanged following their two-day policy meeting. The decision was made unanimously by the Federal Open Market Committee after careful consideration of current economic indicators.",
+            "Scientists at Stanford University published a new study in the journal Nature showing promising results in cancer treatment research. The peer-reviewed study involved 500 patients over a period of two years.",
+            "The Department of Labor reported that unemployment rates decreased by 0.2% last month, reaching the lowest level since 2019. The report cited increased hiring in the technology and healthcare sectors.",
+            "Local authorities confirmed that the new infrastructure project will be completed ahead of schedule. The $50 million investment will improve transportation access for over 100,000 residents in the metropolitan area.",
+            "According to data released by the World Health Organization, vaccination rates in developing countries have increased by 15% compared to last year. The organization credits improved distribution networks and international cooperation.",
+            "The Environmental Protection Agency issued new guidelines for air quality standards based on recent scientific research. The updated regulations will take effect next year and are expected to reduce emissions by 20%.",
+            "University researchers collaborated with industry partners to develop new renewable energy technology. The innovation was presented at the International Conference on Sustainable Energy and has received peer review.",
+            "The Supreme Court heard arguments today in a case involving digital privacy rights. Legal experts from both sides presented evidence and constitutional interpretations to the nine justices.",
+            "Government officials announced the successful completion of infrastructure repairs following last month's natural disaster. The $25 million project restored power and water services to affected communities.",
+            "Medical professionals at Johns Hopkins Hospital reported successful treatment outcomes using a new surgical technique. The minimally invasive procedure was developed over three years of clinical trials.",
+            "The National Weather Service issued seasonal forecasts based on atmospheric data and climate models. Meteorologists predict normal precipitation levels for the upcoming season across most regions.",
+            "Economic analysts reported steady growth in the manufacturing sector according to the latest quarterly data. Production indices show a 3% increase compared to the same period last year.",
+            "Transportation officials completed safety inspections of public transit systems meeting federal requirements. The comprehensive review ensures compliance with updated safety standards and protocols.",
+            "Academic institutions received federal funding to continue climate change research initiatives. The multi-year grants will support graduate students and advanced scientific equipment purchases.",
+            "Healthcare organizations published clinical guidelines based on evidence from randomized controlled trials. The recommendations were developed by panels of medical experts and underwent rigorous peer review.",
+            "Financial institutions reported quarterly earnings that aligned with analyst predictions for the banking sector. The results reflect steady performance in lending and investment services during challenging market conditions.",
+            "Technology companies announced software updates that address security vulnerabilities identified by independent researchers. The patches will be automatically distributed to users over the next two weeks.",
+            "Education officials released standardized test results showing improvements in mathematics and reading scores. The data represents responses from over 2 million students across public school districts.",
+            "Public health departments issued evidence-based recommendations for seasonal health preparations. The guidelines are based on surveillance data and consultation with infectious disease specialists.",
+            "Research institutions published findings from longitudinal studies tracking environmental changes over the past decade. The peer-reviewed analysis provides insights into ecosystem adaptation and conservation strategies."
+        ]
+        
+        # Fake news patterns - sensational, unverified, conspiracy theories
+        fake_news_samples = [
+            "BREAKING: Secret government documents leaked revealing shocking conspiracy that mainstream media refuses to report! Anonymous whistleblower exposes terrifying truth about mind control experiments conducted on unsuspecting citizens.",
+            "MIRACLE CURE DISCOVERED! Doctors hate this one weird trick that big pharmaceutical companies have been hiding for decades. Natural remedy completely eliminates all diseases without any side effects or expensive treatments.",
+            "EXPOSED: Celebrities secretly meeting in underground bunkers to control world government through illuminati connections. Hidden camera footage reveals disturbing plans for population control and manipulation of global events.",
+            "SHOCKING REVELATION: Scientists discover ancient alien technology buried beneath famous landmarks. Government covers up evidence of extraterrestrial visitation and advanced civilizations that ruled Earth thousands of years ago.",
+            "URGENT WARNING: Dangerous chemicals in everyday products causing mass health crisis that authorities desperately want to keep secret. Millions of people at risk from toxic substances deliberately added to food and water supplies.",
+            "INCREDIBLE DISCOVERY: Time traveler from 2050 reveals devastating future events that will change everything. Prophetic warnings about upcoming disasters and political upheavals that world leaders are trying to prevent public from knowing.",
+            "BOMBSHELL INVESTIGATION: Banking elite planning complete economic collapse to establish new world order. Secret meetings recorded showing billionaires discussing plans to control global financial systems and eliminate personal freedoms.",
+            "AMAZING BREAKTHROUGH: Revolutionary technology suppressed by powerful corporations because it threatens their profits. Free energy device invented decades ago could solve climate crisis but oil companies refuse to allow its release.",
+            "DISTURBING EVIDENCE: Weather modification programs creating artificial natural disasters to justify emergency government powers. Classified documents reveal systematic manipulation of climate patterns for political control and social engineering.",
+            "EXCLUSIVE REPORT: Underground tunnels connecting major cities used for trafficking operations by global criminal network. Law enforcement agencies compromised and unable to investigate due to high-level corruption and blackmail schemes.",
+            "UNBELIEVABLE TRUTH: Vaccines contain microchips designed for mass surveillance and behavior modification. Secret technology allows government tracking and mind control of entire populations through wireless transmission signals.",
+            "HIDDEN AGENDA: Educational institutions indoctrinating children with propaganda to create compliant future citizens. Teachers following scripted curriculum designed to eliminate critical thinking and independent thought processes.",
+            "LEAKED FOOTAGE: Military testing advanced weapons on civilian populations without consent or knowledge. Classified experiments using directed energy weapons and biological agents conducted in major metropolitan areas.",
+            "EMERGENCY ALERT: Food supply deliberately contaminated with substances that cause dependency and reduce intelligence. Agricultural corporations working with government agencies to control population through nutritional manipulation and chemical additives.",
+            "SECRET PLAN REVEALED: Technology giants collecting personal data to create detailed psychological profiles for behavioral manipulation. Social media platforms designed as psychological warfare tools to influence elections and public opinion.",
+            "TERRIFYING DISCOVERY: Ancient prophecies accurately predicting current world events prove existence of supernatural forces controlling human destiny. Religious texts contain coded messages about upcoming apocalyptic events and spiritual transformation.",
+            "COVER-UP EXPOSED: Space agencies hiding evidence of massive planet approaching Earth that will cause global catastrophe. Astronomical data suppressed to prevent mass panic while elite prepare underground survival bunkers.",
+            "INSIDER INFORMATION: Pharmaceutical companies deliberately creating diseases to sell expensive treatments and maintain profits. Medical establishment suppressing natural cures to keep people sick and dependent on costly medications.",
+            "FORBIDDEN KNOWLEDGE: Historical events completely fabricated by ruling elite to maintain control over educational narratives. Actual human history hidden from public because truth would revolutionize understanding of civilization and consciousness.",
+            "SHOCKING CONFESSION: Former government agent reveals existence of parallel dimension where reptilian beings control human affairs through shape-shifting technology. Interdimensional warfare affecting global politics and economic systems."
+        ]
+        
+        # Combine data with labels
+        data = []
+        labels = []
+        
+        for text in real_news_samples:
+            data.append(text)
+            labels.append(0)  # 0 = Real
+        
+        for text in fake_news_samples:
+            data.append(text)
+            labels.append(1)  # 1 = Fake
+        
+        return data, labels
+    
+    def train_model(self):
+        """Train the fake news detection model"""
+        from sklearn.model_selection import train_test_split
+        
+        logger.info("Starting model training...")
+        
+        # Create training data
+        texts, labels = self.create_training_data()
+        
+        # Preprocess texts
+        processed_texts = self.preprocessor.preprocess_many(texts)
+        
+        # Split data
+        X_train, X_test, y_train, y_test = train_test_split(
+            processed_texts, labels, test_size=0.2, random_state=42, stratify=labels
+        )
+        
+        # Create pipeline
+        self.model = build_pipeline(DEFAULT_PARAMS)
+        
+        # Train model
+        self.model.fit(X_train, y_train)
+        self.feature_names = None
+        
+        # Calculate accuracy
+        accuracy = self.model.score(X_test, y_test)
+        
+        # Update model info
+        global model_info
+        model_info['accuracy'] = round(accuracy * 100, 2)
+        model_info['trained_at'] = datetime.now().isoformat()
+        model_info['features_count'] = self.model.named_steps['tfidf'].get_feature_names_out().shape[0]
+        
+        logger.info(f"Model trained successfully with {accuracy:.2%} accuracy")
+        return self.model
+    
+    def load_model(self, pipeline, info, update_model_info=True):
+        """
+        Use a previously trained pipeline (or compact engine) instead of
+        training. Candidates loaded for a hot reload or shadow scoring leave
+        the global model_info alone until they are swapped in.
+        """
+        self.model = pipeline
+        self.feature_names = None
+        if update_model_info:
+            model_info.update(info)
+        
+        logger.info(f"Loaded model {info['version']} ({info['accuracy']}% accuracy)")
+        return self.model
+    
+    def steps(self):
+        """(vectorizer, classifier) of the loaded model"""
+        if hasattr(self.model, 'named_steps'):
+            return self.model[:-1], self.model[-1]
+        # A CompactModel (compact_model.py) is both
+        return self.model, self.model
+    
+    def score(self, processed_texts):
+        """
+        Vectorize preprocessed texts once and classify the resulting matrix.
+        Returns the sparse feature matrix and the class probabilities.
+        """
+        vectorizer, classifier = self.steps()
+        features = vectorizer.transform(processed_texts)
+        probabilities = classifier.predict_proba(features)
+        return features, probabilities
+    
+    def label_prediction(self, label, probabilities):
+        """Map a class label and its probability row to (result, confidence)"""
+        result = "FAKE" if label == 1 else "REAL"
+        confidence = probabilities[list(self.model.classes_).index(label)]
+        return result, confidence
+    
+    def predict_with_features(self, text):
+        """Predict text and also return its sparse feature vector (None when uncertain)"""
+        if not self.model:
+            raise ValueError("Model not trained yet")
+        
+        # Preprocess text
+        processed_text = self.preprocess_text(text)
+        
+        if not processed_text or len(processed_text.split()) < 3:
+            return "UNCERTAIN", 0.5, None
+        
+        try:
+            # Single transform and single classifier call; the label is the argmax
+            features, probabilities = self.score([processed_text])
+            label = self.model.classes_[probabilities[0].argmax()]
+            
+            result, confidence = self.label_prediction(label, probabilities[0])
+            return result, confidence, features
+            
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            return "UNCERTAIN", 0.5, None
+    
+    def predict(self, text):
+        """Predict if text is fake or real news"""
+        result, confidence, _ = self.predict_with_features(text)
+        return result, confidence
+    
+    def top_features(self, features, limit=10):
+        """Features of a single-row vector that contributed most to the prediction"""
+        # Hashed features (see training.py) cannot be mapped back to terms
+        vectorizer, classifier = self.steps()
+        vectorizer = vectorizer[0] if hasattr(vectorizer, 'named_steps') else vectorizer
+        if self.feature_names is None and hasattr(vectorizer, 'get_feature_names_out'):
+            self.feature_names = vectorizer.get_feature_names_out()
+        
+        coefficients = classifier.coef_[0]
+        row = features.tocsr()[0]
+        
+        # Only non-zero features can contribute, so score the sparse entries directly
+        feature_scores = row.data * coefficients[row.indices]
+        top_indices = np.argsort(np.abs(feature_scores))[-limit:]
+        
+        top_features = []
+        for idx in reversed(top_indices):
+            if feature_scores[idx] != 0:
+                top_features.append({
+                    'feature': (self.feature_names[row.indices[idx]] if self.feature_names is not None
+                                else f"hash:{row.indices[idx]}"),
+                    'score': round(float(feature_scores[idx]), 4)
+                })
+        
+        return top_features
+    
+    def predict_batch(self, texts):
+        """Predict many texts with one vectorized predict_proba call"""
+        if not self.model:
+            raise ValueError("Model not trained yet")
+        
+        results = [("UNCERTAIN", 0.5)] * len(texts)
+        
+        # Preprocess the whole batch, skipping texts too short to classify
+        processed_texts = self.preprocessor.preprocess_many(texts)
+        scorable = [i for i, processed in enumerate(processed_texts)
+                    if processed and len(processed.split()) >= 3]
+        
+        if not scorable:
+            return results
+        
+        try:
+            # One sparse matrix and one classifier call for the whole batch
+            _, probabilities = self.score([processed_texts[i] for i in scorable])
+            labels = self.model.classes_[probabilities.argmax(axis=1)]
+            
+            for i, label, row in zip(scorable, labels, probabilities):
+                results[i] = self.label_prediction(label, row)
+            
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+        
+        return results
@@ -0,0 +1,37 @@
+"""
+Gunicorn Configuration
+AI-Powered Fake News Detection System
+
+Preload-and-fork deployment: the master imports the app and loads the
+model once, then forks workers that share it copy-on-write. Each worker
+opens its own database connections and starts its own background threads
+after the fork. Set GUNICORN_PRELOAD=false to have every worker load the
+model itself.
+
+Every worker runs its own OCR process pool, so unless OCR_WORKERS is set
+each pool gets max(1, cpu_count // workers) processes: the workers share
+the cores between them instead of each starting one OCR process per core.
+
+Usage:
+    gunicorn -c gunicorn.conf.py
+    python memory_report.py --pidfile gunicorn.pid
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2 * (os.cpu_count() or 1)))
+# Per-worker OCR pool size; read by app.py, which is imported after this file
+os.environ.setdefault('OCR_WORKERS', str(max(1, (os.cpu_count() or 1) // workers)))
+# More than one thread per worker lets MICRO_BATCH_MAX_LATENCY_MS batch concurrent requests
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+pidfile = os.environ.get('GUNICORN_PIDFILE', 'gunicorn.pid')
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+wsgi_app = 'app:create_app(preload=True)' if preload_app else 'main:app'
+
+def post_fork(server, worker):
+    if preload_app:
+        from app import after_fork
+        after_fork()
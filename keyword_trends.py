@@ -0,0 +1,216 @@
+"""
+Keyword Trend Aggregation
+AI-Powered Fake News Detection System
+
+Accumulates keyword counts in memory across requests and periodically
+flushes them with one bulk upsert instead of a SELECT and UPDATE per
+keyword per article.
+"""
+
+import os
+import re
+import time
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import func, inspect
+
+from models import db, dialect_insert, KeywordTrend
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_RE = re.compile(r'\b\w{4,}\b')
+KEYWORD_STOP_WORDS = frozenset(['this', 'that', 'with', 'have', 'will', 'been', 'said', 'from', 'they'])
+UPSERT_CHUNK_SIZE = 1000
+# Distinct (keyword, category) pairs held while the database is failing
+MAX_PENDING_KEYWORDS = 100000
+
+def extract_keywords(text):
+    """Simple keyword extraction (in production, use more sophisticated NLP)"""
+    words = KEYWORD_RE.findall(text.lower())
+    return [word for word in words if word not in KEYWORD_STOP_WORDS][:10]  # Top 10
+
+def upsert_keyword_counts(counts, now=None):
+    """
+    Add counts to keyword_trends in bulk:
+    INSERT ... ON CONFLICT (keyword, category) DO UPDATE
+    SET frequency = frequency + excluded.frequency
+    """
+    now = now or datetime.utcnow()
+    # Sorted keys make concurrent workers lock rows in the same order
+    rows = [
+        {'keyword': keyword, 'category': category, 'frequency': count, 'first_seen': now, 'last_seen': now}
+        for (keyword, category), count in sorted(counts.items())
+    ]
+
+    insert = dialect_insert(db.session.get_bind().dialect.name)
+    if insert is None:
+        _update_keyword_counts(counts, now)
+        return
+
+    table = KeywordTrend.__table__
+    for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(table).values(rows[offset:offset + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.keyword, table.c.category],
+            set_={
+                'frequency': table.c.frequency + stmt.excluded.frequency,
+                'last_seen': stmt.excluded.last_seen
+            }
+        )
+        db.session.execute(stmt)
+
+def _update_keyword_counts(counts, now):
+    """Read-modify-write fallback for dialects without ON CONFLICT"""
+    for (keyword, category), count in counts.items():
+        trend = KeywordTrend.query.filter_by(keyword=keyword, category=category).first()
+        if trend:
+            trend.frequency += count
+            trend.last_seen = now
+        else:
+            db.session.add(KeywordTrend(keyword=keyword, category=category, frequency=count))
+
+def _has_keyword_category_key(engine):
+    inspector = inspect(engine)
+    wanted = sorted(['keyword', 'category'])
+    if any(sorted(constraint['column_names']) == wanted
+           for constraint in inspector.get_unique_constraints(KeywordTrend.__tablename__)):
+        return True
+    return any(index.get('unique') and sorted(index['column_names']) == wanted
+               for index in inspector.get_indexes(KeywordTrend.__tablename__))
+
+def migrate_keyword_trends():
+    """
+    Give a keyword_trends table created before the bulk upsert its unique
+    (keyword, category) key: duplicate rows are merged into the oldest one,
+    summing frequency, then uq_keyword_category is created. create_all()
+    does not alter existing tables. Returns the number of rows merged away,
+    or None when the key already exists. Commits.
+    """
+    if _has_keyword_category_key(db.engine):
+        return None
+
+    table = KeywordTrend.__table__
+    duplicates = db.session.execute(
+        db.select(
+            table.c.keyword, table.c.category, func.min(table.c.id), func.sum(table.c.frequency),
+            func.min(table.c.first_seen), func.max(table.c.last_seen)
+        ).group_by(table.c.keyword, table.c.category).having(func.count() > 1)
+    ).all()
+
+    merged = 0
+    for keyword, category, keep_id, frequency, first_seen, last_seen in duplicates:
+        db.session.execute(
+            table.update().where(table.c.id == keep_id)
+            .values(frequency=frequency, first_seen=first_seen, last_seen=last_seen)
+        )
+        merged += db.session.execute(
+            table.delete().where(table.c.keyword == keyword, table.c.category == category, table.c.id != keep_id)
+        ).rowcount
+
+    db.session.execute(db.text('CREATE UNIQUE INDEX uq_keyword_category ON keyword_trends (keyword, category)'))
+    db.session.commit()
+    logger.info(f"Added uq_keyword_category to keyword_trends; merged {merged} duplicate rows")
+    return merged
+
+class KeywordTrendAggregator:
+    """In-memory keyword counter flushed to the database on an interval"""
+
+    def __init__(self, app, flush_interval=5.0, max_pending=MAX_PENDING_KEYWORDS):
+        self.app = app
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._metrics = {
+            'articles': 0,
+            'flushes': 0,
+            'rows_upserted': 0,
+            'flush_errors': 0,
+            'dropped_keywords': 0,
+            'last_flush_latency': 0.0
+        }
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so every worker process starts its own flusher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                self._counts = Counter()
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='keyword-trends', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def add(self, text, category):
+        """Count the keywords of an analyzed article"""
+        keywords = extract_keywords(text)
+        self._ensure_started()
+
+        with self._lock:
+            for keyword in keywords:
+                self._counts[(keyword, category)] += 1
+            self._metrics['articles'] += 1
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Upsert everything counted since the last flush"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+
+        if not counts:
+            return
+
+        start_time = time.time()
+        with self.app.app_context():
+            try:
+                upsert_keyword_counts(counts)
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Failed to update keyword trends: {e}")
+                db.session.rollback()
+
+                # Put the counts back so they are retried on the next flush,
+                # unless the database has been failing long enough to fill the backlog
+                with self._lock:
+                    self._metrics['flush_errors'] += 1
+                    dropped = len(self._counts) + len(counts) > self.max_pending
+                    if dropped:
+                        self._metrics['dropped_keywords'] += len(counts)
+                    else:
+                        self._counts.update(counts)
+                if dropped:
+                    logger.warning(f"Dropped {len(counts)} keyword trend counts; more than "
+                                   f"{self.max_pending} keywords are waiting to be flushed")
+                return
+
+        with self._lock:
+            self._metrics['flushes'] += 1
+            self._metrics['rows_upserted'] += len(counts)
+            self._metrics['last_flush_latency'] = round(time.time() - start_time, 4)
+
+    def metrics(self):
+        """Pending keywords and flush counters"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['pending_keywords'] = len(self._counts)
+        metrics['flush_interval'] = self.flush_interval
+        return metrics
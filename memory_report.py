@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Report
+AI-Powered Fake News Detection System
+
+Reads /proc/<pid>/smaps_rollup for the API master and its workers. With
+preloading, workers share the model and interpreter pages with the master
+copy-on-write, so RSS overstates their cost: the unique set size (USS,
+private pages) is what each additional worker actually adds.
+
+Usage:
+    python memory_report.py [--pid MASTER_PID | --pidfile FILE] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# smaps_rollup fields reported, in kB in the file
+SMAPS_FIELDS = ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty', 'Swap')
+
+def read_smaps(pid='self'):
+    """
+    RSS, PSS, USS and shared bytes of a process from smaps_rollup, or None
+    where it is not available (non-Linux, or kernels before 4.14).
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    values = {}
+    for line in lines:
+        name, _, rest = line.partition(':')
+        if name in SMAPS_FIELDS:
+            values[name] = int(rest.split()[0]) * 1024
+
+    return {
+        'rss_bytes': values.get('Rss', 0),
+        'pss_bytes': values.get('Pss', 0),
+        'uss_bytes': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+        'shared_bytes': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+        'swap_bytes': values.get('Swap', 0)
+    }
+
+def child_pids(pid):
+    """Direct children of a process"""
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+def available_memory():
+    """MemAvailable from /proc/meminfo in bytes, or None"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def report(master_pid):
+    """Memory of the master and each worker, plus how many more workers would fit"""
+    master = read_smaps(master_pid)
+    if master is None:
+        raise RuntimeError(f"Cannot read /proc/{master_pid}/smaps_rollup")
+
+    workers = []
+    for pid in child_pids(master_pid):
+        memory = read_smaps(pid)
+        if memory is not None:
+            workers.append(dict(memory, pid=pid))
+
+    mean_uss = sum(worker['uss_bytes'] for worker in workers) / len(workers) if workers else None
+    available = available_memory()
+    return {
+        'master': dict(master, pid=master_pid),
+        'workers': workers,
+        'total_pss_bytes': master['pss_bytes'] + sum(worker['pss_bytes'] for worker in workers),
+        'mean_worker_uss_bytes': round(mean_uss) if mean_uss is not None else None,
+        'available_bytes': available,
+        'additional_workers': int(available // mean_uss) if available and mean_uss else None
+    }
+
+def _mb(value):
+    return f"{value / 1024 / 1024:8.1f}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Report per-worker memory of the API server')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--pid', type=int, help='Master process id')
+    source.add_argument('--pidfile', help='File holding the master process id (gunicorn --pid)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    try:
+        if args.pidfile:
+            with open(args.pidfile) as f:
+                args.pid = int(f.read().strip())
+        result = report(args.pid)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{'process':>16} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'shared MB':>9}")
+    for name, memory in [('master', result['master'])] + [(f"worker {w['pid']}", w) for w in result['workers']]:
+        print(f"{name:>16} {_mb(memory['rss_bytes'])} {_mb(memory['pss_bytes'])} {_mb(memory['uss_bytes'])} "
+              f"{_mb(memory['shared_bytes'])}")
+    print(f"total PSS: {_mb(result['total_pss_bytes']).strip()} MB")
+    if result['additional_workers'] is not None:
+        print(f"mean worker USS {_mb(result['mean_worker_uss_bytes']).strip()} MB; "
+              f"about {result['additional_workers']} more workers fit in available memory")
+
+if __name__ == "__main__":
+    main()
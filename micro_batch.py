@@ -0,0 +1,198 @@
+"""
+Micro-Batching Inference
+AI-Powered Fake News Detection System
+
+Collects concurrent single-text predictions for up to max_latency seconds
+or max_batch items and runs them through one vectorized predict_batch
+call, then hands each request its own result. Under a threaded server a
+request trades a wait of a few milliseconds for a share of one model call
+instead of paying the per-call overhead alone.
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class _Pending:
+    """One waiting prediction"""
+
+    __slots__ = ('text', 'enqueued_at', 'done', 'result', 'error', 'model_time', 'cancelled')
+
+    def __init__(self, text):
+        self.text = text
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.model_time = None
+        self.cancelled = False
+
+class MicroBatcher:
+    """
+    Dynamic batcher in front of a predict_batch(texts) callable.
+
+    A background thread takes the first queued request, keeps collecting
+    until max_batch requests are queued or max_latency has passed since the
+    first one arrived, and scores them together. It does not wait out the
+    window once every request in flight is in the batch. Batching is off when
+    max_latency is 0 or max_batch is 1; predict() then calls the model
+    directly.
+    """
+
+    def __init__(self, predict_batch, max_batch=32, max_latency=0.002, timeout=30.0):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+        self.timeout = timeout
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._histogram = {}
+        self._stats = {
+            'batches': 0,
+            'items': 0,
+            'full_batches': 0,
+            'errors': 0,
+            'wait_total': 0.0,
+            'max_wait': 0.0,
+            'batch_time_total': 0.0
+        }
+
+    @property
+    def enabled(self):
+        return self.max_latency > 0 and self.max_batch > 1
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so every worker process starts its own batcher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+            self._thread.start()
+
+    def predict(self, text):
+        """(prediction, confidence) for one text, scored together with concurrent requests"""
+        return self.predict_timed(text)[0]
+
+    def predict_timed(self, text):
+        """
+        ((prediction, confidence), model_time) for one text. model_time is
+        the duration of the predict_batch call that scored it, without the
+        time spent waiting for the batch to fill or for the batcher thread.
+        """
+        if not self.enabled:
+            start = time.perf_counter()
+            result = self.predict_batch([text])[0]
+            return result, time.perf_counter() - start
+
+        self._ensure_started()
+        pending = _Pending(text)
+        with self._in_flight_lock:
+            self._in_flight += 1
+        try:
+            self._queue.put(pending)
+            if not pending.done.wait(self.timeout):
+                # Still queued: the batcher drops it instead of scoring it for nobody
+                pending.cancelled = True
+                raise TimeoutError(f"Prediction not scored within {self.timeout}s")
+        finally:
+            with self._in_flight_lock:
+                self._in_flight -= 1
+        if pending.error is not None:
+            raise pending.error
+        return pending.result, pending.model_time
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            deadline = first.enqueued_at + self.max_latency
+
+            while len(batch) < min(self.max_batch, self._in_flight):
+                # Requests that queued up while the last batch was scored are
+                # taken even when the first one's deadline has already passed
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._score(batch)
+
+    def _score(self, batch):
+        batch = [pending for pending in batch if not pending.cancelled]
+        if not batch:
+            return
+
+        start = time.perf_counter()
+        failed = False
+        try:
+            results = self.predict_batch([pending.text for pending in batch])
+            batch_time = time.perf_counter() - start
+            for pending, result in zip(batch, results):
+                pending.result = result
+                pending.model_time = batch_time
+        except Exception as e:
+            logger.error(f"Micro-batch prediction failed: {e}")
+            failed = True
+            batch_time = time.perf_counter() - start
+            for pending in batch:
+                pending.error = e
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+        waits = [start - pending.enqueued_at for pending in batch]
+        size = len(batch)
+        with self._stats_lock:
+            stats = self._stats
+            stats['batches'] += 1
+            stats['items'] += size
+            stats['full_batches'] += size >= self.max_batch
+            stats['errors'] += failed
+            stats['wait_total'] += sum(waits)
+            stats['max_wait'] = max(stats['max_wait'], max(waits))
+            stats['batch_time_total'] += batch_time
+            self._histogram[size] = self._histogram.get(size, 0) + 1
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+            histogram = dict(self._histogram)
+
+        batches, items = stats['batches'], stats['items']
+        return {
+            'enabled': self.enabled,
+            'max_batch': self.max_batch,
+            'max_latency_ms': round(self.max_latency * 1000, 3),
+            'batches': batches,
+            'items': items,
+            'mean_batch_size': round(items / batches, 2) if batches else None,
+            'full_batches': stats['full_batches'],
+            'mean_wait_ms': round(stats['wait_total'] / items * 1000, 3) if items else None,
+            'max_wait_ms': round(stats['max_wait'] * 1000, 3),
+            'mean_batch_time_ms': round(stats['batch_time_total'] / batches * 1000, 3) if batches else None,
+            'batch_size_histogram': {size: histogram[size] for size in sorted(histogram)},
+            'queue_depth': self._queue.qsize(),
+            'errors': stats['errors']
+        }
@@ -0,0 +1,388 @@
+"""
+Hot Model Reload
+AI-Powered Fake News Detection System
+
+Loads new model artifacts in the background and swaps them in with a
+single reference assignment, so requests already running finish on the
+model they started with and none are dropped. A watcher thread follows
+the model store's LATEST and SHADOW pointers, so a reload requested on one
+worker reaches every worker. Shadow scoring replays a sampled fraction of
+live traffic against a candidate model off the request path and records
+agreement and latency deltas per candidate version.
+"""
+
+import os
+import time
+import queue
+import random
+import logging
+import threading
+
+from model_store import latest_artifact_path, read_shadow
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class ServingModel:
+    """A loaded detector together with the artifact it came from"""
+
+    def __init__(self, detector, info, artifact, path=None, engine=None):
+        self.detector = detector
+        self.info = dict(info)
+        self.artifact = artifact
+        self.path = path or artifact
+        self.engine = engine
+        self.loaded_at = time.time()
+
+    @property
+    def version(self):
+        return self.info['version']
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'artifact': self.artifact,
+            'path': self.path,
+            'engine': self.engine,
+            'loaded_at': self.loaded_at
+        }
+
+class ShadowScorer:
+    """
+    Scores sampled requests with a candidate model on a background thread.
+    Requests only pay for a random draw and a non-blocking queue put; when
+    the queue is full the sample is dropped.
+    """
+
+    def __init__(self, candidate, sample_rate, queue_size=1000):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.queue_size = queue_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'samples': 0,
+            'agreements': 0,
+            'dropped': 0,
+            'errors': 0,
+            'timed_samples': 0,
+            'primary_latency_total': 0.0,
+            'shadow_latency_total': 0.0,
+            'confidence_delta_total': 0.0,
+            'disagreements': {}
+        }
+        self.started_at = time.time()
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so every worker process starts its own scorer
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.queue_size)
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='shadow-scorer', daemon=True)
+            self._thread.start()
+
+    def offer(self, text, prediction, confidence, latency=None):
+        """Maybe queue a primary prediction for shadow scoring; never blocks"""
+        if random.random() >= self.sample_rate:
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((text, prediction, confidence, latency))
+            return True
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['dropped'] += 1
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            text, prediction, confidence, latency = item
+            try:
+                start = time.perf_counter()
+                shadow_prediction, shadow_confidence = self.candidate.detector.predict(text)
+                shadow_latency = time.perf_counter() - start
+            except Exception as e:
+                logger.warning(f"Shadow scoring failed: {e}")
+                with self._stats_lock:
+                    self._stats['errors'] += 1
+                continue
+
+            with self._stats_lock:
+                stats = self._stats
+                stats['samples'] += 1
+                stats['confidence_delta_total'] += float(shadow_confidence) - float(confidence)
+                if shadow_prediction == prediction:
+                    stats['agreements'] += 1
+                else:
+                    change = f"{prediction}->{shadow_prediction}"
+                    stats['disagreements'][change] = stats['disagreements'].get(change, 0) + 1
+                # Cache hits have no primary latency to compare against
+                if latency is not None:
+                    stats['timed_samples'] += 1
+                    stats['primary_latency_total'] += latency
+                    stats['shadow_latency_total'] += shadow_latency
+
+    def stop(self):
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            try:
+                self._queue.put_nowait(_STOP)
+            except queue.Full:
+                pass
+
+    def stats(self, primary_version=None):
+        with self._stats_lock:
+            stats = dict(self._stats, disagreements=dict(self._stats['disagreements']))
+
+        samples, timed = stats['samples'], stats['timed_samples']
+        primary_latency = stats['primary_latency_total'] / timed if timed else None
+        shadow_latency = stats['shadow_latency_total'] / timed if timed else None
+        return {
+            'version': self.candidate.version,
+            'primary_version': primary_version,
+            'sample_rate': self.sample_rate,
+            'started_at': self.started_at,
+            'samples': samples,
+            'agreement': round(stats['agreements'] / samples, 4) if samples else None,
+            'disagreements': stats['disagreements'],
+            'mean_confidence_delta': round(stats['confidence_delta_total'] / samples, 4) if samples else None,
+            'primary_latency_ms': round(primary_latency * 1000, 3) if timed else None,
+            'shadow_latency_ms': round(shadow_latency * 1000, 3) if timed else None,
+            'latency_delta_ms': round((shadow_latency - primary_latency) * 1000, 3) if timed else None,
+            'queue_depth': self._queue.qsize(),
+            'dropped': stats['dropped'],
+            'errors': stats['errors']
+        }
+
+class ModelManager:
+    """
+    Owns the serving model and an optional shadow candidate.
+
+    loader(artifact) builds a new ServingModel for an artifact path without
+    touching the one in use; activate(serving) publishes it to the app.
+    Reloads run on a background thread, one at a time.
+    """
+
+    def __init__(self, loader, activate, artifact_dir=None, watch_interval=5.0, shadow_queue_size=1000,
+                 warmup_texts=()):
+        self.loader = loader
+        self.activate = activate
+        self.artifact_dir = artifact_dir
+        self.watch_interval = watch_interval
+        self.shadow_queue_size = shadow_queue_size
+        self.warmup_texts = list(warmup_texts)
+
+        self.current = None
+        self.shadow = None
+        self.shadow_history = {}
+        self.last_reload = None
+        self.reloads = 0
+        # Pointer targets that failed to load, skipped by the watcher until the pointer moves
+        self._failed = {'latest': None, 'shadow': None}
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self._watcher = None
+        self._watch_pid = None
+        self._watch_lock = threading.Lock()
+
+    def adopt(self, serving):
+        """Record the model loaded at startup"""
+        self.current = serving
+
+    def _load(self, artifact):
+        start = time.time()
+        serving = self.loader(artifact)
+        if self.warmup_texts:
+            # Pay first-call costs before the model sees traffic
+            serving.detector.predict_batch(self.warmup_texts)
+        return serving, time.time() - start
+
+    def reload(self, artifact=None, wait=False):
+        """
+        Load an artifact (default: LATEST) and swap it in. Returns False if
+        another reload or shadow load is already running.
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                path = artifact or latest_artifact_path(self.artifact_dir)
+                try:
+                    serving, duration = self._load(path)
+                except Exception as e:
+                    logger.error(f"Model reload from {path} failed: {e}")
+                    self.last_reload = {'status': 'failed', 'artifact': path, 'error': str(e), 'at': time.time()}
+                    self._failed['latest'] = path
+                    return
+
+                previous = self.current
+                self.current = serving
+                self.activate(serving)
+                self.reloads += 1
+                self.last_reload = {
+                    'status': 'completed',
+                    'artifact': path,
+                    'version': serving.version,
+                    'previous_version': previous.version if previous else None,
+                    'load_time': round(duration, 3),
+                    'at': time.time()
+                }
+                logger.info(f"Swapped in model {serving.version} in {duration:.3f}s")
+            finally:
+                self._reload_lock.release()
+
+        self._reload_thread = threading.Thread(target=run, name='model-reload', daemon=True)
+        self._reload_thread.start()
+        if wait:
+            self._reload_thread.join()
+        return True
+
+    @property
+    def reloading(self):
+        return self._reload_lock.locked()
+
+    def start_shadow(self, artifact, sample_rate, wait=False):
+        """Load a candidate in the background and start shadow-scoring sampled traffic with it"""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                try:
+                    candidate, _ = self._load(artifact)
+                except Exception as e:
+                    logger.error(f"Loading shadow model from {artifact} failed: {e}")
+                    self.last_reload = {'status': 'shadow_failed', 'artifact': artifact, 'error': str(e), 'at': time.time()}
+                    self._failed['shadow'] = artifact
+                    return
+                self._replace_shadow(ShadowScorer(candidate, sample_rate, self.shadow_queue_size))
+                logger.info(f"Shadow scoring {sample_rate:.0%} of traffic with model {candidate.version}")
+            finally:
+                self._reload_lock.release()
+
+        thread = threading.Thread(target=run, name='model-shadow', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def _replace_shadow(self, shadow):
+        previous = self.shadow
+        self.shadow = shadow
+        if previous is not None:
+            previous.stop()
+            self.shadow_history[previous.candidate.version] = previous.stats(self.current.version if self.current else None)
+
+    def stop_shadow(self):
+        self._replace_shadow(None)
+
+    def promote_shadow(self):
+        """Serve the shadow candidate without reloading it; returns it, or None without a shadow"""
+        shadow = self.shadow
+        if shadow is None:
+            return None
+
+        with self._reload_lock:
+            previous = self.current
+            self.stop_shadow()
+            self.current = shadow.candidate
+            self.activate(shadow.candidate)
+            self.reloads += 1
+            self.last_reload = {
+                'status': 'promoted',
+                'artifact': shadow.candidate.artifact,
+                'version': shadow.candidate.version,
+                'previous_version': previous.version if previous else None,
+                'at': time.time()
+            }
+        return shadow.candidate
+
+    def offer(self, text, prediction, confidence, latency=None):
+        """Hand a primary prediction to the shadow scorer, if one is running"""
+        shadow = self.shadow
+        if shadow is not None:
+            shadow.offer(text, prediction, confidence, latency)
+
+    def ensure_watching(self):
+        """
+        Start the pointer watcher in this process if it is not running.
+        Called from start_serving() and after_fork(), not per request.
+        """
+        if not self.watch_interval or (self._watcher is not None and self._watch_pid == os.getpid()):
+            return
+
+        with self._watch_lock:
+            if self._watcher is not None and self._watch_pid == os.getpid():
+                return
+            self._watch_pid = os.getpid()
+            self._watcher = threading.Thread(target=self._watch, name='model-watcher', daemon=True)
+            self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.watch_interval)
+            try:
+                self.check_pointers()
+            except Exception as e:
+                logger.warning(f"Model watcher error: {e}")
+
+    def _retry_allowed(self, pointer, path):
+        # A target that failed to load is retried only once the pointer has moved off it
+        if path != self._failed[pointer]:
+            self._failed[pointer] = None
+        return self._failed[pointer] is None
+
+    def check_pointers(self):
+        """
+        Follow LATEST and SHADOW in the artifact store. An artifact that
+        failed to load is not retried until its pointer changes.
+        """
+        if self.reloading:
+            return
+
+        latest = latest_artifact_path(self.artifact_dir)
+        if latest and (self.current is None or latest != self.current.artifact) \
+                and self._retry_allowed('latest', latest):
+            logger.info(f"LATEST changed to {os.path.basename(latest)}, reloading")
+            self.reload(latest)
+            return
+
+        pointer = read_shadow(self.artifact_dir)
+        shadow = self.shadow
+        if pointer is None:
+            if shadow is not None:
+                self.stop_shadow()
+        elif shadow is None or shadow.candidate.artifact != pointer['path']:
+            if self._retry_allowed('shadow', pointer['path']):
+                self.start_shadow(pointer['path'], pointer['sample_rate'])
+        elif shadow.sample_rate != pointer['sample_rate']:
+            shadow.sample_rate = pointer['sample_rate']
+
+    def status(self):
+        primary_version = self.current.version if self.current else None
+        return {
+            'current': self.current.to_dict() if self.current else None,
+            'reloading': self.reloading,
+            'reloads': self.reloads,
+            'last_reload': self.last_reload,
+            'shadow': self.shadow.stats(primary_version) if self.shadow else None,
+            'shadow_history': dict(self.shadow_history),
+            'watch_interval': self.watch_interval
+        }
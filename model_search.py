@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Search
+AI-Powered Fake News Detection System
+
+Cross-validated grid or random search over the TF-IDF + logistic regression
+pipeline, run across all cores on joblib's process (loky) backend. Each
+task fits the TF-IDF transform for one vectorizer setting and fold once and
+reuses the cached matrices for every classifier setting. Besides accuracy,
+every candidate records its serialized size, in-memory footprint, peak
+training memory and per-document inference latency, and the report marks
+the accuracy/latency Pareto front the final choice is taken from.
+
+Usage:
+    python model_search.py [DATA ...] [--search grid|random] [--param NAME=V1,V2 ...] [--save]
+
+Without DATA the built-in sample set from FakeNewsDetector is used.
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import random
+import logging
+import argparse
+import itertools
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline
+
+from model_store import save_artifact, default_version, DEFAULT_ARTIFACT_DIR
+from bulk_score import read_chunks, detect_format
+from training import parse_label
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GRID = {
+    'max_features': [5000, 20000, None],
+    'ngram_range': [(1, 1), (1, 2), (1, 3)],
+    'min_df': [1, 2],
+    'max_df': [0.8],
+    'sublinear_tf': [False, True],
+    'C': [0.5, 1.0, 4.0]
+}
+DEFAULT_FOLDS = 5
+LATENCY_SAMPLE = 200
+LATENCY_REPEATS = 3
+# Candidates on the front within this much of the best accuracy are treated as ties
+DEFAULT_TOLERANCE = 0.005
+
+def parse_value(text):
+    """Parse one --param value: none, true/false, an n-gram range like 1-3, or a number"""
+    lowered = text.strip().lower()
+    if lowered == 'none':
+        return None
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    if '-' in lowered:
+        low, high = lowered.split('-', 1)
+        return (int(low), int(high))
+    number = float(lowered)
+    return int(number) if number.is_integer() and '.' not in lowered else number
+
+def parse_grid(overrides):
+    """DEFAULT_GRID with NAME=V1,V2 overrides applied"""
+    grid = dict(DEFAULT_GRID)
+    for override in overrides or []:
+        name, _, values = override.partition('=')
+        if name not in grid:
+            raise ValueError(f"Unknown parameter '{name}' (expected one of {', '.join(grid)})")
+        grid[name] = [parse_value(value) for value in values.split(',')]
+    return grid
+
+def candidates(grid, search='grid', n_iter=20, seed=42):
+    """Parameter dicts for a full grid, or n_iter of them sampled without replacement"""
+    names = list(grid)
+    combinations = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    if search == 'random' and n_iter < len(combinations):
+        combinations = random.Random(seed).sample(combinations, n_iter)
+    return combinations
+
+def _split_params(params):
+    vectorizer_params = {key: value for key, value in params.items() if key != 'C'}
+    return vectorizer_params, {'C': params['C']}
+
+def _key(params):
+    return json.dumps(params, sort_keys=True, default=list)
+
+def model_footprint(pipeline):
+    """Approximate resident size in bytes of a fitted pipeline's vocabulary and arrays"""
+    vectorizer = pipeline.named_steps['tfidf']
+    classifier = pipeline.named_steps['classifier']
+    vocabulary = vectorizer.vocabulary_
+    size = sys.getsizeof(vocabulary) + sum(sys.getsizeof(term) + sys.getsizeof(index)
+                                           for term, index in vocabulary.items())
+    size += vectorizer.idf_.nbytes + classifier.coef_.nbytes + classifier.intercept_.nbytes
+    return size
+
+def measure_latency(pipeline, texts, repeats=LATENCY_REPEATS):
+    """Best-of-repeats median seconds to score one document, as the API does"""
+    best = None
+    for _ in range(repeats):
+        timings = []
+        for text in texts:
+            start = time.perf_counter()
+            pipeline.predict_proba([text])
+            timings.append(time.perf_counter() - start)
+        median = float(np.median(timings))
+        best = median if best is None else min(best, median)
+    return best
+
+def _evaluate_fold(texts, labels, train_index, test_index, vectorizer_params, classifier_grid, measure):
+    """
+    Fit TF-IDF once for a fold, then every classifier setting on the cached
+    matrices. The first fold also measures size, memory and latency.
+    """
+    train_texts = [texts[i] for i in train_index]
+    test_texts = [texts[i] for i in test_index]
+    y_train, y_test = labels[train_index], labels[test_index]
+
+    if measure:
+        tracemalloc.start()
+
+    vectorizer = TfidfVectorizer(stop_words='english', **vectorizer_params)
+    X_train = vectorizer.fit_transform(train_texts)
+    X_test = vectorizer.transform(test_texts)
+    # Terms dropped by min_df/max_df are only kept for introspection
+    vectorizer.stop_words_ = None
+    vectorizer_peak = tracemalloc.get_traced_memory()[1] if measure else None
+
+    fitted = []
+    for classifier_params in classifier_grid:
+        if measure:
+            tracemalloc.reset_peak()
+        classifier = LogisticRegression(random_state=42, max_iter=1000, **classifier_params)
+        classifier.fit(X_train, y_train)
+        peak = max(vectorizer_peak, tracemalloc.get_traced_memory()[1]) if measure else None
+        fitted.append((classifier_params, classifier, float(classifier.score(X_test, y_test)), peak))
+
+    if measure:
+        tracemalloc.stop()
+
+    results = []
+    for classifier_params, classifier, accuracy, peak in fitted:
+        result = {'params': dict(vectorizer_params, **classifier_params), 'accuracy': accuracy}
+        if measure:
+            pipeline = Pipeline([('tfidf', vectorizer), ('classifier', classifier)])
+            result.update({
+                'model_bytes': len(pickle.dumps(pipeline, protocol=pickle.HIGHEST_PROTOCOL)),
+                'memory_bytes': model_footprint(pipeline),
+                'fit_peak_bytes': peak,
+                'features': len(vectorizer.vocabulary_),
+                'latency_ms': measure_latency(pipeline, test_texts[:LATENCY_SAMPLE]) * 1000
+            })
+        results.append(result)
+    return results
+
+def pareto_front(results):
+    """Candidates no other candidate beats on both accuracy and latency"""
+    front = []
+    for result in results:
+        dominated = any(
+            other['accuracy'] >= result['accuracy'] and other['latency_ms'] <= result['latency_ms']
+            and (other['accuracy'] > result['accuracy'] or other['latency_ms'] < result['latency_ms'])
+            for other in results
+        )
+        if not dominated:
+            front.append(result)
+    return sorted(front, key=lambda result: result['latency_ms'])
+
+def select_candidate(front, max_latency_ms=None, tolerance=DEFAULT_TOLERANCE):
+    """
+    Pick from the Pareto front: within the latency budget, the fastest
+    candidate whose accuracy is within tolerance of the best.
+    """
+    eligible = [result for result in front if max_latency_ms is None or result['latency_ms'] <= max_latency_ms]
+    if not eligible:
+        eligible = front[:1]
+    best_accuracy = max(result['accuracy'] for result in eligible)
+    return min((result for result in eligible if result['accuracy'] >= best_accuracy - tolerance),
+               key=lambda result: result['latency_ms'])
+
+def search(texts, labels, grid, search='grid', n_iter=20, folds=DEFAULT_FOLDS, jobs=-1, seed=42):
+    """Cross-validate every candidate and return one result dict per candidate"""
+    labels = np.asarray(labels)
+    params_list = candidates(grid, search, n_iter, seed)
+
+    # Group classifier settings under their vectorizer setting so TF-IDF is fitted once per fold
+    groups = {}
+    for params in params_list:
+        vectorizer_params, classifier_params = _split_params(params)
+        groups.setdefault(_key(vectorizer_params), (vectorizer_params, []))[1].append(classifier_params)
+
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(texts, labels))
+    tasks = [
+        delayed(_evaluate_fold)(texts, labels, train_index, test_index, vectorizer_params, classifier_grid, fold == 0)
+        for vectorizer_params, classifier_grid in groups.values()
+        for fold, (train_index, test_index) in enumerate(splits)
+    ]
+    logger.info(f"Evaluating {len(params_list)} candidates x {folds} folds as {len(tasks)} tasks")
+
+    results = {}
+    for fold_results in Parallel(n_jobs=jobs, backend='loky')(tasks):
+        for fold_result in fold_results:
+            result = results.setdefault(_key(fold_result['params']), {'params': fold_result['params'], 'fold_accuracy': []})
+            result['fold_accuracy'].append(fold_result.pop('accuracy'))
+            result.update({key: value for key, value in fold_result.items() if key != 'params'})
+
+    for result in results.values():
+        result['accuracy'] = float(np.mean(result['fold_accuracy']))
+        result['accuracy_std'] = float(np.std(result['fold_accuracy']))
+    return list(results.values())
+
+def load_dataset(paths, text_column, label_column):
+    """(texts, labels) from labeled files, or the built-in sample set without paths"""
+    if not paths:
+        from fake_news_detector import FakeNewsDetector
+        return FakeNewsDetector().create_training_data()
+
+    texts, labels = [], []
+    for path in paths:
+        frame = pd.concat(read_chunks(path, detect_format(path), 100000), ignore_index=True)
+        for text, label in zip(frame[text_column].tolist(), frame[label_column].tolist()):
+            label = parse_label(label)
+            if label is not None and isinstance(text, str) and text.strip():
+                texts.append(text)
+                labels.append(label)
+    return texts, labels
+
+def format_params(params):
+    ngram_range = params['ngram_range']
+    return (f"max_features={params['max_features']} ngram={ngram_range[0]}-{ngram_range[1]} "
+            f"min_df={params['min_df']} max_df={params['max_df']} sublinear={params['sublinear_tf']} C={params['C']}")
+
+def print_report(results, front, selected):
+    front_keys = {_key(result['params']) for result in front}
+    print(f"  {'accuracy':>15} {'latency':>9} {'size':>9} {'memory':>9} {'fit peak':>9}  params")
+    for result in sorted(results, key=lambda result: (-result['accuracy'], result['latency_ms'])):
+        key = _key(result['params'])
+        marker = '>' if result is selected else ('*' if key in front_keys else ' ')
+        print(f"{marker} {result['accuracy']:.4f} ±{result['accuracy_std']:.3f} {result['latency_ms']:>7.3f}ms "
+              f"{result['model_bytes'] / 1024:>7.0f}KB {result['memory_bytes'] / 1024:>7.0f}KB "
+              f"{result['fit_peak_bytes'] / 1024 / 1024:>7.1f}MB  {format_params(result['params'])}")
+    print("\n* Pareto front (accuracy vs latency), > selected")
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-validated hyperparameter search for the TF-IDF model')
+    parser.add_argument('paths', nargs='*', help='Labeled CSV, JSON Lines or Parquet files (default: sample set)')
+    parser.add_argument('--text-column', default='news', help='Column holding the article text')
+    parser.add_argument('--label-column', default='label', help='Column holding 1/0 or FAKE/REAL')
+    parser.add_argument('--search', choices=('grid', 'random'), default='grid')
+    parser.add_argument('--n-iter', type=int, default=20, help='Candidates sampled by random search')
+    parser.add_argument('--param', action='append', metavar='NAME=V1,V2',
+                        help=f"Override a grid axis ({', '.join(DEFAULT_GRID)}); ranges as 1-3, none for None")
+    parser.add_argument('--folds', type=int, default=DEFAULT_FOLDS)
+    parser.add_argument('--jobs', type=int, default=-1, help='Worker processes (default: all cores)')
+    parser.add_argument('--max-latency-ms', type=float, help='Latency budget per document for the selection')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Accuracy difference treated as a tie on the front')
+    parser.add_argument('--report', help='Write every candidate and the front to this JSON file')
+    parser.add_argument('--save', action='store_true', help='Fit the selected candidate on all data and save it')
+    parser.add_argument('--version', help='Artifact version (default: base version plus timestamp)')
+    parser.add_argument('--artifact-dir', default=os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR),
+                        help='Directory holding model artifacts')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        grid = parse_grid(args.param)
+        texts, labels = load_dataset(args.paths, args.text_column, args.label_column)
+
+        from fake_news_detector import FakeNewsDetector, build_pipeline, model_info
+        detector = FakeNewsDetector()
+        start_time = time.time()
+        # Preprocess once; every candidate and fold sees the same text the API scores
+        processed_texts = detector.preprocessor.preprocess_many(texts)
+
+        results = search(processed_texts, labels, grid, args.search, args.n_iter, args.folds, args.jobs)
+        front = pareto_front(results)
+        selected = select_candidate(front, args.max_latency_ms, args.tolerance)
+        elapsed = time.time() - start_time
+
+        print_report(results, front, selected)
+        print(f"Searched {len(results)} candidates on {len(texts)} documents in {elapsed:.1f}s")
+
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump({'candidates': results, 'pareto_front': front, 'selected': selected}, f, indent=2, default=list)
+
+        if args.save:
+            pipeline = build_pipeline(selected['params'])
+            pipeline.fit(processed_texts, labels)
+            pipeline.named_steps['tfidf'].stop_words_ = None
+
+            info = dict(model_info)
+            info.update({
+                'version': args.version or default_version(model_info['version']),
+                'accuracy': round(selected['accuracy'] * 100, 2),
+                'trained_at': datetime.now().isoformat(),
+                'features_count': len(pipeline.named_steps['tfidf'].vocabulary_),
+                'search': {key: value for key, value in selected.items() if key != 'fold_accuracy'}
+            })
+            path = save_artifact(pipeline, info, args.artifact_dir)
+            print(f"Saved selected model {info['version']} ({info['accuracy']}% CV accuracy) -> {path}")
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Model Artifact Store
+AI-Powered Fake News Detection System
+
+Trains the detector once and persists the fitted pipeline plus model_info
+as a versioned artifact that API workers load at startup.
+
+Usage:
+    python model_store.py train [--version VERSION] [--artifact-dir DIR]
+    python model_store.py list [--artifact-dir DIR]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime
+import joblib
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_PREFIX = 'fake-news-detector-'
+ARTIFACT_SUFFIX = '.joblib'
+COMPACT_SUFFIX = '.compact.joblib'
+LATEST_POINTER = 'LATEST'
+SHADOW_POINTER = 'SHADOW'
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts')
+
+def artifact_path(version, artifact_dir=None):
+    """Return the on-disk path of the artifact for a model version"""
+    return os.path.join(artifact_dir or DEFAULT_ARTIFACT_DIR, f"{ARTIFACT_PREFIX}{version}{ARTIFACT_SUFFIX}")
+
+def compact_artifact_path(path):
+    """Return the path of the compact scoring engine exported next to an artifact"""
+    return path[:-len(ARTIFACT_SUFFIX)] + COMPACT_SUFFIX
+
+def save_artifact(pipeline, info, artifact_dir=None):
+    """
+    Persist a fitted pipeline and its model_info as a versioned artifact.
+    The file is written uncompressed so numpy arrays can be memory-mapped
+    on load, and the LATEST pointer is only updated once the write is complete.
+    """
+    artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
+    os.makedirs(artifact_dir, exist_ok=True)
+
+    path = artifact_path(info['version'], artifact_dir)
+    payload = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'pipeline': pipeline,
+        'model_info': dict(info)
+    }
+
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    joblib.dump(payload, tmp_path)
+    os.replace(tmp_path, path)
+
+    # Export the compact scoring engine before LATEST can point at the artifact
+    from compact_model import export_compact
+    try:
+        export_compact(pipeline, info, path)
+    except ValueError as e:
+        logger.info(f"No compact engine for {os.path.basename(path)}: {e}")
+
+    set_latest(path, artifact_dir)
+
+    logger.info(f"Saved model artifact {path}")
+    return path
+
+def _write_pointer(artifact_dir, name, content):
+    pointer_tmp = os.path.join(artifact_dir, f"{name}.tmp.{os.getpid()}")
+    with open(pointer_tmp, 'w') as f:
+        f.write(content)
+    os.replace(pointer_tmp, os.path.join(artifact_dir, name))
+
+def set_latest(path, artifact_dir=None):
+    """Atomically point LATEST at an artifact; API workers watching the store follow it"""
+    _write_pointer(artifact_dir or DEFAULT_ARTIFACT_DIR, LATEST_POINTER, os.path.basename(path) + '\n')
+
+def set_shadow(path, sample_rate, artifact_dir=None):
+    """Ask API workers to shadow-score a sample of traffic with an artifact"""
+    content = json.dumps({'artifact': os.path.basename(path), 'sample_rate': sample_rate})
+    _write_pointer(artifact_dir or DEFAULT_ARTIFACT_DIR, SHADOW_POINTER, content + '\n')
+
+def clear_shadow(artifact_dir=None):
+    try:
+        os.remove(os.path.join(artifact_dir or DEFAULT_ARTIFACT_DIR, SHADOW_POINTER))
+    except FileNotFoundError:
+        pass
+
+def read_shadow(artifact_dir=None):
+    """The shadow artifact path and sample rate, or None when shadowing is off"""
+    artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
+    try:
+        with open(os.path.join(artifact_dir, SHADOW_POINTER)) as f:
+            pointer = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning(f"Ignoring unreadable SHADOW pointer: {e}")
+        return None
+    return {'path': os.path.join(artifact_dir, pointer['artifact']), 'sample_rate': float(pointer['sample_rate'])}
+
+def resolve_artifact(reference, artifact_dir=None):
+    """
+    Find an artifact in the store by version or file name. Paths outside the
+    store are rejected, since loading an artifact unpickles it.
+    """
+    artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
+    for path in (artifact_path(reference, artifact_dir), os.path.join(artifact_dir, os.path.basename(reference))):
+        if path in list_artifacts(artifact_dir):
+            return path
+    raise FileNotFoundError(f"No artifact {reference} in {artifact_dir}")
+
+def list_artifacts(artifact_dir=None):
+    """List artifact paths in the store, oldest first"""
+    artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
+    if not os.path.isdir(artifact_dir):
+        return []
+
+    paths = [
+        os.path.join(artifact_dir, name) for name in os.listdir(artifact_dir)
+        if name.startswith(ARTIFACT_PREFIX) and name.endswith(ARTIFACT_SUFFIX) and not name.endswith(COMPACT_SUFFIX)
+    ]
+    return sorted(paths, key=os.path.getmtime)
+
+def latest_artifact_path(artifact_dir=None):
+    """Resolve the artifact the LATEST pointer refers to, or the newest one on disk"""
+    artifact_dir = artifact_dir or DEFAULT_ARTIFACT_DIR
+    pointer = os.path.join(artifact_dir, LATEST_POINTER)
+
+    if os.path.exists(pointer):
+        with open(pointer) as f:
+            path = os.path.join(artifact_dir, f.read().strip())
+        if os.path.exists(path):
+            return path
+        logger.warning(f"LATEST points to missing artifact {path}")
+
+    artifacts = list_artifacts(artifact_dir)
+    return artifacts[-1] if artifacts else None
+
+def load_artifact(path=None, artifact_dir=None, mmap_mode='r'):
+    """
+    Load a model artifact. Numpy arrays in the pipeline are memory-mapped
+    read-only by default so workers on the same host share page cache.
+    """
+    path = path or latest_artifact_path(artifact_dir)
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"No model artifact found in {artifact_dir or DEFAULT_ARTIFACT_DIR}")
+
+    payload = joblib.load(path, mmap_mode=mmap_mode)
+
+    if payload.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format: {payload.get('format_version')}")
+
+    return {
+        'pipeline': payload['pipeline'],
+        'model_info': payload['model_info'],
+        'path': path
+    }
+
+def default_version(base_version):
+    """Build a unique artifact version from the base model version"""
+    return f"{base_version}+{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+def train(args):
+    """Train the detector and write a new artifact"""
+    from fake_news_detector import FakeNewsDetector, model_info
+
+    start_time = time.time()
+    detector = FakeNewsDetector()
+    pipeline = detector.train_model()
+
+    info = dict(model_info)
+    info['version'] = args.version or default_version(model_info['version'])
+    path = save_artifact(pipeline, info, args.artifact_dir)
+
+    print(f"Trained model {info['version']} ({info['accuracy']}% accuracy) "
+          f"in {time.time() - start_time:.2f}s -> {path}")
+
+def list_command(args):
+    """Print the artifacts in the store"""
+    latest = latest_artifact_path(args.artifact_dir)
+    for path in list_artifacts(args.artifact_dir):
+        marker = '*' if path == latest else ' '
+        print(f"{marker} {os.path.basename(path)}  {os.path.getsize(path)} bytes")
+
+def main():
+    parser = argparse.ArgumentParser(description='Train and manage persisted model artifacts')
+    parser.add_argument('--artifact-dir', default=os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR),
+                        help='Directory holding model artifacts')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Train the model and save a new artifact')
+    train_parser.add_argument('--version', help='Artifact version (default: base version plus timestamp)')
+    train_parser.set_defaults(func=train)
+
+    list_parser = subparsers.add_parser('list', help='List saved artifacts')
+    list_parser.set_defaults(func=list_command)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
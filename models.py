@@ -8,6 +8,16 @@ import enum
 
 db = SQLAlchemy()
 
+def dialect_insert(dialect):
+    """INSERT construct supporting ON CONFLICT for the bound dialect, if any"""
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
 class UserRole(enum.Enum):
     USER = "user"
     ADMIN = "admin"
@@ -111,6 +121,13 @@ class Submission(db.Model):
     flags = db.relationship('Flag', backref='submission', lazy=True, cascade='all, delete-orphan')
     comments = db.relationship('Comment', backref='submission', lazy=True, cascade='all, delete-orphan')
     
+    __table_args__ = (
+        # Date-range histograms grouped by prediction
+        db.Index('idx_submitted_at_prediction', 'submitted_at', 'prediction'),
+        # Keyset pagination of a user's history on (submitted_at, id)
+        db.Index('idx_user_submitted_at_id', 'user_id', 'submitted_at', 'id'),
+    )
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -195,7 +212,8 @@ class KeywordTrend(db.Model):
     last_seen = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     __table_args__ = (
-        db.Index('idx_keyword_category', 'keyword', 'category'),
+        # Also the conflict target of the bulk trend upsert
+        db.UniqueConstraint('keyword', 'category', name='uq_keyword_category'),
     )
     
     def to_dict(self):
@@ -4,13 +4,67 @@ OCR Text Extraction Script
 AI-Powered Fake News Detection System
 """
 
+import io
+import os
 import sys
-import pytesseract
-from PIL import Image
+import glob
+import json
+import time
+import logging
 import argparse
-import os
+import threading
+import multiprocessing
+from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED, ALL_COMPLETED
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from image_preprocessing import ImagePreprocessor, DEFAULT_TARGET_X_HEIGHT, IMAGE_EXTENSIONS, to_grayscale, ink_rows
+
+logger = logging.getLogger(__name__)
+
+# Configure Tesseract for better accuracy
+DEFAULT_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,!?;:()'
 
-def extract_text_from_image(image_path):
+# Shared default stage; pass preprocessor=None for the unprocessed path
+DEFAULT_PREPROCESSOR = ImagePreprocessor()
+
+# Tiling of tall pages, in pixels after preprocessing
+TILE_HEIGHT = 1200
+TILE_OVERLAP = 120
+# Cut points move up to this fraction of a tile to land between text lines
+TILE_CUT_SEARCH = 0.25
+# Overlap de-duplication compares this many words around each seam
+STITCH_WINDOW = 40
+STITCH_MIN_MATCH = 3
+# Words a line cut in half can leave at a tile edge
+STITCH_MAX_EDGE = 12
+
+def ocr_image(image, config=DEFAULT_CONFIG, preprocessor=DEFAULT_PREPROCESSOR, timings=False):
+    """
+    Run Tesseract on an open PIL image and clean up the extracted text.
+    With timings=True, returns (text, per-stage timings in seconds).
+    """
+    stages = {}
+    if preprocessor is not None:
+        image, stages = preprocessor(image)
+    elif image.mode != 'RGB':
+        # Convert to RGB if necessary
+        image = image.convert('RGB')
+
+    # Extract text using Tesseract OCR
+    import pytesseract
+
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(image, config=config)
+    stages['ocr'] = round(time.perf_counter() - start, 4)
+
+    # Clean up extracted text and remove extra whitespace
+    text = ' '.join(text.split())
+    return (text, stages) if timings else text
+
+def extract_text_from_image(image_path, config=DEFAULT_CONFIG, preprocessor=DEFAULT_PREPROCESSOR, timings=False):
     """
     Extract text from image using OCR
     """
@@ -18,53 +72,457 @@ def extract_text_from_image(image_path):
         # Check if image file exists
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image file not found: {image_path}")
-        
-        # Open and process image
-        image = Image.open(image_path)
-        
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Extract text using Tesseract OCR
-        # Configure Tesseract for better accuracy
-        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,!?;:()'
-        
-        text = pytesseract.image_to_string(image, config=custom_config)
-        
-        # Clean up extracted text
-        text = text.strip()
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        return text
-        
+
+        with Image.open(image_path) as image:
+            return ocr_image(image, config, preprocessor, timings)
+
+    except Exception as e:
+        raise Exception(f"OCR extraction failed: {str(e)}")
+
+def extract_text_from_bytes(data, config=DEFAULT_CONFIG, preprocessor=DEFAULT_PREPROCESSOR, timings=False):
+    """
+    Extract text from encoded image bytes (e.g. an upload) using OCR
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return ocr_image(image, config, preprocessor, timings)
+
     except Exception as e:
         raise Exception(f"OCR extraction failed: {str(e)}")
 
+def iter_pages(image):
+    """Copies of each frame of a (possibly multi-page) image"""
+    for frame in ImageSequence.Iterator(image):
+        yield frame.copy()
+
+def page_count(image):
+    return getattr(image, 'n_frames', 1)
+
+def split_tiles(image, tile_height=TILE_HEIGHT, overlap=TILE_OVERLAP):
+    """
+    Split a page into overlapping horizontal strips. Each cut is moved up to
+    the nearest blank row, when there is one close by, so fewer text lines
+    are sliced in half.
+    """
+    if image.height <= tile_height + overlap:
+        return [image]
+
+    blank = np.flatnonzero(~ink_rows(to_grayscale(image)))
+    tiles = []
+    top = 0
+    while top < image.height:
+        bottom = top + tile_height
+        if bottom + overlap >= image.height:
+            tiles.append(image.crop((0, top, image.width, image.height)))
+            break
+
+        search_from = bottom - int(tile_height * TILE_CUT_SEARCH)
+        candidates = blank[(blank >= search_from) & (blank <= bottom)]
+        if len(candidates):
+            bottom = int(candidates[-1])
+
+        tiles.append(image.crop((0, top, image.width, min(image.height, bottom + overlap))))
+        top = bottom
+    return tiles
+
+def _merge_words(previous, current):
+    """Append current to previous, dropping the words repeated across the seam"""
+    tail = previous[-STITCH_WINDOW:]
+    head = current[:STITCH_WINDOW]
+    match = SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(0, len(tail), 0, len(head))
+
+    # The repeat must sit at the end of one strip and the start of the next;
+    # only a partly cut line of OCR noise may surround it
+    if (match.size >= min(STITCH_MIN_MATCH, len(head)) and match.size > 0
+            and len(tail) - (match.a + match.size) <= STITCH_MAX_EDGE and match.b <= STITCH_MAX_EDGE):
+        keep = len(previous) - len(tail) + match.a + match.size
+        return previous[:keep] + current[match.b + match.size:]
+    return previous + current
+
+def stitch_text(parts):
+    """Join the OCR text of consecutive overlapping strips"""
+    words = []
+    for part in parts:
+        words = _merge_words(words, part.split()) if words else part.split()
+    return ' '.join(words)
+
+def _ocr_tile(tile, config):
+    return ocr_image(tile, config, preprocessor=None)
+
+def extract_text_tiled(image, config=DEFAULT_CONFIG, preprocessor=DEFAULT_PREPROCESSOR,
+                       tile_height=TILE_HEIGHT, overlap=TILE_OVERLAP, executor=None, max_workers=None,
+                       timeout=None, timings=False):
+    """
+    OCR a tall or multi-page image in parallel: each page is preprocessed,
+    split into overlapping strips, the strips are OCRed across a process
+    pool and their text is stitched back together page by page. Pass an
+    open PIL image or a path; uses executor when given, otherwise a
+    temporary pool of max_workers processes.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        with Image.open(image) as opened:
+            return extract_text_tiled(opened, config, preprocessor, tile_height, overlap,
+                                      executor, max_workers, timeout, timings)
+
+    stages = {}
+    tiles = []
+    for page_number, page in enumerate(iter_pages(image)):
+        if preprocessor is not None:
+            page, page_stages = preprocessor(page)
+            for stage, seconds in page_stages.items():
+                stages[stage] = round(stages.get(stage, 0.0) + seconds, 4)
+
+        start = time.perf_counter()
+        tiles.extend((page_number, tile) for tile in split_tiles(page, tile_height, overlap))
+        stages['tile'] = round(stages.get('tile', 0.0) + time.perf_counter() - start, 4)
+
+    start = time.perf_counter()
+    owns_executor = executor is None
+    if owns_executor:
+        workers = min(len(tiles), max_workers or os.cpu_count() or 1)
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('fork'), initializer=_warm_worker
+        )
+    futures = []
+    try:
+        futures = [executor.submit(_ocr_tile, tile, config) for _, tile in tiles]
+        deadline = time.time() + timeout if timeout else None
+        texts = [future.result(deadline - time.time() if deadline else None) for future in futures]
+    except BaseException:
+        # Timed out or a strip failed: do not leave the other strips queued on a shared pool
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+    stages['ocr'] = round(time.perf_counter() - start, 4)
+    stages['tiles'] = len(tiles)
+
+    pages = {}
+    for (page_number, _), text in zip(tiles, texts):
+        pages.setdefault(page_number, []).append(text)
+    text = ' '.join(stitch_text(parts) for _, parts in sorted(pages.items()))
+    return (text, stages) if timings else text
+
+def needs_tiling(image, tile_height=TILE_HEIGHT):
+    """Whether an image is multi-page or tall enough to gain from tiled OCR"""
+    return page_count(image) > 1 or image.height > 2 * tile_height
+
+def _warm_worker():
+    # Tesseract's own OpenMP threads only contend with the other workers
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+    # Pay the pytesseract import and tesseract binary lookup once per worker instead of per image
+    import pytesseract
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        # Reported by warm(); raising in the initializer would break the whole pool
+        return False
+    return True
+
+def _ocr_job(data, config, preprocessor):
+    start_time = time.time()
+    text, timings = extract_text_from_bytes(data, config, preprocessor, timings=True)
+    return {'text': text, 'length': len(text), 'ocr_time': round(time.time() - start_time, 3), 'timings': timings}
+
+class OCRWorkerPool:
+    """
+    Resident pool of OCR worker processes.
+
+    Workers import pytesseract/PIL once and stay warm, so a request only
+    pays for the tesseract call itself. Workers are forked, so call warm()
+    while the process has no other threads (the API does so in create_app()
+    and after_fork()); forking while another thread holds a lock can
+    deadlock the child. Otherwise the pool is created on first use in each
+    process, since worker processes do not survive a fork.
+    """
+
+    def __init__(self, max_workers=None, timeout=60, preprocessor=DEFAULT_PREPROCESSOR, tile_height=TILE_HEIGHT):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.preprocessor = preprocessor
+        # None disables tiling; tall and multi-page uploads are then OCRed by one worker
+        self.tile_height = tile_height
+
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._metrics = {'jobs': 0, 'errors': 0, 'timeouts': 0, 'total_ocr_time': 0.0}
+
+    def _ensure_started(self):
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                if threading.active_count() > 1:
+                    logger.warning("Forking OCR workers from a multi-threaded process; call warm() at startup")
+                self._pid = os.getpid()
+                # fork keeps workers from re-importing the parent's __main__ (and its model)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_warm_worker
+                )
+            return self._executor
+
+    def warm(self):
+        """Start every worker process ahead of the first request"""
+        executor = self._ensure_started()
+        futures = [executor.submit(_warm_worker) for _ in range(self.max_workers)]
+        if not all([future.result(self.timeout) for future in futures]):
+            raise RuntimeError("tesseract is not installed or not on PATH")
+
+    def submit(self, data, config=DEFAULT_CONFIG):
+        """Queue image bytes for OCR; returns a future of the result dict"""
+        return self._ensure_started().submit(_ocr_job, data, config, self.preprocessor)
+
+    def _extract_tiled(self, data, config):
+        start_time = time.time()
+        with Image.open(io.BytesIO(data)) as image:
+            if not needs_tiling(image, self.tile_height):
+                return None
+            text, timings = extract_text_tiled(
+                image, config, self.preprocessor, self.tile_height,
+                executor=self._ensure_started(), timeout=self.timeout, timings=True
+            )
+        return {'text': text, 'length': len(text), 'ocr_time': round(time.time() - start_time, 3), 'timings': timings}
+
+    def extract(self, data, config=DEFAULT_CONFIG):
+        """
+        OCR image bytes and wait for the result dict. Tall and multi-page
+        images are split into strips spread over all workers.
+        """
+        future = None
+        try:
+            result = self._extract_tiled(data, config) if self.tile_height else None
+            if result is None:
+                future = self.submit(data, config)
+                result = future.result(self.timeout)
+        except TimeoutError:
+            if future is not None:
+                future.cancel()
+            with self._lock:
+                self._metrics['timeouts'] += 1
+            raise Exception(f"OCR extraction timed out after {self.timeout}s")
+        except Exception:
+            with self._lock:
+                self._metrics['errors'] += 1
+            raise
+
+        with self._lock:
+            self._metrics['jobs'] += 1
+            self._metrics['total_ocr_time'] += result['ocr_time']
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def metrics(self):
+        """Job counters and mean OCR time"""
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics['workers'] = self.max_workers
+        metrics['started'] = self._executor is not None and self._pid == os.getpid()
+        metrics['avg_ocr_time'] = round(metrics['total_ocr_time'] / metrics['jobs'], 3) if metrics['jobs'] else 0.0
+        del metrics['total_ocr_time']
+        return metrics
+
+def iter_batch_paths(sources, stdin=None):
+    """
+    Image paths from directories (walked recursively), glob patterns, plain
+    paths and, for '-', newline-delimited paths on stdin. Each path is
+    yielded once.
+    """
+    seen = set()
+    for source in sources:
+        if source == '-':
+            paths = (line.strip() for line in (stdin or sys.stdin))
+        elif os.path.isdir(source):
+            paths = (
+                os.path.join(root, name)
+                for root, dirs, files in sorted(os.walk(source))
+                for name in sorted(files) if name.lower().endswith(IMAGE_EXTENSIONS)
+            )
+        else:
+            # A path that neither exists nor matches is reported as an item error
+            paths = sorted(glob.glob(source, recursive=True)) or [source]
+
+        for path in paths:
+            key = os.path.abspath(path)
+            if path and key not in seen:
+                seen.add(key)
+                yield path
+
+def load_processed_paths(output_path):
+    """Paths already written without error to a JSON Lines output file"""
+    processed = set()
+    if not os.path.exists(output_path):
+        return processed
+
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Last line of an interrupted run
+                continue
+            if record.get('path') and not record.get('error'):
+                processed.add(os.path.abspath(record['path']))
+    return processed
+
+def _batch_job(path, config, preprocessor, min_length):
+    start_time = time.time()
+    record = {'path': path, 'text': None, 'length': 0, 'processing_time': None, 'timings': None, 'error': None}
+    try:
+        text, timings = extract_text_from_image(path, config, preprocessor, timings=True)
+        record.update({'text': text, 'length': len(text), 'timings': timings})
+        if len(text) < min_length:
+            record['error'] = f"Extracted text too short (minimum {min_length} characters)"
+    except Exception as e:
+        record['error'] = str(e)
+    record['processing_time'] = round(time.time() - start_time, 3)
+    return record
+
+def run_batch(sources, output, config=DEFAULT_CONFIG, preprocessor=DEFAULT_PREPROCESSOR, min_length=10,
+              max_workers=None, processed=()):
+    """
+    OCR every image from sources across a process pool, writing one JSON
+    line per image to output as soon as it finishes. Paths in processed are
+    skipped. Returns counts of written, failed and skipped images.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = {'processed': 0, 'errors': 0, 'skipped': 0}
+    pending = set()
+
+    def drain(return_when):
+        nonlocal pending
+        done, pending = wait(pending, return_when=return_when)
+        for future in done:
+            record = future.result()
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            counts['processed'] += 1
+            if record['error']:
+                counts['errors'] += 1
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('fork'),
+                             initializer=_warm_worker) as executor:
+        for path in iter_batch_paths(sources):
+            if os.path.abspath(path) in processed:
+                counts['skipped'] += 1
+                continue
+
+            # Bound the in-flight work so huge listings are read lazily
+            if len(pending) >= 2 * max_workers:
+                drain(FIRST_COMPLETED)
+            pending.add(executor.submit(_batch_job, path, config, preprocessor, min_length))
+
+        if pending:
+            drain(ALL_COMPLETED)
+    return counts
+
 def main():
     parser = argparse.ArgumentParser(description='Extract text from image using OCR')
-    parser.add_argument('image_path', help='Path to the image file')
-    parser.add_argument('--config', help='Tesseract configuration', default='--oem 3 --psm 6')
+    parser.add_argument('image_path', nargs='+',
+                        help='Path to the image file; with --batch, directories, globs or - for a list on stdin')
+    parser.add_argument('--config', help='Tesseract configuration', default=DEFAULT_CONFIG)
     parser.add_argument('--min-length', type=int, default=10, help='Minimum text length')
-    
+    parser.add_argument('--no-preprocess', action='store_true', help='OCR the image as-is')
+    parser.add_argument('--target-x-height', type=int, default=DEFAULT_TARGET_X_HEIGHT,
+                        help='Rescale so body text has this x-height in pixels')
+    parser.add_argument('--crop', action='store_true', help='Crop to the text region before OCR')
+    parser.add_argument('--timings', action='store_true', help='Print per-stage timings to stderr')
+    parser.add_argument('--tiled', action='store_true',
+                        help='Split tall and multi-page images into strips OCRed in parallel')
+    parser.add_argument('--tile-height', type=int, default=TILE_HEIGHT, help='Strip height in pixels')
+    parser.add_argument('--workers', type=int,
+                        help='Worker processes for --tiled and --batch (default: one per core)')
+    parser.add_argument('--batch', action='store_true',
+                        help='OCR many images, streaming one JSON line per image')
+    parser.add_argument('--output', '-o', help='JSON Lines output file for --batch (default: stdout)')
+    parser.add_argument('--resume', action='store_true',
+                        help='With --batch --output, skip images already written without error')
+
     args = parser.parse_args()
-    
+    preprocessor = None if args.no_preprocess else ImagePreprocessor(
+        target_x_height=args.target_x_height, crop=args.crop
+    )
+
+    if args.batch:
+        batch_main(args, preprocessor)
+        return
+
+    if len(args.image_path) != 1:
+        parser.error('exactly one image_path is required without --batch')
+    if args.resume:
+        parser.error('--resume requires --batch')
+    image_path = args.image_path[0]
+
     try:
         # Extract text
-        extracted_text = extract_text_from_image(args.image_path)
-        
+        if args.tiled:
+            if not os.path.exists(image_path):
+                raise FileNotFoundError(f"Image file not found: {image_path}")
+            extracted_text, timings = extract_text_tiled(
+                image_path, args.config, preprocessor, args.tile_height,
+                max_workers=args.workers, timings=True
+            )
+        else:
+            extracted_text, timings = extract_text_from_image(image_path, args.config, preprocessor, timings=True)
+        if args.timings:
+            print(' '.join(
+                f"{stage}={seconds}" if stage == 'tiles' else f"{stage}={seconds * 1000:.1f}ms"
+                for stage, seconds in timings.items()
+            ), file=sys.stderr)
+
         # Check minimum length
         if len(extracted_text) < args.min_length:
             raise Exception(f"Extracted text too short (minimum {args.min_length} characters)")
-        
+
         # Output the extracted text
         print(extracted_text)
-        
+
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+def batch_main(args, preprocessor):
+    if args.resume and not args.output:
+        print("Error: --resume requires --output", file=sys.stderr)
+        sys.exit(2)
+    if args.tiled:
+        print("Error: --tiled cannot be combined with --batch (images are already OCRed in parallel)",
+              file=sys.stderr)
+        sys.exit(2)
+
+    processed = load_processed_paths(args.output) if args.resume else set()
+    if processed or (args.resume and os.path.exists(args.output)):
+        # Terminate a line cut off by an interrupted run before appending
+        with open(args.output, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+    output = open(args.output, 'a' if args.resume else 'w', encoding='utf-8') if args.output else sys.stdout
+
+    start_time = time.time()
+    try:
+        counts = run_batch(args.image_path, output, args.config, preprocessor, args.min_length,
+                           args.workers, processed)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.time() - start_time
+    print(f"{counts['processed']} images in {elapsed:.1f}s "
+          f"({counts['processed'] / elapsed if elapsed else 0:.1f}/s), "
+          f"{counts['errors']} errors, {counts['skipped']} skipped", file=sys.stderr)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,189 @@
+"""
+Prediction Cache
+AI-Powered Fake News Detection System
+
+Bounded LRU/TTL cache of predictions keyed by a hash of the normalized
+text and the model version, with an optional backend shared by all
+workers on the host.
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+from text_preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+class SQLiteCacheBackend:
+    """
+    Shared cache backend stored in a local SQLite file, standing in for a
+    networked cache so every gunicorn worker on the host sees the same entries.
+    Every prune_every writes the writer drops expired rows and trims the
+    table far enough below max_entries to absorb its writes until the next
+    prune.
+    """
+
+    def __init__(self, path, max_entries=100000, prune_every=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every or max(1, max_entries // 100)
+        self._local = threading.local()
+        self._writes_since_prune = 0
+        self._prune_lock = threading.Lock()
+
+        conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS prediction_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_prediction_cache_expires ON prediction_cache (expires_at)')
+        finally:
+            conn.close()
+
+    def _connection(self):
+        # One connection per thread and process; connections must not cross a fork
+        pid, conn = getattr(self._local, 'conn', (None, None))
+        if conn is None or pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            self._local.conn = (os.getpid(), conn)
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT value FROM prediction_cache WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO prediction_cache (key, value, expires_at) VALUES (?, ?, ?)',
+            (key, json.dumps(value), time.time() + ttl)
+        )
+
+        with self._prune_lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= self.prune_every
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune(headroom=self.prune_every)
+
+    def prune(self, headroom=0):
+        """Drop expired entries and trim the table to max_entries - headroom, soonest to expire first"""
+        conn = self._connection()
+        conn.execute('DELETE FROM prediction_cache WHERE expires_at <= ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM prediction_cache WHERE key IN (SELECT key FROM prediction_cache '
+            'ORDER BY expires_at DESC LIMIT -1 OFFSET ?)', (max(0, self.max_entries - headroom),)
+        )
+
+    def discard_except(self, prefix):
+        """Drop every entry whose key does not start with prefix"""
+        self._connection().execute(
+            'DELETE FROM prediction_cache WHERE substr(key, 1, ?) != ?', (len(prefix), prefix)
+        )
+
+class PredictionCache:
+    """In-process LRU cache with TTL expiry and an optional shared backend"""
+
+    def __init__(self, max_entries=10000, ttl=3600, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def make_key(text, model_version):
+        """Cache key for a text under a model version"""
+        digest = hashlib.sha256(normalize(text).encode('utf-8')).hexdigest()
+        return f"{model_version}:{digest}"
+
+    def get(self, key):
+        """Return the cached (prediction, confidence) or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            try:
+                value = self.backend.get(key)
+            except Exception as e:
+                logger.warning(f"Shared prediction cache read failed: {e}")
+                value = None
+
+            if value is not None:
+                value = tuple(value)
+                self._store_local(key, value, now)
+                with self._lock:
+                    self._stats['shared_hits'] += 1
+                return value
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key, value):
+        """Cache a (prediction, confidence) pair"""
+        value = (value[0], float(value[1]))
+        self._store_local(key, value, time.time())
+
+        if self.backend is not None:
+            try:
+                self.backend.set(key, value, self.ttl)
+            except Exception as e:
+                logger.warning(f"Shared prediction cache write failed: {e}")
+
+    def _store_local(self, key, value, now):
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, model_version=None):
+        """
+        Drop cached predictions after the model was reloaded. Shared entries
+        for model_version are kept since other workers may already use it.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._stats['invalidations'] += 1
+
+        if self.backend is not None:
+            try:
+                self.backend.discard_except(f"{model_version}:")
+                self.backend.prune()
+            except Exception as e:
+                logger.warning(f"Shared prediction cache invalidation failed: {e}")
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+
+        lookups = stats['hits'] + stats['shared_hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] + stats['shared_hits']) / lookups, 4) if lookups else 0.0
+        stats['max_entries'] = self.max_entries
+        stats['ttl'] = self.ttl
+        stats['shared'] = self.backend is not None
+        return stats
@@ -47,7 +47,9 @@ CREATE TABLE submissions (
     INDEX idx_prediction (prediction),
     INDEX idx_confidence (confidence),
     INDEX idx_submitted_at (submitted_at),
-    INDEX idx_submission_type (submission_type)
+    INDEX idx_submission_type (submission_type),
+    INDEX idx_submitted_at_prediction (submitted_at, prediction),
+    INDEX idx_user_submitted_at_id (user_id, submitted_at, id)
 );
 
 -- Community Flags Table
@@ -122,5 +124,6 @@ CREATE TABLE keyword_trends (
     last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_keyword (keyword),
     INDEX idx_category (category),
-    INDEX idx_frequency (frequency)
+    INDEX idx_frequency (frequency),
+    UNIQUE KEY uq_keyword_category (keyword, category)
 );
\ No newline at end of file
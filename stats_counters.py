@@ -0,0 +1,288 @@
+"""
+Materialized Statistics Counters
+AI-Powered Fake News Detection System
+
+Incrementally maintained aggregates stored in the system_stats table,
+with one running total row and one rollup row per day for each counter,
+so dashboards never scan the users, submissions or api_logs tables.
+"""
+
+import os
+import time
+import atexit
+import logging
+import threading
+from datetime import datetime
+
+from models import db, dialect_insert, SystemStat, APILog
+from stats_queries import user_status_distribution, prediction_distribution
+
+logger = logging.getLogger(__name__)
+
+COUNTER_PREFIX = 'counter:'
+# Running totals recomputed by rebuild_counters
+TOTAL_COUNTERS = ('users', 'submissions', 'api_requests')
+
+def counter_key(name, day=None):
+    """system_stats key for a counter total, or for one day's rollup"""
+    if day is None:
+        return f"{COUNTER_PREFIX}{name}"
+    return f"{COUNTER_PREFIX}{name}:{day.isoformat()}"
+
+def _is_rollup(key):
+    return key.count(':') > 1
+
+def increment_counters(deltas):
+    """
+    Add deltas ({stat_key: {field: amount}}) to the stored counters inside
+    the caller's transaction. Missing day rollups are created first with
+    INSERT ... ON CONFLICT DO NOTHING, so two writers starting the same day
+    do not collide on stat_key. Rows are then locked in key order to keep
+    concurrent writers from losing updates or deadlocking.
+    """
+    rollups = [key for key in sorted(deltas) if _is_rollup(key)]
+    insert = dialect_insert(db.session.get_bind().dialect.name)
+    if rollups and insert is not None:
+        table = SystemStat.__table__
+        now = datetime.utcnow()
+        db.session.execute(
+            insert(table)
+            .values([{'stat_key': key, 'stat_value': {}, 'updated_at': now} for key in rollups])
+            .on_conflict_do_nothing(index_elements=[table.c.stat_key])
+        )
+
+    for key in sorted(deltas):
+        stat = SystemStat.query.filter_by(stat_key=key).with_for_update().first()
+        if stat is None:
+            # A missing running total is computed from the base tables by
+            # rebuild_counters on first read; only day rollups start from zero
+            # (created here for dialects without ON CONFLICT)
+            if _is_rollup(key):
+                db.session.add(SystemStat(stat_key=key, stat_value=dict(deltas[key])))
+            continue
+
+        value = dict(stat.stat_value or {})
+        for field, amount in deltas[key].items():
+            value[field] = value.get(field, 0) + amount
+        stat.stat_value = value
+
+def _add(deltas, key, field, amount=1):
+    deltas.setdefault(key, {})
+    deltas[key][field] = deltas[key].get(field, 0) + amount
+
+def submission_deltas(rows):
+    """Counter deltas for newly inserted submissions"""
+    deltas = {}
+    for row in rows:
+        prediction = row['prediction'].value
+        day = (row.get('submitted_at') or datetime.utcnow()).date()
+        for key in (counter_key('submissions'), counter_key('submissions', day)):
+            _add(deltas, key, 'total')
+            _add(deltas, key, prediction)
+    return deltas
+
+def api_log_deltas(rows):
+    """Counter deltas for newly inserted API log entries"""
+    deltas = {}
+    for row in rows:
+        day = (row.get('created_at') or datetime.utcnow()).date()
+        for key in (counter_key('api_requests'), counter_key('api_requests', day)):
+            _add(deltas, key, 'count')
+            _add(deltas, key, 'processing_time_sum', row['processing_time'])
+    return deltas
+
+def user_deltas(users):
+    """Counter deltas for newly created users"""
+    deltas = {}
+    for user in users:
+        _add(deltas, counter_key('users'), 'total')
+        _add(deltas, counter_key('users'), user.status.value)
+    return deltas
+
+def _lock_counters(keys):
+    """Create any missing counter rows, then lock them all in key order"""
+    insert = dialect_insert(db.session.get_bind().dialect.name)
+    now = datetime.utcnow()
+    if insert is not None:
+        table = SystemStat.__table__
+        db.session.execute(
+            insert(table)
+            .values([{'stat_key': key, 'stat_value': {}, 'updated_at': now} for key in keys])
+            .on_conflict_do_nothing(index_elements=[table.c.stat_key])
+        )
+
+    stats = {}
+    for key in sorted(keys):
+        stat = SystemStat.query.filter_by(stat_key=key).with_for_update().first()
+        if stat is None:
+            stat = SystemStat(stat_key=key, stat_value={})
+            db.session.add(stat)
+        stats[key] = stat
+    return stats
+
+def rebuild_counters():
+    """
+    Recompute the running totals from the base tables. Run at startup when
+    counters are missing and from the admin rebuild endpoint, e.g. after
+    changes made outside this API (the PHP admin changing user statuses).
+    
+    The counter rows are locked before counting, so writers incrementing
+    them wait for the rebuild and add on top of its result instead of
+    being overwritten. Submission deltas still held in a worker's
+    CounterAggregator (at most one flush interval) are added on top.
+    """
+    today = datetime.utcnow().date()
+    keys = [counter_key(name) for name in TOTAL_COUNTERS] + [counter_key('api_requests', today)]
+    stats = _lock_counters(keys)
+
+    users = user_status_distribution()
+    submissions = prediction_distribution()
+
+    count, processing_time_sum = db.session.query(
+        db.func.count(APILog.id), db.func.coalesce(db.func.sum(APILog.processing_time), 0)
+    ).one()
+    api_requests = {'count': count, 'processing_time_sum': float(processing_time_sum)}
+
+    start_of_day = datetime.combine(today, datetime.min.time())
+    today_count, today_sum = db.session.query(
+        db.func.count(APILog.id), db.func.coalesce(db.func.sum(APILog.processing_time), 0)
+    ).filter(APILog.created_at >= start_of_day).one()
+
+    values = {
+        counter_key('users'): users,
+        counter_key('submissions'): submissions,
+        counter_key('api_requests'): api_requests,
+        counter_key('api_requests', today): {'count': today_count, 'processing_time_sum': float(today_sum)}
+    }
+
+    for key, value in values.items():
+        stats[key].stat_value = value
+
+    db.session.commit()
+    logger.info("Statistics counters rebuilt")
+    return values
+
+def read_counters(keys):
+    """Fetch several counters in one query; missing counters map to None"""
+    rows = SystemStat.query.filter(SystemStat.stat_key.in_(keys)).all()
+    found = {row.stat_key: row.stat_value for row in rows}
+    return {key: found.get(key) for key in keys}
+
+class CounterAggregator:
+    """
+    Counter deltas summed in memory across requests and applied with one
+    increment_counters transaction per flush, so requests do not lock the
+    shared running-total rows themselves
+    """
+
+    def __init__(self, app, flush_interval=5.0):
+        self.app = app
+        self.flush_interval = flush_interval
+
+        self._deltas = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._metrics = {
+            'added': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'last_flush_latency': 0.0
+        }
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so every worker process starts its own flusher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                self._deltas = {}
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='stats-counters', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def add(self, deltas):
+        """Queue counter deltas ({stat_key: {field: amount}}) for the next flush"""
+        self._ensure_started()
+
+        with self._lock:
+            self._merge(deltas)
+            self._metrics['added'] += 1
+
+    def _merge(self, deltas):
+        for key, fields in deltas.items():
+            for field, amount in fields.items():
+                _add(self._deltas, key, field, amount)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Apply everything added since the last flush"""
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+
+        if not deltas:
+            return
+
+        start_time = time.time()
+        with self.app.app_context():
+            try:
+                increment_counters(deltas)
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Failed to update statistics counters: {e}")
+                db.session.rollback()
+
+                # Keep the deltas for the next flush; there is one key per
+                # counter and day, so the backlog stays small
+                with self._lock:
+                    self._merge(deltas)
+                    self._metrics['flush_errors'] += 1
+                return
+
+        with self._lock:
+            self._metrics['flushes'] += 1
+            self._metrics['last_flush_latency'] = round(time.time() - start_time, 4)
+
+    def metrics(self):
+        """Pending counter keys and flush counters"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics['pending_keys'] = len(self._deltas)
+        metrics['flush_interval'] = self.flush_interval
+        return metrics
+
+class TTLCache:
+    """Tiny per-process cache so dashboard polling does not hit the database"""
+
+    def __init__(self, ttl=5.0):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+
+        value = compute()
+        with self._lock:
+            self._entries[key] = (value, now + self.ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,66 @@
+"""
+Statistics Queries
+AI-Powered Fake News Detection System
+
+Grouped queries over users and submissions: every distribution is a
+single GROUP BY instead of one COUNT per enum value.
+"""
+
+from models import db, User, Submission
+
+def _range_filter(query, start=None, end=None):
+    if start is not None:
+        query = query.filter(Submission.submitted_at >= start)
+    if end is not None:
+        query = query.filter(Submission.submitted_at < end)
+    return query
+
+def user_status_distribution():
+    """User counts per status plus the total, in one query"""
+    distribution = {'total': 0}
+    rows = db.session.query(User.status, db.func.count(User.id)).group_by(User.status)
+    for status, count in rows:
+        distribution[status.value] = count
+        distribution['total'] += count
+    return distribution
+
+def prediction_distribution(start=None, end=None):
+    """Submission counts per prediction plus the total, in one query"""
+    distribution = {'total': 0}
+    query = db.session.query(Submission.prediction, db.func.count(Submission.id))
+    for prediction, count in _range_filter(query, start, end).group_by(Submission.prediction):
+        distribution[prediction.value] = count
+        distribution['total'] += count
+    return distribution
+
+def daily_submission_histogram(start=None, end=None):
+    """Per-day submission counts split by prediction, oldest day first"""
+    day = db.func.date(Submission.submitted_at)
+    query = db.session.query(day, Submission.prediction, db.func.count(Submission.id))
+    rows = _range_filter(query, start, end).group_by(day, Submission.prediction).order_by(day)
+
+    histogram = {}
+    for submitted_on, prediction, count in rows:
+        key = str(submitted_on)
+        bucket = histogram.setdefault(key, {'date': key, 'total': 0})
+        bucket[prediction.value] = count
+        bucket['total'] += count
+    return list(histogram.values())
+
+def model_version_breakdown(start=None, end=None):
+    """Submission counts per model version and prediction, with mean confidence"""
+    query = db.session.query(
+        Submission.model_version,
+        Submission.prediction,
+        db.func.count(Submission.id),
+        db.func.avg(Submission.confidence)
+    )
+    rows = _range_filter(query, start, end).group_by(Submission.model_version, Submission.prediction)
+
+    breakdown = {}
+    for model_version, prediction, count, avg_confidence in rows:
+        bucket = breakdown.setdefault(model_version, {'total': 0, 'avg_confidence': {}})
+        bucket[prediction.value] = count
+        bucket['total'] += count
+        bucket['avg_confidence'][prediction.value] = round(float(avg_confidence or 0), 4)
+    return breakdown
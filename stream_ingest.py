@@ -0,0 +1,142 @@
+"""
+Streaming Ingestion
+AI-Powered Fake News Detection System
+
+Incremental NDJSON parsing, micro-batching and per-job progress counters
+for classification jobs too large to send as one JSON document.
+"""
+
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+def iter_ndjson(stream, max_line_bytes):
+    """
+    Read newline-delimited JSON from a binary stream one line at a time,
+    yielding (line_number, record, error) for each non-blank line. Lines
+    longer than max_line_bytes are skipped with an error instead of being
+    buffered.
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+
+        if len(line) > max_line_bytes:
+            # Discard the rest of the oversized line
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(DRAIN_CHUNK_SIZE)
+            yield line_number, None, f"Line too long (max {max_line_bytes} bytes)"
+            continue
+
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+
+def micro_batches(items, batch_size):
+    """Group an iterable into lists of up to batch_size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class StreamJob:
+    """Progress and throughput counters for one streaming request"""
+
+    def __init__(self, client=None):
+        self.id = uuid.uuid4().hex
+        self.client = client
+        self.status = 'running'
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.lines = 0
+        self.processed = 0
+        self.errors = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def record_batch(self, lines, processed, errors):
+        with self._lock:
+            self.lines += lines
+            self.processed += processed
+            self.errors += errors
+            self.batches += 1
+
+    def finish(self, status='completed', error=None):
+        with self._lock:
+            if self.finished_at is None:
+                self.status = status
+                self.error = error
+                self.finished_at = time.time()
+
+    def to_dict(self):
+        with self._lock:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            return {
+                'job_id': self.id,
+                'status': self.status,
+                'error': self.error,
+                'client': self.client,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'elapsed': round(elapsed, 3),
+                'lines': self.lines,
+                'processed': self.processed,
+                'errors': self.errors,
+                'batches': self.batches,
+                'items_per_second': round(self.processed / elapsed, 1) if elapsed > 0 else 0.0
+            }
+
+class StreamJobRegistry:
+    """Running jobs plus the most recently finished ones, per process"""
+
+    def __init__(self, keep_finished=100):
+        self.keep_finished = keep_finished
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, client=None):
+        job = StreamJob(client)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        return job
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def summary(self):
+        """Counts of running jobs and the items they have processed so far"""
+        jobs = self.jobs()
+        running = [job for job in jobs if job['status'] == 'running']
+        return {
+            'running': len(running),
+            'running_items_per_second': round(sum(job['items_per_second'] for job in running), 1),
+            'recent': len(jobs) - len(running)
+        }
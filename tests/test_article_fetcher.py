@@ -0,0 +1,188 @@
+"""
+Article fetcher tests against a local http.server stand-in
+"""
+
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import article_fetcher
+from article_fetcher import ArticleFetcher, ArticleCache, FetchError, check_url_address, is_public_address
+
+ARTICLE_HTML = (
+    "<html><head><title>Council approves new budget</title></head><body><article>"
+    "<h1>Council approves new budget</h1>"
+    + "".join(
+        f"<p>The city council voted on Tuesday to approve the budget for the coming year, paragraph {i}, "
+        f"after a long debate about road repairs, school funding and public transport.</p>"
+        for i in range(12)
+    )
+    + "</article></body></html>"
+).encode('utf-8')
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.hits.append((self.path, self.headers.get('If-None-Match')))
+
+        if self.path == '/article':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self._send(304, headers={'ETag': '"v1"'})
+            else:
+                self._send(200, ARTICLE_HTML, {'Content-Type': 'text/html; charset=utf-8', 'ETag': '"v1"'})
+        elif self.path == '/large':
+            self._send(200, b'x' * 4096, {'Content-Type': 'text/html'})
+        elif self.path == '/large-undeclared':
+            # No Content-Length: the limit has to be enforced while reading
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.write(b'x' * 4096)
+            self.close_connection = True
+        elif self.path == '/trickle':
+            # A byte at a time, each well within the read timeout
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', '1000')
+            self.end_headers()
+            try:
+                for _ in range(1000):
+                    self.wfile.write(b'x')
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+        elif self.path == '/redirect':
+            self._send(302, headers={'Location': f"http://127.0.0.1:{self.server.server_port}/article"})
+        elif self.path == '/redirect-loop':
+            self._send(302, headers={'Location': '/redirect-loop'})
+        else:
+            self._send(404)
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    httpd.hits = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+def url_for(server, path, host='127.0.0.1'):
+    return f"http://{host}:{server.server_port}{path}"
+
+def test_fetch_extracts_article(server):
+    fetcher = ArticleFetcher(retries=0, allow_private_addresses=True)
+    article = fetcher.fetch(url_for(server, '/article'))
+    assert 'city council' in article['text']
+    assert article['etag'] == '"v1"'
+    assert article['from_cache'] is False
+
+def test_etag_revalidation(server, tmp_path):
+    cache = ArticleCache(str(tmp_path), ttl=0)
+    fetcher = ArticleFetcher(cache=cache, retries=0, allow_private_addresses=True)
+
+    first = fetcher.fetch(url_for(server, '/article'))
+    second = fetcher.fetch(url_for(server, '/article'))
+
+    assert first['from_cache'] is False
+    assert second['from_cache'] is True
+    assert second['text'] == first['text']
+    assert [etag for _, etag in server.hits] == [None, '"v1"']
+    assert cache.stats()['revalidated'] == 1
+
+def test_fresh_cache_hit_skips_request(server, tmp_path):
+    fetcher = ArticleFetcher(cache=ArticleCache(str(tmp_path)), retries=0, allow_private_addresses=True)
+    fetcher.fetch(url_for(server, '/article'))
+    assert fetcher.fetch(url_for(server, '/article'))['from_cache'] is True
+    assert len(server.hits) == 1
+
+@pytest.mark.parametrize('path', ['/large', '/large-undeclared'])
+def test_size_limit(server, path):
+    fetcher = ArticleFetcher(max_bytes=1024, retries=0, allow_private_addresses=True)
+    with pytest.raises(FetchError) as excinfo:
+        fetcher.fetch(url_for(server, path))
+    assert excinfo.value.status == 422
+
+def test_total_time_limit(server):
+    fetcher = ArticleFetcher(timeout=0.5, retries=0, allow_private_addresses=True)
+    start = time.monotonic()
+    with pytest.raises(FetchError) as excinfo:
+        fetcher.fetch(url_for(server, '/trickle'))
+    assert excinfo.value.status == 504
+    assert time.monotonic() - start < 2
+
+def test_redirect_loop_is_cut_off(server):
+    fetcher = ArticleFetcher(retries=0, allow_private_addresses=True)
+    with pytest.raises(FetchError, match='Too many redirects'):
+        fetcher.fetch(url_for(server, '/redirect-loop'))
+    assert len(server.hits) == article_fetcher.MAX_REDIRECTS + 1
+
+@pytest.mark.parametrize('address', [
+    '127.0.0.1', '10.1.2.3', '172.16.0.1', '192.168.1.1', '169.254.169.254', '100.64.0.1', '0.0.0.0',
+    '224.0.0.1', '240.0.0.1', '::1', '::', 'fe80::1', 'fc00::1', 'ff02::1', '::ffff:127.0.0.1',
+    '::ffff:169.254.169.254'
+])
+def test_non_public_addresses_are_refused(address):
+    assert not is_public_address(address)
+
+@pytest.mark.parametrize('address', ['93.184.216.34', '8.8.8.8', '2606:4700:4700::1111'])
+def test_public_addresses_are_allowed(address):
+    assert is_public_address(address)
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/', 'http://localhost:8080/admin', 'http://[::1]/', 'http://[::ffff:127.0.0.1]/',
+    'http://169.254.169.254/latest/meta-data/', 'http://0.0.0.0/', 'http://2130706433/'
+])
+def test_check_url_address_refuses_internal_hosts(url):
+    with pytest.raises(FetchError) as excinfo:
+        check_url_address(url)
+    assert excinfo.value.status == 400
+
+def test_local_server_is_refused_by_default(server):
+    with pytest.raises(FetchError) as excinfo:
+        ArticleFetcher(retries=0).fetch(url_for(server, '/article'))
+    assert excinfo.value.status == 400
+    assert server.hits == []
+
+def test_every_redirect_hop_is_checked(server, monkeypatch):
+    checked = []
+
+    def check_url_address(url):
+        # Stand in for DNS: "localhost" plays a public host, 127.0.0.1 an internal one
+        checked.append(url)
+        if '127.0.0.1' in url:
+            raise FetchError('URL points to a private or reserved address', 400)
+
+    monkeypatch.setattr(article_fetcher, 'check_url_address', check_url_address)
+    monkeypatch.setattr(ArticleFetcher, '_check_peer', lambda self, response: None)
+
+    with pytest.raises(FetchError) as excinfo:
+        ArticleFetcher(retries=0).fetch(url_for(server, '/redirect', host='localhost'))
+    assert excinfo.value.status == 400
+    assert checked == [url_for(server, '/redirect', host='localhost'), url_for(server, '/article')]
+    assert [path for path, _ in server.hits] == ['/redirect']
+
+def test_fetch_many_applies_the_address_filter(server):
+    results = [result for completed in ArticleFetcher(retries=0).fetch_many([url_for(server, '/article')])
+               for result in completed]
+    assert len(results) == 1
+    index, article, error = results[0]
+    assert article is None and error.status == 400
+    assert server.hits == []
@@ -0,0 +1,32 @@
+"""
+Bulk scoring output tests
+"""
+
+import json
+
+import pandas as pd
+
+from bulk_score import ChunkWriter
+
+def test_jsonl_chunks_have_no_blank_lines(tmp_path):
+    path = tmp_path / 'scored.jsonl'
+    writer = ChunkWriter(str(path), 'jsonl')
+    writer.write(pd.DataFrame({'news': ['first', 'second'], 'prediction': ['REAL', 'FAKE']}))
+    writer.write(pd.DataFrame({'news': ['third'], 'prediction': ['REAL']}))
+    writer.write(pd.DataFrame({'news': [], 'prediction': []}))
+    writer.close()
+
+    text = path.read_text(encoding='utf-8')
+    lines = text.split('\n')
+    assert lines[-1] == ''
+    assert '' not in lines[:-1]
+    assert [json.loads(line)['news'] for line in lines[:-1]] == ['first', 'second', 'third']
+
+def test_jsonl_output_reads_back_with_pandas(tmp_path):
+    path = tmp_path / 'scored.jsonl'
+    writer = ChunkWriter(str(path), 'jsonl')
+    for start in range(0, 6, 2):
+        writer.write(pd.DataFrame({'id': [start, start + 1]}))
+    writer.close()
+
+    assert pd.read_json(path, lines=True)['id'].tolist() == list(range(6))
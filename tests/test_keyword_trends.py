@@ -0,0 +1,74 @@
+"""
+Keyword trend migration and flush tests on a throwaway SQLite database
+"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import keyword_trends
+from keyword_trends import KeywordTrendAggregator, migrate_keyword_trends, upsert_keyword_counts
+from models import db, KeywordTrend
+
+# keyword_trends as created before the unique key existed
+LEGACY_TABLE = (
+    'CREATE TABLE keyword_trends (id INTEGER PRIMARY KEY, keyword VARCHAR(255) NOT NULL, '
+    'category VARCHAR(10) NOT NULL, frequency INTEGER, first_seen DATETIME, last_seen DATETIME)'
+)
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'trends.db'}"
+    db.init_app(app)
+    with app.app_context():
+        yield app
+
+def test_migration_merges_duplicates_and_adds_unique_key(app):
+    db.session.execute(db.text(LEGACY_TABLE))
+    for frequency, day in [(2, 3), (5, 1), (1, 7)]:
+        db.session.execute(
+            db.text('INSERT INTO keyword_trends (keyword, category, frequency, first_seen, last_seen) '
+                    'VALUES (:keyword, :category, :frequency, :seen, :seen)'),
+            {'keyword': 'election', 'category': 'fake', 'frequency': frequency, 'seen': datetime(2024, 1, day)}
+        )
+    db.session.add(KeywordTrend(keyword='election', category='real', frequency=4))
+    db.session.commit()
+
+    assert migrate_keyword_trends() == 2
+    assert migrate_keyword_trends() is None
+
+    trend = KeywordTrend.query.filter_by(keyword='election', category='fake').one()
+    assert trend.frequency == 8
+    assert trend.first_seen == datetime(2024, 1, 1)
+    assert trend.last_seen == datetime(2024, 1, 7)
+
+    # The bulk upsert can now use the key as its conflict target
+    upsert_keyword_counts({('election', 'fake'): 3, ('budget', 'real'): 1})
+    db.session.commit()
+    assert KeywordTrend.query.filter_by(keyword='election', category='fake').one().frequency == 11
+    assert KeywordTrend.query.count() == 3
+
+def test_new_tables_need_no_migration(app):
+    db.create_all()
+    assert migrate_keyword_trends() is None
+
+def test_failed_flushes_keep_a_bounded_backlog(app, monkeypatch):
+    def failing_upsert(counts, now=None):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(keyword_trends, 'upsert_keyword_counts', failing_upsert)
+    aggregator = KeywordTrendAggregator(app, flush_interval=3600, max_pending=15)
+
+    aggregator.add('alpha bravo charlie delta echoes foxtrot', 'fake')
+    aggregator.flush()
+    assert aggregator.metrics()['pending_keywords'] == 6
+
+    # 16 pending keywords would exceed the limit, so the whole flush is dropped
+    aggregator.add('golf hotel india juliet kilo lima mike november oscar papa', 'real')
+    aggregator.flush()
+    metrics = aggregator.metrics()
+    assert metrics['pending_keywords'] == 0
+    assert metrics['dropped_keywords'] == 16
+    assert metrics['flush_errors'] == 2
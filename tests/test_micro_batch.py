@@ -0,0 +1,131 @@
+"""
+Micro-batcher tests with a stand-in predict_batch
+"""
+
+import time
+import threading
+
+import pytest
+
+from micro_batch import MicroBatcher
+
+class FakeModel:
+    """Records every batch and scores each text as (text, len(text))"""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [(text, len(text)) for text in texts]
+
+def predict_concurrently(batcher, texts):
+    results, errors = {}, {}
+    barrier = threading.Barrier(len(texts))
+
+    def worker(text):
+        barrier.wait()
+        try:
+            results[text] = batcher.predict(text)
+        except Exception as e:
+            errors[text] = e
+
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+def test_concurrent_requests_are_coalesced():
+    model = FakeModel(delay=0.05)
+    batcher = MicroBatcher(model, max_batch=32, max_latency=0.2)
+    texts = [f"text {i}" for i in range(8)]
+
+    results, errors = predict_concurrently(batcher, texts)
+
+    assert errors == {}
+    assert results == {text: (text, len(text)) for text in texts}
+    assert len(model.batches) < len(texts)
+    assert batcher.stats()['items'] == len(texts)
+
+def test_batches_are_capped_at_max_batch():
+    model = FakeModel(delay=0.05)
+    batcher = MicroBatcher(model, max_batch=3, max_latency=0.2)
+
+    results, errors = predict_concurrently(batcher, [f"text {i}" for i in range(10)])
+
+    assert errors == {}
+    assert len(results) == 10
+    assert max(len(batch) for batch in model.batches) <= 3
+    assert sum(len(batch) for batch in model.batches) == 10
+
+def test_batch_error_reaches_every_waiter():
+    model = FakeModel(delay=0.05, error=ValueError('model exploded'))
+    batcher = MicroBatcher(model, max_batch=32, max_latency=0.2)
+    texts = [f"text {i}" for i in range(5)]
+
+    results, errors = predict_concurrently(batcher, texts)
+
+    assert results == {}
+    assert set(errors) == set(texts)
+    assert all(isinstance(error, ValueError) for error in errors.values())
+    assert batcher.stats()['errors'] >= 1
+
+def test_disabled_batcher_calls_the_model_directly():
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_batch=32, max_latency=0)
+
+    result, model_time = batcher.predict_timed('hello')
+
+    assert result == ('hello', 5)
+    assert model_time >= 0
+    assert model.batches == [['hello']]
+    assert batcher._thread is None
+
+def test_model_time_excludes_the_queue_wait():
+    model = FakeModel(delay=0.2)
+    batcher = MicroBatcher(model, max_batch=32, max_latency=0.001)
+    first = threading.Thread(target=predict_concurrently, args=(batcher, ['first']))
+    first.start()
+    time.sleep(0.05)
+
+    # Waits for the first batch to finish before its own is scored
+    start = time.perf_counter()
+    result, model_time = batcher.predict_timed('second')
+    elapsed = time.perf_counter() - start
+    first.join(5)
+
+    assert result == ('second', 6)
+    assert elapsed >= 0.3
+    assert model_time < 0.3
+
+def test_timed_out_request_is_not_scored():
+    release = threading.Event()
+    model = FakeModel()
+
+    def blocking(texts):
+        release.wait(5)
+        return model(texts)
+
+    batcher = MicroBatcher(blocking, max_batch=1000, max_latency=0.001, timeout=0.2)
+    # The first request holds the batcher thread until released
+    first = threading.Thread(target=predict_concurrently, args=(batcher, ['first']))
+    first.start()
+    time.sleep(0.05)
+
+    # Queued behind the blocked batch, then given up on
+    with pytest.raises(TimeoutError):
+        batcher.predict('abandoned')
+
+    release.set()
+    first.join(5)
+    assert batcher.predict('after') == ('after', 5)
+    assert all('abandoned' not in batch for batch in model.batches)
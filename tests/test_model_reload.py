@@ -0,0 +1,127 @@
+"""
+Hot reload and shadow scoring tests with a stand-in model loader
+"""
+
+import os
+import threading
+
+import pytest
+
+from model_reload import ModelManager, ServingModel
+from model_store import artifact_path, set_latest, set_shadow, clear_shadow
+
+class FakeDetector:
+    def __init__(self, label):
+        self.label = label
+
+    def predict(self, text):
+        return self.label, 0.9
+
+    def predict_batch(self, texts):
+        return [self.predict(text) for text in texts]
+
+class FakeLoader:
+    """Loads artifacts by version; a version can be made to block or fail"""
+
+    def __init__(self):
+        self.gates = {}
+        self.failing = set()
+        self.loads = []
+
+    def __call__(self, path):
+        version = os.path.basename(path)[len('fake-news-detector-'):-len('.joblib')]
+        self.loads.append(version)
+        if version in self.gates:
+            self.gates[version].wait(5)
+        if version in self.failing:
+            raise ValueError(f"corrupt artifact {version}")
+        return ServingModel(FakeDetector(version), {'version': version}, path)
+
+@pytest.fixture
+def store(tmp_path):
+    for version in ('v1', 'v2', 'v3'):
+        open(artifact_path(version, str(tmp_path)), 'w').close()
+    return str(tmp_path)
+
+@pytest.fixture
+def manager(store):
+    loader = FakeLoader()
+    activated = []
+    manager = ModelManager(loader, activated.append, artifact_dir=store, watch_interval=0)
+    manager.loader_stub, manager.activated = loader, activated
+    set_latest(artifact_path('v1', store), store)
+    manager.reload(artifact_path('v1', store), wait=True)
+    return manager
+
+def test_old_model_serves_until_the_new_one_is_loaded(manager, store):
+    gate = manager.loader_stub.gates['v2'] = threading.Event()
+
+    assert manager.reload(artifact_path('v2', store))
+    assert manager.reloading
+    assert manager.current.version == 'v1'
+    assert manager.current.detector.predict('text') == ('v1', 0.9)
+
+    gate.set()
+    manager._reload_thread.join(5)
+    assert manager.current.version == 'v2'
+    assert [serving.version for serving in manager.activated] == ['v1', 'v2']
+    assert manager.last_reload['previous_version'] == 'v1'
+
+def test_second_load_is_refused_while_one_runs(manager, store):
+    gate = manager.loader_stub.gates['v2'] = threading.Event()
+    manager.reload(artifact_path('v2', store))
+
+    assert not manager.reload(artifact_path('v3', store))
+    assert not manager.start_shadow(artifact_path('v3', store), 0.5)
+
+    gate.set()
+    manager._reload_thread.join(5)
+
+def test_failed_reload_keeps_the_current_model(manager, store):
+    manager.loader_stub.failing.add('v2')
+    manager.reload(artifact_path('v2', store), wait=True)
+
+    assert manager.current.version == 'v1'
+    assert manager.last_reload['status'] == 'failed'
+
+def test_failed_latest_is_not_retried_until_the_pointer_moves(manager, store):
+    manager.loader_stub.failing.add('v2')
+    set_latest(artifact_path('v2', store), store)
+
+    for _ in range(3):
+        manager.check_pointers()
+        manager._reload_thread.join(5)
+    assert manager.loader_stub.loads.count('v2') == 1
+    assert manager.current.version == 'v1'
+
+    set_latest(artifact_path('v3', store), store)
+    manager.check_pointers()
+    manager._reload_thread.join(5)
+    assert manager.current.version == 'v3'
+
+def test_shadow_promote(manager, store):
+    manager.start_shadow(artifact_path('v2', store), 1.0, wait=True)
+    assert manager.shadow.candidate.version == 'v2'
+
+    promoted = manager.promote_shadow()
+
+    assert promoted.version == 'v2'
+    assert manager.current is promoted
+    assert manager.shadow is None
+    assert manager.last_reload['status'] == 'promoted'
+    assert 'v2' in manager.shadow_history
+
+def test_shadow_follows_the_pointer_and_stops(manager, store):
+    set_shadow(artifact_path('v2', store), 0.25, store)
+    manager.check_pointers()
+    # Wait for the background shadow load to finish
+    manager._reload_lock.acquire(timeout=5)
+    manager._reload_lock.release()
+    assert manager.shadow.candidate.version == 'v2'
+    assert manager.shadow.sample_rate == 0.25
+
+    clear_shadow(store)
+    manager.check_pointers()
+    assert manager.shadow is None
+    assert manager.current.version == 'v1'
+    assert manager.status()['shadow_history']['v2']['version'] == 'v2'
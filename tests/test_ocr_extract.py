@@ -0,0 +1,35 @@
+"""
+Tiled OCR tests; Tesseract itself is replaced by a slow stand-in
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+import ocr_extract
+from ocr_extract import extract_text_tiled, split_tiles
+
+def test_timeout_cancels_pending_tiles(monkeypatch):
+    started = []
+    release = threading.Event()
+
+    def slow_tile(tile, config):
+        started.append(tile.size)
+        release.wait(5)
+        return 'text'
+
+    monkeypatch.setattr(ocr_extract, '_ocr_tile', slow_tile)
+    image = Image.new('L', (200, 12000), 255)
+    assert len(split_tiles(image)) > 4
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(TimeoutError):
+            extract_text_tiled(image, preprocessor=None, executor=executor, timeout=0.2)
+        release.set()
+        time.sleep(0.1)
+
+    # Only the strip already running when the timeout hit was OCRed
+    assert len(started) == 1
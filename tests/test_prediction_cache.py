@@ -0,0 +1,37 @@
+"""
+Prediction cache tests
+"""
+
+from prediction_cache import PredictionCache, SQLiteCacheBackend
+
+def table_size(backend):
+    return backend._connection().execute('SELECT COUNT(*) FROM prediction_cache').fetchone()[0]
+
+def test_shared_table_stays_within_max_entries(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'), max_entries=50, prune_every=10)
+    for i in range(500):
+        backend.set(f"v1:{i}", ['REAL', 0.9], ttl=3600)
+        assert table_size(backend) <= 50
+
+    # The most recent writes are kept
+    assert backend.get('v1:499') == ['REAL', 0.9]
+    assert backend.get('v1:0') is None
+
+def test_writes_prune_expired_rows(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'), max_entries=1000, prune_every=5)
+    for i in range(4):
+        backend.set(f"v1:old{i}", ['FAKE', 0.8], ttl=-1)
+    assert table_size(backend) == 4
+
+    backend.set('v1:new', ['REAL', 0.7], ttl=3600)
+    assert table_size(backend) == 1
+
+def test_shared_entries_are_visible_to_other_caches(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    writer = PredictionCache(backend=SQLiteCacheBackend(path))
+    reader = PredictionCache(backend=SQLiteCacheBackend(path))
+
+    key = PredictionCache.make_key('Some news text', 'v1')
+    writer.set(key, ('REAL', 0.91))
+    assert reader.get(key) == ('REAL', 0.91)
+    assert reader.stats()['shared_hits'] == 1
@@ -0,0 +1,91 @@
+"""
+Statistics counter tests on a throwaway SQLite database
+"""
+
+from datetime import date
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine
+
+from models import db, SystemStat
+from stats_counters import CounterAggregator, counter_key, increment_counters, rebuild_counters
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'stats.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+
+def stored(key):
+    return SystemStat.query.filter_by(stat_key=key).one().stat_value
+
+def test_day_rollups_start_from_zero_and_accumulate(app):
+    day = counter_key('submissions', date(2024, 5, 1))
+    increment_counters({day: {'total': 1, 'FAKE': 1}})
+    db.session.commit()
+    increment_counters({day: {'total': 2, 'REAL': 2}})
+    db.session.commit()
+
+    assert stored(day) == {'total': 3, 'FAKE': 1, 'REAL': 2}
+
+def test_rollup_created_by_another_writer_is_updated(app, tmp_path):
+    day = counter_key('api_requests', date(2024, 5, 2))
+    # Another worker created the day's row after this one last looked
+    other = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    with other.begin() as conn:
+        conn.execute(SystemStat.__table__.insert().values(stat_key=day, stat_value={'count': 4}))
+    other.dispose()
+
+    increment_counters({day: {'count': 1}})
+    db.session.commit()
+    assert stored(day) == {'count': 5}
+    assert SystemStat.query.filter_by(stat_key=day).count() == 1
+
+def test_missing_running_total_is_left_for_rebuild(app):
+    increment_counters({counter_key('submissions'): {'total': 1}})
+    db.session.commit()
+    assert SystemStat.query.count() == 0
+
+def test_aggregator_sums_deltas_into_one_flush(app):
+    total = counter_key('submissions')
+    db.session.add(SystemStat(stat_key=total, stat_value={'total': 10}))
+    db.session.commit()
+
+    aggregator = CounterAggregator(app, flush_interval=60)
+    aggregator.add({total: {'total': 1, 'FAKE': 1}})
+    aggregator.add({total: {'total': 1, 'REAL': 1}})
+    assert aggregator.metrics()['pending_keys'] == 1
+
+    aggregator.flush()
+    db.session.expire_all()
+    assert stored(total) == {'total': 12, 'FAKE': 1, 'REAL': 1}
+    assert aggregator.metrics()['flushes'] == 1
+
+def test_aggregator_keeps_deltas_after_a_failed_flush(app, monkeypatch):
+    import stats_counters
+
+    def failing(deltas):
+        raise RuntimeError('database unavailable')
+
+    aggregator = CounterAggregator(app, flush_interval=60)
+    aggregator.add({counter_key('submissions', date(2024, 5, 3)): {'total': 2}})
+    monkeypatch.setattr(stats_counters, 'increment_counters', failing)
+    aggregator.flush()
+
+    metrics = aggregator.metrics()
+    assert metrics['flush_errors'] == 1
+    assert metrics['pending_keys'] == 1
+
+def test_rebuild_overwrites_running_totals(app):
+    db.session.add(SystemStat(stat_key=counter_key('submissions'), stat_value={'total': 99}))
+    db.session.commit()
+
+    values = rebuild_counters()
+    assert values[counter_key('submissions')] == {'total': 0}
+    assert stored(counter_key('submissions')) == {'total': 0}
+    assert stored(counter_key('users')) == {'total': 0}
+    assert SystemStat.query.filter_by(stat_key=counter_key('submissions')).count() == 1
@@ -0,0 +1,41 @@
+"""
+Fast preprocessing tests against the NLTK reference pipeline
+"""
+
+import pytest
+
+nltk = pytest.importorskip('nltk')
+
+from text_preprocessing import (
+    GOLDEN_CORPUS, TextPreprocessor, ensure_nltk_data, export_resources, legacy_preprocess
+)
+
+def require_nltk_data(*names):
+    missing = [name for name in ensure_nltk_data() if name in names]
+    if missing:
+        pytest.skip(f"NLTK data not installed: {', '.join(missing)}")
+
+@pytest.mark.parametrize('text', GOLDEN_CORPUS)
+def test_golden_corpus_matches_nltk(text):
+    require_nltk_data('stopwords', 'punkt_tab')
+    from nltk.corpus import stopwords
+
+    stop_words = set(stopwords.words('english'))
+    assert TextPreprocessor(stop_words)(text) == legacy_preprocess(text, stop_words)
+
+def test_snapshot_without_punkt_is_refused(tmp_path, monkeypatch):
+    require_nltk_data('stopwords')
+    from nltk.tokenize import punkt
+
+    def missing(*args, **kwargs):
+        raise LookupError('punkt_tab not found')
+
+    monkeypatch.setattr(punkt, 'PunktTokenizer', missing)
+    path = tmp_path / 'nltk_resources.json'
+
+    with pytest.raises(LookupError):
+        export_resources(str(path))
+    assert not path.exists()
+
+    export_resources(str(path), allow_degraded=True)
+    assert path.exists()
@@ -0,0 +1,103 @@
+"""
+Write-behind queue tests with an in-memory handler on a throwaway SQLite app
+"""
+
+import time
+import threading
+
+import pytest
+from flask import Flask
+
+from models import db
+from write_behind import WriteBehindQueue
+
+class Recorder:
+    """Batch handler that records payloads; 'hold' blocks until released, 'bad' fails the batch"""
+
+    def __init__(self):
+        self.batches = []
+        self.holding = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, payloads):
+        if 'hold' in payloads:
+            self.holding.set()
+            self.release.wait(5)
+        if 'bad' in payloads:
+            raise ValueError('constraint violated')
+        self.batches.append(list(payloads))
+
+    @property
+    def written(self):
+        return [payload for batch in self.batches for payload in batch]
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'write_behind.db'}"
+    db.init_app(app)
+    return app
+
+def make_queue(app, recorder, **kwargs):
+    options = dict(max_size=100, batch_size=100, flush_interval=10, enqueue_timeout=0.05)
+    options.update(kwargs)
+    write_queue = WriteBehindQueue(app, **options)
+    write_queue.register('event', recorder)
+    return write_queue
+
+def hold_worker(write_queue, recorder):
+    """Park the flusher thread inside the handler so later events stay queued"""
+    write_queue.enqueue('event', 'hold')
+    assert recorder.holding.wait(5)
+
+def wait_for_depth(write_queue, depth):
+    deadline = time.monotonic() + 5
+    while write_queue._queue.qsize() < depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_full_queue_writes_on_the_caller_thread(app):
+    recorder = Recorder()
+    write_queue = make_queue(app, recorder, max_size=1)
+    hold_worker(write_queue, recorder)
+
+    assert write_queue.enqueue('event', 'queued') is True
+    assert write_queue.enqueue('event', 'overflow') is False
+    assert recorder.written == ['overflow']
+    assert write_queue.metrics()['caller_writes'] == 1
+
+    recorder.release.set()
+    write_queue.shutdown()
+    assert sorted(recorder.written) == ['hold', 'overflow', 'queued']
+
+def test_shutdown_drains_everything_queued_before_stop(app):
+    recorder = Recorder()
+    write_queue = make_queue(app, recorder, batch_size=2)
+    hold_worker(write_queue, recorder)
+    for i in range(5):
+        write_queue.enqueue('event', i)
+
+    stopper = threading.Thread(target=write_queue.shutdown)
+    stopper.start()
+    wait_for_depth(write_queue, 6)  # five events and the stop marker
+    recorder.release.set()
+    stopper.join(5)
+
+    assert not write_queue._thread.is_alive()
+    assert recorder.written == ['hold', 0, 1, 2, 3, 4]
+    assert recorder.batches[1:] == [[0, 1], [2, 3], [4]]
+    assert write_queue.metrics()['queue_depth'] == 0
+
+def test_failed_batch_is_retried_row_by_row(app):
+    recorder = Recorder()
+    write_queue = make_queue(app, recorder)
+    hold_worker(write_queue, recorder)
+    for payload in ('first', 'bad', 'second'):
+        write_queue.enqueue('event', payload)
+
+    recorder.release.set()
+    write_queue.shutdown()
+
+    assert recorder.batches == [['hold'], ['first'], ['second']]
+    metrics = write_queue.metrics()
+    assert metrics['flush_errors'] == 1
+    assert metrics['flushed'] == 3
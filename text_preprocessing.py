@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Fast Text Preprocessing
+AI-Powered Fake News Detection System
+
+Precompiled replacement for the original regex + nltk.word_tokenize
+preprocessing. Normalized text only contains lowercase ASCII letters,
+digits, spaces and . , ! ? ; : so only the handful of Punkt sentence
+splitting and Treebank tokenizer rules that can fire on that alphabet are
+applied, and they are applied to the whole document in one pass per rule
+instead of once per sentence.
+
+The English stop words and Punkt parameters are read from a JSON snapshot
+written by `python bootstrap.py init`, so serving never imports NLTK (which
+pulls in sklearn, scipy.stats and pandas). Without a snapshot they are read
+from the NLTK data directly.
+
+Usage:
+    python text_preprocessing.py verify [FILE ...]
+    python text_preprocessing.py benchmark [--size CHARS] [--repeat N]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from functools import lru_cache
+
+# NLTK data used by preprocessing: name for nltk.download -> path for nltk.data.find
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords'
+}
+RESOURCE_SNAPSHOT_PATH = os.environ.get(
+    'NLTK_RESOURCE_SNAPSHOT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'nltk_resources.json')
+)
+
+# Normalization patterns, identical to the original preprocess_text
+URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+HTML_TAG_RE = re.compile(r'<.*?>')
+DISALLOWED_CHARS_RE = re.compile(r'[^a-zA-Z0-9\s\.\,\!\?\;\:]')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Punkt sentence boundary detection (nltk.tokenize.punkt, English)
+SENT_END_CHARS = ('.', '?', '!')
+_NON_WORD = r"(?:[)\";}\]\*:@\'\({\[!?])"
+_WORD_START = r"[^\(\"\`{\[:;&\#\*@\)}\]\-,]"
+_MULTI_CHAR = r"(?:\-{2,}|\.{2,}|(?:\.\s){2,}\.)"
+PERIOD_CONTEXT_RE = re.compile(
+    r"[\.\?!](?=(?P<after_tok>" + _NON_WORD + r"|\s+(?P<next_tok>\S+)))"
+)
+PUNKT_WORD_RE = re.compile(
+    r"(" + _MULTI_CHAR +
+    r"|(?=" + _WORD_START + r")\S+?(?=\s|$|" + _NON_WORD + r"|" + _MULTI_CHAR +
+    r"|,(?=$|\s|" + _NON_WORD + r"|" + _MULTI_CHAR + r"))|\S)"
+)
+_NUMERIC_RE = re.compile(r"^-?[\.,]?\d[\d,\.-]*\.?$")
+_INITIAL_RE = re.compile(r"[^\W\d]\.$")
+_ELLIPSIS_RE = re.compile(r"\.\.+$")
+
+_ORTHO_BEG_UC = 1 << 1
+_ORTHO_MID_UC = 1 << 2
+_ORTHO_UNK_UC = 1 << 3
+_ORTHO_BEG_LC = 1 << 4
+_ORTHO_MID_LC = 1 << 5
+_ORTHO_UNK_LC = 1 << 6
+_ORTHO_UC = _ORTHO_BEG_UC | _ORTHO_MID_UC | _ORTHO_UNK_UC
+_ORTHO_LC = _ORTHO_BEG_LC | _ORTHO_MID_LC | _ORTHO_UNK_LC
+
+# Treebank word tokenizer rules that can match the normalized alphabet.
+# Sentences are joined with newlines so "$" marks every sentence end.
+TREEBANK_RULES = [
+    (re.compile(r'([^\.])(\.)([\]\)}>"\'»”’ ]*)\s*$', re.M), r"\1 \2 \3 "),
+    (re.compile(r"([:,])([^\d])"), r" \1 \2"),
+    (re.compile(r"([:,])$", re.M), r" \1 "),
+    (re.compile(r"\.{2,}"), r" \g<0> "),
+    (re.compile(r"[;@#$%&]"), r" \g<0> "),
+    (re.compile(r'([^\.])(\.)([\]\)}>"\']*)\s*$', re.M), r"\1 \2\3 "),
+    (re.compile(r"[?!]"), r" \g<0> "),
+    (re.compile(r"(?i)\b(can)(?#X)(not)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(gim)(?#X)(me)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(gon)(?#X)(na)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(got)(?#X)(ta)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(lem)(?#X)(me)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(wan)(?#X)(na)(?=\s)"), r" \1 \2 "),
+]
+
+def ensure_nltk_data(download=False):
+    """Names of the NLTK resources that are missing, downloading them first when asked"""
+    import nltk
+
+    missing = []
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            if not (download and nltk.download(name, quiet=True)):
+                missing.append(name)
+    return missing
+
+def resources_from_nltk(allow_degraded=False):
+    """
+    English stop words and Punkt parameters, read from the NLTK data.
+    Raises LookupError when the Punkt data is missing, unless
+    allow_degraded is set; the Punkt tables are then empty and sentence
+    splitting no longer matches NLTK.
+    """
+    from nltk.corpus import stopwords
+
+    resources = {'stop_words': sorted(stopwords.words('english'))}
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+        params = PunktTokenizer('english')._params
+    except (ImportError, LookupError) as e:
+        if not allow_degraded:
+            raise LookupError("NLTK punkt_tab data is not installed; run 'python bootstrap.py init'") from e
+        resources.update(abbrev_types=[], collocations=[], ortho_context={})
+        return resources
+
+    resources.update(
+        abbrev_types=sorted(params.abbrev_types),
+        collocations=sorted(list(pair) for pair in params.collocations),
+        ortho_context=dict(params.ortho_context)
+    )
+    return resources
+
+def export_resources(path=None, allow_degraded=False):
+    """
+    Write the NLTK resources preprocessing needs to a JSON snapshot.
+    Refuses to write one without the Punkt parameters unless
+    allow_degraded is set.
+    """
+    path = path or RESOURCE_SNAPSHOT_PATH
+    resources = resources_from_nltk(allow_degraded=allow_degraded)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(resources, f)
+    os.replace(tmp_path, path)
+    return path
+
+@lru_cache(maxsize=1)
+def load_resources():
+    """The bootstrap snapshot if there is one, else the NLTK data"""
+    try:
+        with open(RESOURCE_SNAPSHOT_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+
+    try:
+        # Without a snapshot, a missing Punkt model only costs the learned abbreviations
+        return resources_from_nltk(allow_degraded=True)
+    except LookupError as e:
+        raise LookupError("NLTK stopwords are not installed; run 'python bootstrap.py init'") from e
+
+def english_stop_words():
+    return frozenset(load_resources()['stop_words'])
+
+@lru_cache(maxsize=1)
+def punkt_parameters():
+    """
+    Learned English Punkt parameters (abbreviations, collocations and
+    orthographic context). Falls back to empty tables without NLTK data.
+    """
+    try:
+        resources = load_resources()
+    except LookupError:
+        return frozenset(), frozenset(), {}
+    return (
+        frozenset(resources['abbrev_types']),
+        frozenset(tuple(pair) for pair in resources['collocations']),
+        resources['ortho_context']
+    )
+
+def normalize(text):
+    """Lowercase and strip URLs, HTML tags and special characters"""
+    text = text.lower()
+    text = URL_RE.sub('', text)
+    text = HTML_TAG_RE.sub('', text)
+    text = DISALLOWED_CHARS_RE.sub('', text)
+    return WHITESPACE_RE.sub(' ', text)
+
+def _token_type(tok):
+    return '##number##' if _NUMERIC_RE.match(tok) else tok.lower()
+
+def _type_no_period(tok):
+    typ = _token_type(tok)
+    return typ[:-1] if len(typ) > 1 and typ[-1] == '.' else typ
+
+def _first_pass(tok, abbrev_types):
+    """Punkt first-pass annotation: (sentbreak, abbr, ellipsis)"""
+    if tok in SENT_END_CHARS:
+        return True, False, False
+    if _ELLIPSIS_RE.match(tok):
+        return False, False, True
+    if tok.endswith('.') and not tok.endswith('..'):
+        stem = tok[:-1].lower()
+        if stem in abbrev_types or stem.split('-')[-1] in abbrev_types:
+            return False, True, False
+        return True, False, False
+    return False, False, False
+
+def _ortho_heuristic(tok, sentbreak, ortho_context):
+    """Punkt orthographic evidence that tok starts a sentence: True, False or 'unknown'"""
+    if tok in (';', ':', ',', '.', '!', '?'):
+        return False
+
+    context = ortho_context.get(_type_no_period(tok) if sentbreak else _token_type(tok), 0)
+    if tok[0].isupper() and (context & _ORTHO_LC) and not (context & _ORTHO_MID_UC):
+        return True
+    if tok[0].islower() and ((context & _ORTHO_UC) or not (context & _ORTHO_BEG_LC)):
+        return False
+    return 'unknown'
+
+def _contains_sentence_break(context):
+    """Punkt's text_contains_sentbreak for one candidate context"""
+    abbrev_types, collocations, ortho_context = punkt_parameters()
+    tokens = PUNKT_WORD_RE.findall(context)
+    annotations = [list(_first_pass(tok, abbrev_types)) for tok in tokens]
+
+    for i in range(len(tokens) - 1):
+        tok, next_tok = tokens[i], tokens[i + 1]
+        annotation = annotations[i]
+
+        # Second pass only reconsiders words ending in a period
+        if tok.endswith('.'):
+            typ = _type_no_period(tok)
+            next_sentbreak = annotations[i + 1][0]
+            next_typ = _type_no_period(next_tok) if next_sentbreak else _token_type(next_tok)
+            is_initial = bool(_INITIAL_RE.match(tok))
+
+            if (typ, next_typ) in collocations:
+                annotation[0], annotation[1] = False, True
+            elif (annotation[1] or annotation[2]) and not is_initial:
+                if _ortho_heuristic(next_tok, next_sentbreak, ortho_context) is True:
+                    annotation[0] = True
+            elif is_initial or typ == '##number##':
+                if _ortho_heuristic(next_tok, next_sentbreak, ortho_context) is False:
+                    annotation[0], annotation[1] = False, True
+
+        if annotation[0]:
+            return True
+
+    return False
+
+def split_sentences(text):
+    """Split normalized text into sentences the way nltk.sent_tokenize does"""
+    sentences = []
+    last_break = 0
+    previous_match = None
+    previous_start = previous_stop = 0
+
+    def emit(match, context):
+        nonlocal last_break
+        # "?" and "!" are always sentence breaks and always followed by a token
+        if match.group() != '.' or _contains_sentence_break(context):
+            sentences.append(text[last_break:match.end()])
+            last_break = match.start('next_tok') if match.group('next_tok') else match.end()
+
+    for match in PERIOD_CONTEXT_RE.finditer(text):
+        # The candidate's preceding word starts after the last space since the previous candidate
+        space_index = text.rfind(' ', previous_stop, match.start()) - previous_stop
+        word_start = space_index + previous_stop + 1 if space_index > 0 else previous_start
+
+        # Candidates inside the same word collapse into the later one
+        if previous_match and previous_stop <= word_start:
+            emit(previous_match, text[previous_start:previous_stop]
+                 + previous_match.group() + previous_match.group('after_tok'))
+
+        previous_match = match
+        previous_start, previous_stop = word_start, match.start()
+
+    if previous_match:
+        emit(previous_match, text[previous_start:previous_stop]
+             + previous_match.group() + previous_match.group('after_tok'))
+
+    sentences.append(text[last_break:len(text.rstrip())])
+    return [sentence for sentence in sentences if sentence]
+
+def tokenize(text):
+    """Tokenize normalized text into the same tokens as nltk.word_tokenize"""
+    text = '\n'.join(split_sentences(text)) + ' '
+    for pattern, replacement in TREEBANK_RULES:
+        text = pattern.sub(replacement, text)
+    return text.split()
+
+class TextPreprocessor:
+    """Normalize, tokenize and stopword-filter documents"""
+
+    def __init__(self, stop_words):
+        self.stop_words = frozenset(stop_words)
+
+    def __call__(self, text):
+        if not isinstance(text, str):
+            return ""
+
+        stop_words = self.stop_words
+        return ' '.join([
+            word for word in tokenize(normalize(text))
+            if len(word) > 2 and word not in stop_words
+        ])
+
+    def preprocess_many(self, texts):
+        """Bulk mode: preprocess a list of documents"""
+        return [self(text) for text in texts]
+
+def legacy_preprocess(text, stop_words):
+    """The original NLTK-based preprocessing, kept as the verification reference"""
+    from nltk.tokenize import word_tokenize
+
+    if not isinstance(text, str):
+        return ""
+
+    text = text.lower()
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'<.*?>', '', text)
+    text = re.sub(r'[^a-zA-Z0-9\s\.\,\!\?\;\:]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+
+    tokens = word_tokenize(text)
+    tokens = [word for word in tokens if word not in stop_words and len(word) > 2]
+
+    return ' '.join(tokens)
+
+# Edge cases for the sentence splitter and tokenizer rules
+GOLDEN_CORPUS = [
+    "The U.S. economy grew 3.5% in Q2. Officials said growth would slow.",
+    "Dr. Smith met Mr. Jones at 3:30 p.m. on Jan. 5, and they talked.",
+    "Wait... what?! Really!! No way.. seriously.",
+    "I cannot believe they're gonna do it, we gotta stop them. Lemme see, gimme that, wanna go?",
+    "Prices rose to 1,000,000 dollars, analysts said; others disagreed: no. Ratio 3:2 held.",
+    "<p>HTML <b>tags</b> are removed</p> and http://example.com/path?x=1&y=2 links too.",
+    "In 2019. sales fell. In 2020. they rose 12. percent. Item 3. was next.",
+    "Use e.g. this, i.e. that, etc. and so on. A. B. Smith wrote it.",
+    "Initials j. r. r. tolkien wrote books. x. y. z.",
+    "End of clause.; next clause: more text,, and more,,text. Then .5 percent.",
+    "Trailing punctuation at the very end,",
+    "Ellipsis at end...",
+    ".... leading periods. and lowercase starts. ok.",
+    "Mixed\ttabs\nand\r\nnewlines.   Multiple   spaces.\n\nNew paragraph here.",
+    "Unicode quotes “like these” and émojis 🚀 are stripped; café naïve résumé.",
+    "BREAKING!!! SHOCKING truth REVEALED??? Share before it's DELETED!",
+    "No.1 ranked team won 3-2. St. Louis and Ft. Worth joined. Vol. 2 is out.",
+    "Numbers: 1.2.3 version, 4.5.6. release, 7.. and 8... done",
+    "a.b.c. d.e. f.? g.! h.: i.; end",
+]
+
+def golden_corpus(paths=()):
+    """Built-in edge cases, the training samples and any extra documents given"""
+    from fake_news_detector import FakeNewsDetector
+
+    texts, _ = FakeNewsDetector().create_training_data()
+    corpus = list(GOLDEN_CORPUS) + texts + [' '.join(texts)]
+
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            corpus.extend(line for line in f.read().split('\n\n') if line.strip())
+
+    return corpus
+
+def verify(args):
+    """Compare the fast pipeline against the NLTK reference output"""
+    from nltk.corpus import stopwords
+
+    stop_words = set(stopwords.words('english'))
+    preprocessor = TextPreprocessor(stop_words)
+    corpus = golden_corpus(args.files)
+
+    mismatches = 0
+    for i, text in enumerate(corpus):
+        expected = legacy_preprocess(text, stop_words)
+        actual = preprocessor(text)
+        if actual != expected:
+            mismatches += 1
+            print(f"MISMATCH #{i}: {text[:80]!r}\n  expected: {expected}\n  actual:   {actual}")
+
+    print(f"{len(corpus) - mismatches}/{len(corpus)} documents match")
+    if mismatches:
+        sys.exit(1)
+
+def benchmark(args):
+    """Time the fast and NLTK pipelines on a large synthetic document"""
+    from nltk.corpus import stopwords
+
+    stop_words = set(stopwords.words('english'))
+    preprocessor = TextPreprocessor(stop_words)
+
+    seed = ' '.join(golden_corpus())
+    document = (seed * (args.size // len(seed) + 1))[:args.size]
+
+    def best_of(fn):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn(document)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    legacy_time = best_of(lambda text: legacy_preprocess(text, stop_words))
+    fast_time = best_of(preprocessor)
+
+    print(f"document size: {len(document)} chars")
+    print(f"nltk:    {legacy_time * 1000:.1f} ms")
+    print(f"fast:    {fast_time * 1000:.1f} ms")
+    print(f"speedup: {legacy_time / fast_time:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify and benchmark the fast text preprocessor')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    verify_parser = subparsers.add_parser('verify', help='Compare against the NLTK reference on the golden corpus')
+    verify_parser.add_argument('files', nargs='*', help='Extra documents (blank-line separated)')
+    verify_parser.set_defaults(func=verify)
+
+    benchmark_parser = subparsers.add_parser('benchmark', help='Time fast vs NLTK preprocessing')
+    benchmark_parser.add_argument('--size', type=int, default=50000, help='Document size in characters')
+    benchmark_parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    benchmark_parser.set_defaults(func=benchmark)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
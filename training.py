@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core Training
+AI-Powered Fake News Detection System
+
+Trains the detector on corpora larger than memory. Labeled records are
+streamed from CSV / JSON Lines / Parquet files or from reviewed submissions
+in the database, preprocessed and hashed into a fixed-size feature space on
+a process pool, and fed to SGDClassifier.partial_fit a chunk at a time, so
+memory stays flat regardless of corpus size. The result is saved as a
+versioned artifact in the model store, ready for the API to load.
+
+Usage:
+    python training.py files DATA [DATA ...] [--text-column news] [--label-column label]
+    python training.py submissions [--database-url URL]
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import logging
+import argparse
+import multiprocessing
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from model_store import save_artifact, default_version, DEFAULT_ARTIFACT_DIR
+from bulk_score import read_chunks, detect_format, peak_memory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_FEATURES = 2 ** 20
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_EPOCHS = 3
+# Records are shuffled within a window this large, so sorted corpora do not
+# hand SGD one class at a time
+DEFAULT_SHUFFLE_BUFFER = 50000
+DEFAULT_HOLDOUT_FRACTION = 0.1
+DEFAULT_HOLDOUT_LIMIT = 50000
+DEFAULT_ALPHA = 1e-6
+# Same minimum as FakeNewsDetector.predict_batch; shorter texts are never scored
+MIN_TOKENS = 3
+CLASSES = np.array([0, 1])  # 0 = Real, 1 = Fake
+
+LABELS = {'fake': 1, 'real': 0, '1': 1, '0': 0}
+
+def parse_label(value):
+    """Map 1/0 or FAKE/REAL labels to the detector's classes, None when unusable"""
+    if isinstance(value, str):
+        return LABELS.get(value.strip().lower())
+    if isinstance(value, (int, float, np.integer, np.floating)) and value in (0, 1):
+        return int(value)
+    return None
+
+def is_holdout(text, fraction):
+    """Stable hash split, so a record is held out in every epoch and every run"""
+    return zlib.crc32(text.encode('utf-8')) % 10000 < fraction * 10000
+
+def file_source(paths, text_column='news', label_column='label', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Source of (text, label) records read in chunks from CSV, JSON Lines or Parquet files"""
+    def records():
+        for path in paths:
+            for frame in read_chunks(path, detect_format(path), chunk_size):
+                missing = [column for column in (text_column, label_column) if column not in frame.columns]
+                if missing:
+                    raise ValueError(f"Column(s) {', '.join(missing)} not found in {path}")
+                yield from zip(frame[text_column].tolist(), frame[label_column].tolist())
+
+    records.description = ', '.join(paths)
+    return records
+
+def submission_source(database_url, batch_size=1000):
+    """
+    Source of (text, label) records from submissions with a reviewed
+    incorrect-prediction flag. A resolved flag means the prediction was
+    wrong, so the label is flipped; a dismissed flag confirms it. When a
+    submission has several reviewed flags the most recent review wins.
+    """
+    from sqlalchemy import create_engine, select
+    from models import Submission, Flag, FlagReason, FlagStatus, PredictionResult
+
+    if database_url.startswith('postgres://'):
+        database_url = database_url.replace('postgres://', 'postgresql://', 1)
+
+    statement = (
+        select(Submission.id, Submission.content, Submission.prediction, Flag.status)
+        .join(Flag, Flag.submission_id == Submission.id)
+        .where(
+            Flag.reason == FlagReason.INCORRECT_PREDICTION,
+            Flag.status.in_([FlagStatus.RESOLVED, FlagStatus.DISMISSED]),
+            Submission.prediction != PredictionResult.UNCERTAIN
+        )
+        .order_by(Submission.id, Flag.reviewed_at.desc(), Flag.id.desc())
+    )
+
+    def records():
+        engine = create_engine(database_url)
+        try:
+            with engine.connect() as connection:
+                # Stream rows instead of materializing the whole result
+                result = connection.execution_options(yield_per=batch_size).execute(statement)
+                previous_id = None
+                for submission_id, content, prediction, status in result:
+                    if submission_id == previous_id:
+                        continue
+                    previous_id = submission_id
+                    predicted_fake = prediction == PredictionResult.FAKE
+                    yield content, int(predicted_fake != (status == FlagStatus.RESOLVED))
+        finally:
+            engine.dispose()
+
+    records.description = 'reviewed submissions'
+    return records
+
+def build_pipeline(n_features=DEFAULT_N_FEATURES, ngram_max=2, alpha=DEFAULT_ALPHA, seed=42):
+    """
+    Hashing vectorizer plus logistic-loss SGD. The vectorizer is stateless,
+    so there is no vocabulary to hold in memory and workers can vectorize
+    independently.
+    """
+    return Pipeline([
+        ('vectorizer', HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, ngram_max),
+            stop_words='english',
+            alternate_sign=False,
+            norm='l2'
+        )),
+        ('classifier', SGDClassifier(
+            loss='log_loss',
+            alpha=alpha,
+            random_state=seed
+        ))
+    ])
+
+def shuffled_chunks(records, chunk_size, buffer_size, rng):
+    """Group records into chunks, shuffling within a bounded window"""
+    buffer = []
+    for record in records:
+        buffer.append(record)
+        if len(buffer) >= buffer_size:
+            rng.shuffle(buffer)
+            while len(buffer) >= chunk_size:
+                yield buffer[-chunk_size:]
+                del buffer[-chunk_size:]
+    rng.shuffle(buffer)
+    for start in range(0, len(buffer), chunk_size):
+        yield buffer[start:start + chunk_size]
+
+_preprocessor = None
+_vectorizer = None
+
+def _init_worker(vectorizer):
+    global _preprocessor, _vectorizer
+    from fake_news_detector import FakeNewsDetector
+
+    _preprocessor = FakeNewsDetector().preprocessor
+    _vectorizer = vectorizer
+
+def _vectorize(chunk):
+    """Preprocess and hash a chunk of (text, label), dropping texts too short to score"""
+    processed_texts = _preprocessor.preprocess_many([text for text, _ in chunk])
+    keep = [i for i, processed in enumerate(processed_texts)
+            if processed and len(processed.split()) >= MIN_TOKENS]
+    features = _vectorizer.transform([processed_texts[i] for i in keep])
+    labels = np.array([chunk[i][1] for i in keep], dtype=np.int64)
+    return features, labels, len(chunk) - len(keep)
+
+def _ordered_results(executor, chunks, in_flight):
+    """Run _vectorize over chunks in order, with at most in_flight chunks pending"""
+    if executor is None:
+        for chunk in chunks:
+            yield _vectorize(chunk)
+        return
+
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(_vectorize, chunk))
+        while len(pending) >= in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def train_incremental(source, epochs=DEFAULT_EPOCHS, chunk_size=DEFAULT_CHUNK_SIZE, n_features=DEFAULT_N_FEATURES,
+                      ngram_max=2, alpha=DEFAULT_ALPHA, holdout_fraction=DEFAULT_HOLDOUT_FRACTION,
+                      holdout_limit=DEFAULT_HOLDOUT_LIMIT, shuffle_buffer=DEFAULT_SHUFFLE_BUFFER,
+                      workers=None, seed=42):
+    """
+    Fit a pipeline over a record source with partial_fit, one chunk at a
+    time. Returns the fitted pipeline and training metrics: throughput,
+    progressive (test-then-train) accuracy over the first epoch and
+    accuracy on a hash-selected holdout.
+    """
+    pipeline = build_pipeline(n_features, ngram_max, alpha, seed)
+    vectorizer, classifier = pipeline.named_steps['vectorizer'], pipeline.named_steps['classifier']
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+
+    metrics = {
+        'source': getattr(source, 'description', None),
+        'epochs': epochs,
+        'rows': 0,
+        'skipped': 0,
+        'class_counts': {'real': 0, 'fake': 0},
+        'holdout_rows': 0
+    }
+    holdout = []
+    progressive = [0, 0]
+    processed_rows = 0
+    fit_seconds = 0.0
+    start_time = time.time()
+
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_init_worker, initargs=(vectorizer,))
+    else:
+        _init_worker(vectorizer)
+
+    try:
+        for epoch in range(epochs):
+            first_epoch = epoch == 0
+
+            def training_records():
+                for text, label in source():
+                    label = parse_label(label)
+                    if label is None or not isinstance(text, str) or not text.strip():
+                        if first_epoch:
+                            metrics['skipped'] += 1
+                        continue
+                    if holdout_fraction and is_holdout(text, holdout_fraction):
+                        if first_epoch and len(holdout) < holdout_limit:
+                            holdout.append((text, label))
+                        continue
+                    yield text, label
+
+            chunks = shuffled_chunks(training_records(), chunk_size, max(shuffle_buffer, chunk_size), rng)
+            for features, labels, too_short in _ordered_results(executor, chunks, 2 * workers):
+                processed_rows += len(labels) + too_short
+                if first_epoch:
+                    metrics['skipped'] += too_short
+                    metrics['rows'] += len(labels)
+                    fake = int(labels.sum())
+                    metrics['class_counts']['fake'] += fake
+                    metrics['class_counts']['real'] += len(labels) - fake
+                if not len(labels):
+                    continue
+
+                fit_start = time.time()
+                if first_epoch and hasattr(classifier, 'coef_'):
+                    progressive[0] += int((classifier.predict(features) == labels).sum())
+                    progressive[1] += len(labels)
+                classifier.partial_fit(features, labels, classes=CLASSES)
+                fit_seconds += time.time() - fit_start
+
+            logger.info(f"Epoch {epoch + 1}/{epochs}: {processed_rows} rows processed "
+                        f"({processed_rows / max(time.time() - start_time, 1e-9):.0f} rows/s)")
+
+        if not hasattr(classifier, 'coef_'):
+            raise ValueError("No usable labeled records in the training data")
+
+        # Holdout accuracy, vectorized in the same chunks and workers as training
+        correct = 0
+        evaluated = 0
+        holdout_chunks = (holdout[i:i + chunk_size] for i in range(0, len(holdout), chunk_size))
+        for features, labels, _ in _ordered_results(executor, holdout_chunks, 2 * workers):
+            if len(labels):
+                correct += int((classifier.predict(features) == labels).sum())
+                evaluated += len(labels)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.time() - start_time
+    metrics.update({
+        'holdout_rows': evaluated,
+        'holdout_accuracy': round(correct / evaluated, 4) if evaluated else None,
+        'progressive_accuracy': round(progressive[0] / progressive[1], 4) if progressive[1] else None,
+        'elapsed': round(elapsed, 3),
+        'fit_seconds': round(fit_seconds, 3),
+        'rows_per_second': round(processed_rows / elapsed, 1) if elapsed else 0.0,
+        'n_features': n_features,
+        'workers': workers
+    })
+    metrics.update(peak_memory())
+    return pipeline, metrics
+
+def build_model_info(metrics, version=None):
+    """model_info for an incrementally trained pipeline, in the detector's format"""
+    from fake_news_detector import model_info
+
+    accuracy = metrics['holdout_accuracy']
+    if accuracy is None:
+        accuracy = metrics['progressive_accuracy'] or 0.0
+
+    return {
+        'name': model_info['name'],
+        'version': version or default_version(model_info['version']),
+        'accuracy': round(accuracy * 100, 2),
+        'trained_at': datetime.now().isoformat(),
+        'features_count': metrics['n_features'],
+        'training': metrics
+    }
+
+def run(args, source):
+    pipeline, metrics = train_incremental(
+        source,
+        epochs=args.epochs,
+        chunk_size=args.chunk_size,
+        n_features=2 ** args.hash_bits,
+        ngram_max=args.ngram_max,
+        alpha=args.alpha,
+        holdout_fraction=args.holdout,
+        holdout_limit=args.holdout_limit,
+        shuffle_buffer=args.shuffle_buffer,
+        workers=args.workers
+    )
+    info = build_model_info(metrics, args.version)
+
+    if args.metrics:
+        with open(args.metrics, 'w', encoding='utf-8') as f:
+            json.dump(info, f, indent=2)
+
+    summary = (f"Trained on {metrics['rows']} rows x {args.epochs} epochs in {metrics['elapsed']:.1f}s "
+               f"({metrics['rows_per_second']:.0f} rows/s); holdout accuracy "
+               f"{metrics['holdout_accuracy']} on {metrics['holdout_rows']} rows, progressive accuracy "
+               f"{metrics['progressive_accuracy']}")
+    if args.no_save:
+        print(summary)
+        return
+
+    path = save_artifact(pipeline, info, args.artifact_dir)
+    print(f"{summary} -> {path}")
+
+def files_command(args):
+    run(args, file_source(args.paths, args.text_column, args.label_column, args.chunk_size))
+
+def submissions_command(args):
+    if not args.database_url:
+        raise ValueError("No database configured: pass --database-url or set DATABASE_URL")
+    run(args, submission_source(args.database_url, args.chunk_size))
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--artifact-dir', default=os.environ.get('MODEL_ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR),
+                        help='Directory holding model artifacts')
+    common.add_argument('--version', help='Artifact version (default: base version plus timestamp)')
+    common.add_argument('--epochs', type=int, default=DEFAULT_EPOCHS, help='Passes over the data')
+    common.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per partial_fit call')
+    common.add_argument('--hash-bits', type=int, default=20, help='Feature space size as a power of two')
+    common.add_argument('--ngram-max', type=int, default=2, help='Longest word n-gram')
+    common.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help='SGD regularization strength')
+    common.add_argument('--holdout', type=float, default=DEFAULT_HOLDOUT_FRACTION,
+                        help='Fraction of records held out for accuracy')
+    common.add_argument('--holdout-limit', type=int, default=DEFAULT_HOLDOUT_LIMIT,
+                        help='Most holdout records kept in memory')
+    common.add_argument('--shuffle-buffer', type=int, default=DEFAULT_SHUFFLE_BUFFER,
+                        help='Records shuffled together before chunking')
+    common.add_argument('--workers', type=int, help='Vectorizing processes (default: one per core)')
+    common.add_argument('--metrics', help='Also write model_info and training metrics to this JSON file')
+    common.add_argument('--no-save', action='store_true', help='Report metrics without saving an artifact')
+
+    parser = argparse.ArgumentParser(description='Train the detector out of core and save a model artifact')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    files_parser = subparsers.add_parser('files', parents=[common], help='Train on labeled CSV, JSON Lines or Parquet files')
+    files_parser.add_argument('paths', nargs='+', help='Input files')
+    files_parser.add_argument('--text-column', default='news', help='Column holding the article text')
+    files_parser.add_argument('--label-column', default='label', help='Column holding 1/0 or FAKE/REAL')
+    files_parser.set_defaults(func=files_command)
+
+    submissions_parser = subparsers.add_parser('submissions', parents=[common],
+                                               help='Train on submissions with reviewed incorrect-prediction flags')
+    submissions_parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'))
+    submissions_parser.set_defaults(func=submissions_command)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        args.func(args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Write-Behind Queue
+AI-Powered Fake News Detection System
+
+Moves database writes off the request thread. Requests enqueue events and
+a background worker flushes them in batches, one multi-row statement per
+event kind.
+"""
+
+import os
+import time
+import queue
+import atexit
+import logging
+import threading
+
+from models import db
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class WriteBehindQueue:
+    """
+    Bounded queue of pending writes flushed by a background thread.
+
+    Handlers are registered per event kind and receive the list of queued
+    payloads for that kind. When the queue is full the request thread waits
+    up to enqueue_timeout and then writes the event itself, so producers
+    slow down instead of losing data.
+    """
+
+    def __init__(self, app, max_size=10000, batch_size=500, flush_interval=0.5, enqueue_timeout=0.05):
+        self.app = app
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+
+        self._handlers = {}
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            'enqueued': 0,
+            'flushed': 0,
+            'caller_writes': 0,
+            'flush_errors': 0,
+            'batches': 0,
+            'last_flush_latency': 0.0,
+            'max_flush_latency': 0.0,
+            'total_flush_latency': 0.0
+        }
+
+    def register(self, kind, handler):
+        """Register the batch writer for an event kind"""
+        self._handlers[kind] = handler
+
+    def _ensure_started(self):
+        # Threads do not survive fork, so every worker process starts its own flusher
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_size)
+
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+            atexit.register(self.shutdown)
+
+    def enqueue(self, kind, payload):
+        """
+        Queue a write. Returns True if it was queued, False if the queue was
+        full and the write was performed synchronously instead.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No write handler registered for {kind}")
+
+        self._ensure_started()
+
+        try:
+            self._queue.put((kind, payload), timeout=self.enqueue_timeout)
+            with self._metrics_lock:
+                self._metrics['enqueued'] += 1
+            return True
+        except queue.Full:
+            logger.warning(f"Write-behind queue full, writing {kind} synchronously")
+            with self._metrics_lock:
+                self._metrics['caller_writes'] += 1
+            self._write({kind: [payload]})
+            return False
+
+    def _run(self):
+        stopping = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if stopping:
+                    return
+                continue
+
+            if item is _STOP:
+                stopping = True
+            batch = [] if item is _STOP else [item]
+
+            # Drain whatever else is waiting, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    continue
+                batch.append(item)
+
+            if batch:
+                self._flush(batch)
+
+            if stopping and self._queue.empty():
+                return
+
+    def _flush(self, batch):
+        grouped = {}
+        for kind, payload in batch:
+            grouped.setdefault(kind, []).append(payload)
+
+        start_time = time.time()
+        flushed = self._write(grouped)
+        latency = time.time() - start_time
+
+        with self._metrics_lock:
+            self._metrics['batches'] += 1
+            self._metrics['flushed'] += flushed
+            self._metrics['last_flush_latency'] = latency
+            self._metrics['max_flush_latency'] = max(self._metrics['max_flush_latency'], latency)
+            self._metrics['total_flush_latency'] += latency
+
+    def _write(self, grouped):
+        """Run each kind's handler in its own transaction; returns events written"""
+        written = 0
+        with self.app.app_context():
+            for kind, payloads in grouped.items():
+                try:
+                    self._handlers[kind](payloads)
+                    db.session.commit()
+                    written += len(payloads)
+                    continue
+                except Exception as e:
+                    logger.error(f"Failed to write {len(payloads)} {kind} events: {e}")
+                    db.session.rollback()
+                    with self._metrics_lock:
+                        self._metrics['flush_errors'] += 1
+
+                # Retry one by one so a single bad event does not lose the batch
+                if len(payloads) > 1:
+                    for payload in payloads:
+                        try:
+                            self._handlers[kind]([payload])
+                            db.session.commit()
+                            written += 1
+                        except Exception as e:
+                            logger.error(f"Dropping {kind} event: {e}")
+                            db.session.rollback()
+        return written
+
+    def shutdown(self, timeout=10):
+        """Flush everything still queued and stop the worker"""
+        if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+            return
+
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Write-behind queue full at shutdown")
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Write-behind queue did not drain within {timeout}s")
+
+    def metrics(self):
+        """Queue depth and flush latency counters"""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+
+        metrics['queue_depth'] = self._queue.qsize()
+        metrics['max_size'] = self.max_size
+        metrics['avg_flush_latency'] = (
+            metrics['total_flush_latency'] / metrics['batches'] if metrics['batches'] else 0.0
+        )
+        for key in ('last_flush_latency', 'max_flush_latency', 'avg_flush_latency'):
+            metrics[key] = round(metrics[key], 4)
+        del metrics['total_flush_latency']
+        return metrics